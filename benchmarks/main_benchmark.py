@@ -0,0 +1,202 @@
+"""main_benchmark.py
+
+Benchmark suite timing the computational kernels of pyGLLE for a range of
+grid sizes. Results are stored in JSON format, allowing to track
+performance regressions when integration engines or FFT backends change.
+
+Usage:
+    python main_benchmark.py run [--NxExp 10 16] [--kernels numpy] [--out FILE]
+    python main_benchmark.py compare OLD.json NEW.json [--threshold 1.2]
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import numpy as np
+from pyglle.glle_operator import GLLEOperator
+from pyglle.fft_backend import getBackend
+from pyglle.solver import solve
+from pyglle.stationary_solution import stationarySolution, stationarySolution_homogeneous
+from pyglle.data_handler import DataHandler, StreamingDataHandler
+
+
+P, THETA, D2, D3, D4 = 8., 15., -1., 0.04, 0.001
+
+
+def _timeit(func, nRep=5, nMin=3):
+    """best wall time per call out of nMin repetitions of nRep calls"""
+    best = np.inf
+    for _ in range(nMin):
+        t0 = time.perf_counter()
+        for _ in range(nRep):
+            func()
+        best = min(best, (time.perf_counter()-t0)/nRep)
+    return best
+
+
+def _domain(Nx, fft):
+    xMax = 160.*Nx/2**13
+    x = np.linspace(-xMax, xMax, Nx, endpoint=False)
+    k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+    return x, k
+
+
+def _trialSolution(x):
+    cosZeta = np.sqrt(8*THETA)/P/np.pi
+    sinZeta = np.sqrt(1-cosZeta*cosZeta)
+    reA0, imA0 = stationarySolution_homogeneous(THETA, P)
+    return np.sqrt(2*THETA)/np.cosh(np.sqrt(THETA)*x)*(cosZeta+1j*sinZeta) + (reA0+1j*imA0)
+
+
+def benchRHS(Nx, fft, kernels='numpy'):
+    """time per evaluation of the GLLE right-hand-side"""
+    x, k = _domain(Nx, fft)
+    rhs = GLLEOperator(k, P, THETA, D2, D3, D4, fft=fft, kernels=kernels)
+    A = _trialSolution(x)
+    out = np.empty_like(A)
+    return dict(rhs = _timeit(lambda: rhs(A)),
+                rhs_out = _timeit(lambda: rhs(A, out=out)),
+                nonlinear = _timeit(lambda: rhs.nonlinear(A, out=out)))
+
+
+def benchSolver(Nx, fft, nSteps=20, kernels='numpy'):
+    """integration steps per second of the available integration methods"""
+    x, k = _domain(Nx, fft)
+    rhs = GLLEOperator(k, P, THETA, D2, D3, D4, fft=fft, kernels=kernels)
+    A0 = _trialSolution(x)
+    t = np.linspace(0, nSteps*1e-3, nSteps+1)
+    res = dict()
+    for method in ('dop853', 'ssfm', 'ip-rk4', 'erk4ip'):
+        t0 = time.perf_counter()
+        solve(x, t, A0, rhs, lambda *args: None, method=method, Lk=rhs.Lk, fNL=rhs.nonlinear, fft=fft)
+        res['steps_per_sec_'+method] = nSteps/(time.perf_counter()-t0)
+    return res
+
+
+def benchStationary(Nx, fft, tol=1e-10):
+    """wall time and iterations of the Newton-Krylov root-finding procedure"""
+    x, k = _domain(Nx, fft)
+    rhs = GLLEOperator(k, P, THETA, d2=-1.0, fft=fft)
+    t0 = time.perf_counter()
+    A, info = stationarySolution(x, _trialSolution(x), rhs, tol, full_output=True,
+                                 jvp=rhs.jvp, precond=rhs.preconditioner)
+    return dict(stationary_time = time.perf_counter()-t0,
+                stationary_nit = int(info.nit),
+                stationary_success = bool(info.success))
+
+
+def benchIO(Nx, nSnapshots=200):
+    """throughput of the data handlers in MB/s"""
+    x = np.linspace(-1, 1, Nx, endpoint=False)
+    A = (np.random.randn(Nx) + 1j*np.random.randn(Nx))
+    MB = nSnapshots*A.nbytes/1e6
+    path = tempfile.mkdtemp()
+    try:
+        t0 = time.perf_counter()
+        dat = DataHandler()
+        for n in range(nSnapshots):
+            dat.measure(n, float(n), x, A)
+        dat.save('bench', path=path+'/')
+        tSave = time.perf_counter()-t0
+
+        t0 = time.perf_counter()
+        dat = StreamingDataHandler('bench_stream', nSnapshots, path=path+'/')
+        for n in range(nSnapshots):
+            dat.measure(n, float(n), x, A)
+        dat.save()
+        tStream = time.perf_counter()-t0
+    finally:
+        shutil.rmtree(path)
+    return dict(save_MB_per_sec = MB/tSave, stream_MB_per_sec = MB/tStream)
+
+
+def run(NxExps, fftName='scipy', workers=1, oFile=None, kernels='numpy'):
+    fft = getBackend(fftName) if fftName=='numpy' else getBackend(fftName, workers=workers)
+    results = dict(date = time.strftime('%Y-%m-%d %H:%M:%S'),
+                   platform = platform.platform(),
+                   python = platform.python_version(),
+                   numpy = np.__version__,
+                   fft = fftName,
+                   workers = workers,
+                   kernels = kernels,
+                   Nx = dict())
+
+    for NxExp in NxExps:
+        Nx = 2**NxExp
+        res = dict()
+        res.update(benchRHS(Nx, fft, kernels))
+        res.update(benchSolver(Nx, fft, kernels=kernels))
+        res.update(benchStationary(Nx, fft))
+        res.update(benchIO(Nx))
+        results['Nx'][str(Nx)] = res
+        print("# Nx=%d"%(Nx))
+        for key, val in sorted(res.items()):
+            print("    %-28s %g"%(key, val))
+
+    if oFile is None:
+        oFile = './results/benchmark_%s.json'%(time.strftime('%Y%m%d_%H%M%S'))
+    path = os.path.dirname(oFile)
+    if path:
+        try:
+            os.makedirs(path)
+        except OSError:
+            pass
+    with open(oFile, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("# saved under:", oFile)
+
+
+def compare(oldFile, newFile, threshold=1.2):
+    """report benchmarks that regressed by more than the given factor"""
+    with open(oldFile) as f:
+        old = json.load(f)['Nx']
+    with open(newFile) as f:
+        new = json.load(f)['Nx']
+
+    nReg = 0
+    for Nx in sorted(set(old) & set(new), key=int):
+        for key in sorted(set(old[Nx]) & set(new[Nx])):
+            vOld, vNew = old[Nx][key], new[Nx][key]
+            if isinstance(vOld, bool) or not vOld or not vNew:
+                continue
+            # -- RATES ARE BETTER IF LARGER, TIMES IF SMALLER
+            ratio = vOld/vNew if ('per_sec' in key) else vNew/vOld
+            flag = 'REGRESSION' if ratio > threshold else ''
+            nReg += bool(flag)
+            print("%6s %-28s %12.4g %12.4g %8.3f %s"%(Nx, key, vOld, vNew, ratio, flag))
+    return nReg
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='main_benchmark')
+    sub = parser.add_subparsers(dest='command')
+    pRun = sub.add_parser('run')
+    pRun.add_argument('--NxExp', type=int, nargs=2, default=(10, 16), help='range of exponents of Nx=2**NxExp')
+    pRun.add_argument('--fft', default='scipy', help='FFT backend')
+    pRun.add_argument('--workers', type=int, default=1, help='FFT workers')
+    pRun.add_argument('--kernels', default='numpy', help='compute kernels of the right-hand-side')
+    pRun.add_argument('--out', default=None, help='output file')
+    pCmp = sub.add_parser('compare')
+    pCmp.add_argument('oldFile')
+    pCmp.add_argument('newFile')
+    pCmp.add_argument('--threshold', type=float, default=1.2, help='slowdown factor flagged as regression')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        run(range(args.NxExp[0], args.NxExp[1]+1), args.fft, args.workers, args.out, args.kernels)
+    elif args.command == 'compare':
+        sys.exit(1 if compare(args.oldFile, args.newFile, args.threshold) else 0)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
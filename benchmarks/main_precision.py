@@ -0,0 +1,87 @@
+"""main_precision.py
+
+Accuracy check of single precision (complex64) propagation against the
+double precision (complex128) path. A perturbed stationary solution of the
+LLE is propagated in both precisions and the deviation of the single
+precision fields from the double precision reference is reported, together
+with the wall time of both runs.
+
+Usage:
+    python main_precision.py [--Nx 1024] [--tMax 2.0]
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import time
+import argparse
+import numpy as np
+from pyglle.glle_operator import GLLEOperator
+from pyglle.fft_backend import getBackend
+from pyglle.solver import solve
+from pyglle.stationary_solution import stationarySolution
+from main_benchmark import P, THETA, D2, D3, D4, _domain, _trialSolution
+
+
+CASES = (('erk4ip', dict(tol=1e-5)),
+         ('ip-rk4', dict(h=1e-3)),
+         ('ssfm', dict(h=1e-3)))
+
+
+def _propagate(x, t, A0, fft, method, kwargs, dtype):
+    rhs = GLLEOperator(_domain(x.size, fft)[1], P, THETA, D2, D3, D4, fft=fft, dtype=dtype)
+    Axt = []
+    t0 = time.perf_counter()
+    solve(x, t, A0, rhs, lambda n, tc, x, Ax: Axt.append(Ax.copy()),
+          method=method, Lk=rhs.Lk, fNL=rhs.nonlinear, fft=fft, dtype=dtype, **kwargs)
+    return np.asarray(Axt), time.perf_counter()-t0
+
+
+def check(Nx=1024, tMax=2.0, Nt=201):
+    """compare single and double precision propagation
+
+    Args:
+        Nx (int): number of mesh points (default 1024)
+        tMax (float): propagation time (default 2.0)
+        Nt (int): number of output times (default 201)
+
+    Returns:
+        res (dict): for each method the maximal relative deviation of the
+            fields errField, the maximal relative deviation of the energy
+            errEnergy, and the wall times of both runs
+    """
+    fft = getBackend('scipy')
+    x, k = _domain(Nx, fft)
+    t = np.linspace(0, tMax, Nt)
+    rhs = GLLEOperator(k, P, THETA, D2, D3, D4, fft=fft)
+    A0 = stationarySolution(x, _trialSolution(x), rhs, 1e-10, jvp=rhs.jvp, precond=rhs.preconditioner)
+    # -- LOCALIZED PERTURBATION EXCITING TRANSIENT DYNAMICS
+    A0 = A0*(1 + 0.3*np.exp(-x**2))
+
+    res = dict()
+    for method, kwargs in CASES:
+        A64, t64 = _propagate(x, t, A0, fft, method, kwargs, np.complex128)
+        A32, t32 = _propagate(x, t, A0, fft, method, kwargs, np.complex64)
+        E64 = np.sum(np.abs(A64)**2, axis=-1)
+        E32 = np.sum(np.abs(A32.astype(np.complex128))**2, axis=-1)
+        res[method] = dict(errField = np.max(np.linalg.norm(A32-A64, axis=-1)/np.linalg.norm(A64, axis=-1)),
+                           errEnergy = np.max(np.abs(E32-E64)/E64),
+                           wallTime64 = t64,
+                           wallTime32 = t32)
+        print("%-8s errField=%.2e errEnergy=%.2e wallTime64=%.3fs wallTime32=%.3fs"%(
+              method, res[method]['errField'], res[method]['errEnergy'], t64, t32))
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='main_precision')
+    parser.add_argument('--Nx', type=int, default=1024, help='number of mesh points')
+    parser.add_argument('--tMax', type=float, default=2.0, help='propagation time')
+    args = parser.parse_args()
+    check(args.Nx, args.tMax)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""main_resume.py
+
+Consistency check of resuming propagation runs from checkpoints. A perturbed
+stationary solution of the LLE is propagated without interruption, and again
+with a crash after a given number of output times, followed by a resume
+from the last checkpoint written to disk. For each integration method, the
+maximal deviation of the fields of the resumed run from those of the
+uninterrupted run is reported; it is expected to vanish exactly.
+
+Usage:
+    python main_resume.py [--Nx 512] [--tMax 1.0] [--nCheckpoint 7] [--nCrash 40]
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import argparse
+import tempfile
+import numpy as np
+from pyglle.glle_operator import GLLEOperator
+from pyglle.fft_backend import getBackend
+from pyglle.solver import solve
+from pyglle.checkpoint import saveCheckpoint, loadCheckpoint
+from pyglle.stationary_solution import stationarySolution
+from main_benchmark import P, THETA, D2, D3, D4, _domain, _trialSolution
+
+
+CASES = (('dop853', dict(dense=True)),
+         ('dop853', dict(dense=False)),
+         ('erk4ip', dict(tol=1e-5)),
+         ('ip-rk4', dict(h=2e-4)),
+         ('ssfm', dict(h=2e-4)))
+
+
+class _Crash(Exception):
+    pass
+
+
+def _propagate(x, t, A0, rhs, fft, method, kwargs, ckptFile=None, nCheckpoint=None, nCrash=None, state=None):
+    """fields at the output times, keyed by their index"""
+    Axt = dict()
+
+    def _measure(n, tc, x, Ax):
+        if n == nCrash:
+            raise _Crash()
+        Axt[n] = Ax.copy()
+
+    checkpointFunc = None if ckptFile is None else lambda state: saveCheckpoint(ckptFile, **state)
+    try:
+        solve(x, t, A0, rhs, _measure, method=method, Lk=rhs.Lk, fNL=rhs.nonlinear, fft=fft,
+              checkpointFunc=checkpointFunc, nCheckpoint=nCheckpoint, state=state, **kwargs)
+    except _Crash:
+        pass
+    return Axt
+
+
+def check(Nx=512, tMax=1.0, Nt=101, nCheckpoint=7, nCrash=40):
+    """compare resumed and uninterrupted propagation
+
+    Args:
+        Nx (int): number of mesh points (default 512)
+        tMax (float): propagation time (default 1.0)
+        Nt (int): number of output times (default 101)
+        nCheckpoint (int): number of output times between checkpoints
+            (default 7)
+        nCrash (int): index of the output time at which the run crashes
+            (default 40)
+
+    Returns:
+        res (dict): for each method the maximal absolute deviation of the
+            fields of the resumed run from the uninterrupted run
+    """
+    fft = getBackend('scipy')
+    x, k = _domain(Nx, fft)
+    t = np.linspace(0, tMax, Nt)
+    rhs = GLLEOperator(k, P, THETA, D2, D3, D4, fft=fft)
+    A0 = stationarySolution(x, _trialSolution(x), rhs, 1e-10, jvp=rhs.jvp, precond=rhs.preconditioner)
+    # -- LOCALIZED PERTURBATION EXCITING TRANSIENT DYNAMICS
+    A0 = A0*(1 + 0.3*np.exp(-x**2))
+
+    res = dict()
+    with tempfile.TemporaryDirectory() as path:
+        for method, kwargs in CASES:
+            name = method + ('' if kwargs.get('dense', True) else ' (no dense output)')
+            ckptFile = os.path.join(path, 'run.ckpt.npz')
+            ref = _propagate(x, t, A0, rhs, fft, method, kwargs)
+            _propagate(x, t, A0, rhs, fft, method, kwargs, ckptFile, nCheckpoint, nCrash)
+            resumed = _propagate(x, t, A0, rhs, fft, method, kwargs, ckptFile, nCheckpoint, state=loadCheckpoint(ckptFile))
+            os.remove(ckptFile)
+            if sorted(resumed) != [n for n in sorted(ref) if n >= min(resumed)]:
+                raise RuntimeError("%s: resumed run misses output times"%(name))
+            res[name] = max(np.max(np.abs(resumed[n]-ref[n])) for n in resumed)
+            print("%-28s resumed at n=%d, maxDeviation=%.2e %s"%(
+                  name, min(resumed), res[name], 'OK' if res[name] == 0 else 'FAILED'))
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='main_resume')
+    parser.add_argument('--Nx', type=int, default=512, help='number of mesh points')
+    parser.add_argument('--tMax', type=float, default=1.0, help='propagation time')
+    parser.add_argument('--nCheckpoint', type=int, default=7, help='output times between checkpoints')
+    parser.add_argument('--nCrash', type=int, default=40, help='output time at which the run crashes')
+    args = parser.parse_args()
+    res = check(args.Nx, args.tMax, nCheckpoint=args.nCheckpoint, nCrash=args.nCrash)
+    sys.exit(0 if all(val == 0 for val in res.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
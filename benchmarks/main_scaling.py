@@ -0,0 +1,108 @@
+"""main_scaling.py
+
+Strong scaling benchmark of a single evaluation of the right-hand-side of the
+GLLE, using multithreaded FFTs and compute kernels distributed over a pool
+of threads (see kernels.py). For grid sizes Nx=2^12...2^18 and an increasing
+number of threads, the throughput in evaluations per second and the speedup
+relative to a single thread are reported. Results are stored in JSON format.
+
+Usage:
+    python main_scaling.py [--NxExp 12 18] [--threads 1 2 4 8 16 32]
+                           [--fft scipy] [--kernels numpy] [--minChunk 8192]
+                           [--out FILE]
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import json
+import time
+import argparse
+import platform
+import numpy as np
+from pyglle.glle_operator import GLLEOperator
+from pyglle.fft_backend import getBackend
+from pyglle.kernels import getKernels
+from main_benchmark import P, THETA, D2, D3, D4, _timeit, _domain, _trialSolution
+
+
+def scaling(Nx, threads, fftName='scipy', kernels='numpy', nRep=20, minChunk=8192):
+    """throughput of the right-hand-side for an increasing number of threads
+
+    Args:
+        Nx (int): number of mesh points
+        threads (list): numbers of threads
+        fftName (str): FFT backend (default 'scipy')
+        kernels (str): compute kernels (default 'numpy')
+        nRep (int): number of evaluations per timing (default 20)
+        minChunk (int): minimal number of mesh points per kernel thread
+            (default 8192)
+
+    Returns:
+        res (dict): for each number of threads the throughput of the full
+            right-hand-side rhs_per_sec and of its pointwise part
+            nonlinear_per_sec in evaluations per second, and the speedup of
+            the full right-hand-side relative to the first entry of threads
+    """
+    res = dict()
+    for nThreads in threads:
+        fft = getBackend(fftName) if fftName=='numpy' else getBackend(fftName, workers=nThreads)
+        x, k = _domain(Nx, fft)
+        rhs = GLLEOperator(k, P, THETA, D2, D3, D4, fft=fft, kernels=getKernels(kernels, nThreads, minChunk))
+        A = _trialSolution(x)
+        out = np.empty_like(A)
+        res[str(nThreads)] = dict(rhs_per_sec = 1./_timeit(lambda: rhs(A, out=out), nRep),
+                                  nonlinear_per_sec = 1./_timeit(lambda: rhs.nonlinear(A, out=out), nRep))
+    ref = res[str(threads[0])]['rhs_per_sec']
+    for val in res.values():
+        val['speedup'] = val['rhs_per_sec']/ref
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='main_scaling')
+    parser.add_argument('--NxExp', type=int, nargs=2, default=(12, 18), help='range of exponents of Nx=2**NxExp')
+    parser.add_argument('--threads', type=int, nargs='+', default=(1, 2, 4, 8, 16, 32), help='numbers of threads')
+    parser.add_argument('--fft', default='scipy', help='FFT backend')
+    parser.add_argument('--kernels', default='numpy', help='compute kernels of the right-hand-side')
+    parser.add_argument('--minChunk', type=int, default=8192, help='minimal number of mesh points per kernel thread')
+    parser.add_argument('--out', default=None, help='output file')
+    args = parser.parse_args()
+
+    results = dict(date = time.strftime('%Y-%m-%d %H:%M:%S'),
+                   platform = platform.platform(),
+                   python = platform.python_version(),
+                   numpy = np.__version__,
+                   cpus = os.cpu_count(),
+                   fft = args.fft,
+                   kernels = args.kernels,
+                   minChunk = args.minChunk,
+                   Nx = dict())
+
+    print("# %8s %8s %14s %14s %8s"%('Nx', 'threads', 'rhs/s', 'nonlinear/s', 'speedup'))
+    for NxExp in range(args.NxExp[0], args.NxExp[1]+1):
+        Nx = 2**NxExp
+        res = scaling(Nx, args.threads, args.fft, args.kernels, minChunk=args.minChunk)
+        results['Nx'][str(Nx)] = res
+        for nThreads in args.threads:
+            val = res[str(nThreads)]
+            print("  %8d %8d %14.1f %14.1f %8.2f"%(Nx, nThreads, val['rhs_per_sec'], val['nonlinear_per_sec'], val['speedup']))
+
+    oFile = args.out
+    if oFile is None:
+        oFile = './results/scaling_%s.json'%(time.strftime('%Y%m%d_%H%M%S'))
+    path = os.path.dirname(oFile)
+    if path:
+        try:
+            os.makedirs(path)
+        except OSError:
+            pass
+    with open(oFile, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print("# saved under:", oFile)
+
+
+if __name__ == '__main__':
+    main()
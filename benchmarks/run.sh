@@ -0,0 +1 @@
+python3 main_benchmark.py run --NxExp 10 16
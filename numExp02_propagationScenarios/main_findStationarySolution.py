@@ -1,5 +1,7 @@
-import sys; sys.path.append('../scripts/')
-import pyGLLE
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import pyglle
 import numpy as np
 
 
@@ -23,4 +25,5 @@ class SIM_SETUP:
         return Ax_fnc(x-self.x0)*(cosZeta+1j*sinZeta)
 
 
-pyGLLE.findStationarySolution(SIM_SETUP())
+if __name__ == '__main__':
+    pyglle.findStationarySolution(SIM_SETUP())
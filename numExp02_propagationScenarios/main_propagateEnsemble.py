@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import pyglle
+import numpy as np
+from main_findStationarySolution import SIM_SETUP as STATIONARY_SETUP
+
+
+class SIM_SETUP:
+
+    xMax  = STATIONARY_SETUP.xMax
+    Nx    = STATIONARY_SETUP.Nx
+    P     = STATIONARY_SETUP.P
+    theta = STATIONARY_SETUP.theta
+    x0    = STATIONARY_SETUP.x0
+
+    tMax = 6.0
+    Nt = 10000
+    nSkip = 20
+    d2 = -1.00
+
+    method = 'erk4ip'
+    tol = 1e-8
+
+    def __init__(self, d3, d4):
+        self.d3 = d3
+        self.d4 = d4
+        self.fName = 'GLLE_nCS1_xMax%lf_Nx%d_tMax%lf_Nt%d_P%lf_theta%lf_d2%lf_d3%lf_d4%lf_x0%lf.dat'%(self.xMax,self.Nx,self.tMax,self.Nt,self.P,self.theta,self.d2,d3,d4,self.x0)
+
+    def initial_field(self, x):
+        # -- STATIONARY SOLUTION FROM CACHE, COMPUTED IF NOT AVAILABLE
+        return pyglle.fetchStationarySolution(STATIONARY_SETUP())[1]
+
+
+if __name__ == '__main__':
+    pyglle.propagateEnsemble([SIM_SETUP(d3, d4) for (d3, d4) in [(0.000, 0.000), (0.040, 0.000), (0.000, 0.001)]])
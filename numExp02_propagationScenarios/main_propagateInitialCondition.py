@@ -1,32 +1,36 @@
-import sys; sys.path.append('../scripts/')
-import pyGLLE
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import pyglle
 import numpy as np
+from main_findStationarySolution import SIM_SETUP as STATIONARY_SETUP
 
 
 
 class SIM_SETUP:
 
-    _inFileName = './data_stationary_solution/stationary_solution.dat.npz'
-    _data = np.load(_inFileName)
-    _x    = _data['x']
-    _Ax0  = _data['Ax0']
-    xMax  = float(_data['xMax'])
-    Nx    = int(_data['Nx'])
-    P     = float(_data['P'])
-    theta = float(_data['theta'])
-    x0    = float(_data['x0'])
+    xMax  = STATIONARY_SETUP.xMax
+    Nx    = STATIONARY_SETUP.Nx
+    P     = STATIONARY_SETUP.P
+    theta = STATIONARY_SETUP.theta
+    x0    = STATIONARY_SETUP.x0
 
     tMax = 6.0
     Nt = 10000
     nSkip = 20
     d2 = -1.00
-    d3 = float(sys.argv[1])
-    d4 = float(sys.argv[2])
+    d3 = 0.0
+    d4 = 0.0
 
-    fName = 'GLLE_nCS1_xMax%lf_Nx%d_tMax%lf_Nt%d_P%lf_theta%lf_d2%lf_d3%lf_d4%lf_x0%lf.dat'%(xMax,Nx,tMax,Nt,P,theta,d2,d3,d4,x0)
+    def __init__(self, d3=0.0, d4=0.0):
+        self.d3 = d3
+        self.d4 = d4
+        self.fName = 'GLLE_nCS1_xMax%lf_Nx%d_tMax%lf_Nt%d_P%lf_theta%lf_d2%lf_d3%lf_d4%lf_x0%lf.dat'%(self.xMax,self.Nx,self.tMax,self.Nt,self.P,self.theta,self.d2,d3,d4,self.x0)
 
     def initial_field(self, x):
-        return self._Ax0
+        # -- STATIONARY SOLUTION FROM CACHE, COMPUTED IF NOT AVAILABLE
+        return pyglle.fetchStationarySolution(STATIONARY_SETUP())[1]
 
 
-pyGLLE.propagateInitialCondition(SIM_SETUP())
+if __name__ == '__main__':
+    pyglle.propagateInitialCondition(SIM_SETUP(float(sys.argv[1]), float(sys.argv[2])))
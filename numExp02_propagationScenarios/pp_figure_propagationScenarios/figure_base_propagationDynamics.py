@@ -2,7 +2,6 @@ import sys
 import os
 import matplotlib as mpl
 import numpy as np
-import scipy.fftpack as sfft
 import matplotlib.pyplot as plt
 import matplotlib.colors as col
 from matplotlib.gridspec import GridSpec, GridSpecFromSubplotSpec
@@ -11,7 +10,7 @@ from matplotlib.gridspec import GridSpec, GridSpecFromSubplotSpec
 def fetchIdx(t,t0):
     return np.argmin(np.abs(t-t0))
 
-def generateFigure(x, k, t, At, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName, DO_FORMAT='png'):
+def generateFigure(x, k, t, Ixt, Ikt, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName, DO_FORMAT='png'):
 
     mm2inch = lambda x: x/10./2.54
     mpl.rcParams['figure.figsize'] = mm2inch(1.*85),mm2inch(1.3/3.*85)
@@ -69,8 +68,7 @@ def generateFigure(x, k, t, At, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName,
         cbar.set_ticks((0,0.2,0.4,0.6,0.8,1.))
         return cbar
 
-    Ix =  np.abs(At)**2
-    Ix = Ix/Ix[0].max()
+    Ix = Ixt/Ixt[0].max()
     img1 = axA1.pcolorfast(x,t,Ix[:-1,:-1],norm=col.Normalize(vmin=0.,vmax=1.0),cmap=cmap)
     cbar1 = _colorbar_Ix(img1,axA1.get_position(), axA1t.get_position() )
     cbar1.ax.set_title(r"Normalized intensity $|A|^2$",color='k',fontsize=6., y=2.)
@@ -111,10 +109,8 @@ def generateFigure(x, k, t, At, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName,
             cbar.set_ticklabels(dBLabels)
             return cbar
 
-    Ak = sfft.ifft(At,axis=-1)
-    Ik = np.abs(Ak)**2
-    Ik = Ik/Ik[0].max()
-    img2 = axA2.pcolorfast(sfft.fftshift(k),t, sfft.fftshift(Ik[:-1,:-1],axes=-1), norm=col.LogNorm(vmin=1e-15,vmax=1.0),cmap=cmap)
+    Ik = Ikt/Ikt[0].max()
+    img2 = axA2.pcolorfast(k,t, Ik[:-1,:-1], norm=col.LogNorm(vmin=1e-15,vmax=1.0),cmap=cmap)
     cbar1 = _colorbar_Ik(img2,axA2.get_position(), axA2t.get_position())
     cbar1.ax.set_title(r"Normalized spectral intensity $|A_k|^2\,\mathrm{(dB)}$",color='k',fontsize=6., y=2.)
 
@@ -134,8 +130,7 @@ def generateFigure(x, k, t, At, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName,
 
     tFinId = fetchIdx(t,tLim[1])
 
-    Ax_fin = np.copy(At[tFinId])
-    Ix_fin = np.abs(Ax_fin)**2
+    Ix_fin = np.copy(Ixt[tFinId])
     Ix_fin /= np.max(Ix_fin)
 
     axA1t.plot(x,Ix_fin,color='black',linewidth=0.5)
@@ -157,12 +152,11 @@ def generateFigure(x, k, t, At, xLim, xTicks, kLim, kTicks, tLim, tTicks, oName,
     def dB(x):
         return 10.*np.log10(x)
 
-    Ak_fin = np.copy(Ak[tFinId])
-    Ik_fin = np.abs(Ak_fin)**2
+    Ik_fin = np.copy(Ikt[tFinId])
     Ik_fin /= np.max(Ik_fin)
 
-    #axA2t.vlines(sfft.fftshift(k),-150,dB(sfft.fftshift(Ik_fin)),color='black',linewidth=0.5)
-    axA2t.plot(sfft.fftshift(k),dB(sfft.fftshift(Ik_fin)),color='black',linewidth=0.5)
+    #axA2t.vlines(k,-150,dB(Ik_fin),color='black',linewidth=0.5)
+    axA2t.plot(k,dB(Ik_fin),color='black',linewidth=0.5)
 
     axA2t.tick_params(axis='y',length=2.,pad=1,labelleft=False)
     axA2t.tick_params(axis='x',length=2.,pad=1,labelbottom=False)
@@ -0,0 +1,39 @@
+"""pyglle
+
+Python toolkit for simulating the propagation dynamics of dissipative
+solitons in the generalized Lugiato-Lefever equation (GLLE).
+
+The main functions of module interface, e.g. propagateInitialCondition, are
+available as attributes of the package. They and the submodules are imported
+on first access, so that importing the package, e.g. by the command line
+interface (see cli), does not import numpy or scipy.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import importlib
+
+__version__ = '1.0'
+
+# -- MAIN FUNCTIONS OF MODULE interface, IMPORTED ON FIRST ACCESS. THE
+# -- FUNCTION interface.sweep IS SHADOWED BY THE SUBMODULE sweep
+INTERFACE = ('findStationarySolution', 'fetchStationarySolution', 'traceStationaryBranch', 'analyzeStability',
+             'propagateInitialCondition', 'propagateEnsemble', 'runFileName', 'loadSetupClass')
+
+SUBMODULES = ('aggregator', 'checkpoint', 'cli', 'config', 'continuation', 'data_handler', 'fft_backend',
+              'glle_operator', 'grid_monitor', 'instrumentation', 'interface', 'kernels', 'postprocessing', 'resampling',
+              'solution_cache', 'solver', 'stability', 'stationary_solution', 'sweep')
+
+
+def __getattr__(name):
+    if name in INTERFACE:
+        return getattr(importlib.import_module('.interface', __name__), name)
+    if name in SUBMODULES:
+        return importlib.import_module('.'+name, __name__)
+    raise AttributeError("module %s has no attribute %s"%(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(INTERFACE) | set(SUBMODULES))
+
+# EOF: __init__.py
@@ -0,0 +1,13 @@
+"""__main__.py
+
+Runs the command line interface of the pyglle package as python -m pyglle
+(see cli).
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+from .cli import main
+
+main()
+
+# EOF: __main__.py
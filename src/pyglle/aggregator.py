@@ -0,0 +1,154 @@
+"""aggregator.py
+
+Contains a class data structure providing zero-copy access to the field
+configurations of many runs streamed to disk by StreamingDataHandler, e.g. the
+runs of a parameter sweep, while they proceed. The preallocated npy files of
+the runs form a memmap pool: each run writes its rows in order, the
+aggregator maps the files read-only and infers the valid rows from the stored
+time coordinates. Since the files are mapped, rows are shared with the
+writing processes via the page cache instead of being pickled or copied;
+placing the files on a RAM-backed file system, e.g. /dev/shm (see the
+optional setup attribute streamPath), avoids disk access altogether.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import numpy as np
+from .data_handler import dequantize, _FIELD_KEYS
+
+
+class RunAggregator():
+    """zero-copy access to streamed runs while they proceed
+
+    Runs not started yet, i.e. whose files do not exist, are attached by a
+    later call of refresh. If a run is restarted, its files are replaced
+    (see StreamingDataHandler) and the aggregator attaches to the new files,
+    while views handed out before remain valid. Field configurations stored
+    in the format 'complex' are returned as read-only views of the mapped
+    files; those stored in the format 'quantized' are reconstructed.
+
+    Args:
+        paths (list): base paths fName of the files written by
+            StreamingDataHandler, i.e. the folder set by streamPath joined
+            with the file name of the run
+
+    Attrib:
+        names (list): file names of the runs
+        nRec (numpy-array, ndim=1): number of valid rows of each run, as of
+            the last call of refresh
+    """
+    def __init__(self, paths):
+        self.paths = [path[:-4] if path.endswith('.npz') else path for path in paths]
+        self.names = [os.path.basename(path) for path in self.paths]
+        self.nRec = np.zeros(len(self.paths), dtype=int)
+        self._runs = [None]*len(self.paths)
+        self._consumed = np.zeros(len(self.paths), dtype=int)
+        self.refresh()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _attach(self, base, ino):
+        """map the files of a run read-only"""
+        fmt = 'quantized' if os.path.isfile(base + '.amp.npy') else 'complex'
+        run = dict(ino=ino, fmt=fmt, x=np.load(base + '.x.npy'), t=np.load(base + '.t.npy', mmap_mode='r'))
+        for key in _FIELD_KEYS[fmt]:
+            run[key] = np.load(base + '.%s.npy'%(key), mmap_mode='r')
+        return run
+
+    def refresh(self):
+        """attach to runs started since the last call and count valid rows
+
+        Returns:
+            nRec (numpy-array, ndim=1): number of valid rows of each run
+        """
+        for i, base in enumerate(self.paths):
+            try:
+                ino = os.stat(base + '.t.npy').st_ino
+            except OSError:
+                continue
+            if self._runs[i] is None or self._runs[i]['ino'] != ino:
+                try:
+                    self._runs[i] = self._attach(base, ino)
+                except (OSError, ValueError):
+                    # -- FILES OF A RUN BEING ALLOCATED, RETRY UPON NEXT CALL
+                    self._runs[i] = None
+                    continue
+                self._consumed[i] = 0
+            self.nRec[i] = np.count_nonzero(np.isfinite(self._runs[i]['t']))
+            self._consumed[i] = min(self._consumed[i], self.nRec[i])
+        return self.nRec
+
+    def _rows(self, i, it):
+        run = self._runs[i]
+        if run['fmt'] == 'quantized':
+            return dequantize(run['amp'][it], run['phase'][it], run['scale'][it])
+        return run['Axt'][it]
+
+    def run(self, i):
+        """valid rows of a run
+
+        Args:
+            i (int): index of the run
+
+        Returns: (x, t, Axt)
+            x (numpy-array, ndim=1): x coordinate axis (None if the run did
+                not start yet)
+            t (numpy-array, ndim=1): time coordinates
+            Axt (numpy-array, ndim=2): field configurations
+        """
+        if self._runs[i] is None:
+            return None, np.zeros(0), np.zeros((0, 0), dtype=np.complex128)
+        it = slice(0, self.nRec[i])
+        return self._runs[i]['x'], self._runs[i]['t'][it], self._rows(i, it)
+
+    def latest(self, func=None):
+        """latest field configuration of each run
+
+        Args:
+            func (object): function func(x, Ax) reducing a field
+                configuration to a number, e.g. its energy (default None)
+
+        Returns: (t, res)
+            t (numpy-array, ndim=1): time of the latest row of each run (NaN
+                for runs without valid rows)
+            res (object): list of the latest field configurations (None for
+                runs without valid rows), or, if func is supplied, array of
+                func applied to them (NaN for runs without valid rows)
+        """
+        t = np.full(len(self), np.nan)
+        res = [None]*len(self)
+        for i in range(len(self)):
+            if self.nRec[i] > 0:
+                t[i] = self._runs[i]['t'][self.nRec[i]-1]
+                res[i] = self._rows(i, self.nRec[i]-1)
+                if func is not None:
+                    res[i] = func(self._runs[i]['x'], res[i])
+        if func is not None:
+            res = np.asarray([np.nan if val is None else val for val in res])
+        return t, res
+
+    def newRows(self, nChunk=256):
+        """iterate over the rows not yet visited, e.g. for running reductions
+
+        Each valid row is yielded once (again, if its run is restarted).
+        Rows written after the last call of refresh are visited upon the
+        next call following refresh.
+
+        Args:
+            nChunk (int): maximal number of rows per chunk (default 256)
+
+        Yields: (i, x, t, Axt)
+            i (int): index of the run
+            x (numpy-array, ndim=1): x coordinate axis
+            t (numpy-array, ndim=1): time coordinates of the chunk
+            Axt (numpy-array, ndim=2): field configurations of the chunk
+        """
+        for i in range(len(self)):
+            while self._consumed[i] < self.nRec[i]:
+                it = slice(self._consumed[i], min(self._consumed[i] + nChunk, self.nRec[i]))
+                self._consumed[i] = it.stop
+                yield i, self._runs[i]['x'], self._runs[i]['t'][it], self._rows(i, it)
+
+# EOF: aggregator.py
@@ -0,0 +1,76 @@
+"""checkpoint.py
+
+Contains functions for writing and reading checkpoints, i.e. snapshots of
+the complete state of a propagation run, allowing to resume interrupted runs.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import numpy as np
+
+
+def _flatten(state, prefix=''):
+    """flatten nested dictionaries, joining keys by '/'"""
+    data = dict()
+    for key, val in state.items():
+        if isinstance(val, dict):
+            data.update(_flatten(val, prefix+key+'/'))
+        else:
+            data[prefix+key] = np.asarray(val)
+    return data
+
+
+def saveCheckpoint(fName, **state):
+    """save checkpoint atomically
+
+    The data is first written to a temporary file which then replaces a
+    possibly existing checkpoint, so that a crash during writing never
+    leaves a corrupted checkpoint behind. Nested dictionaries are stored
+    with keys joined by '/'.
+
+    Args:
+        fName (str): path to checkpoint file (npz format)
+        state (dict): arrays, scalars, strings, or dictionaries thereof
+    """
+    path = os.path.dirname(fName)
+    if path:
+        try:
+            os.makedirs(path)
+        except OSError:
+            pass
+
+    data = _flatten(state)
+
+    tmpFile = fName + '.tmp%d.npz'%(os.getpid())
+    with open(tmpFile, 'wb') as f:
+        np.savez(f, **data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmpFile, fName)
+
+
+def loadCheckpoint(fName):
+    """load checkpoint
+
+    Args:
+        fName (str): path to checkpoint file (npz format)
+
+    Returns:
+        state (dict): checkpoint data, with zero-dimensional arrays converted
+            to python scalars and keys joined by '/' converted to nested
+            dictionaries
+    """
+    state = dict()
+    with np.load(fName) as data:
+        for key in data.files:
+            val = data[key]
+            val = val.item() if val.ndim == 0 else val
+            keys = key.split('/')
+            node = state
+            for subKey in keys[:-1]:
+                node = node.setdefault(subKey, dict())
+            node[keys[-1]] = val
+    return state
+
+# EOF: checkpoint.py
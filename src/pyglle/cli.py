@@ -0,0 +1,145 @@
+"""cli.py
+
+Contains the command line interface of the pyglle package, installed as
+command pyglle and available as python -m pyglle. Simulation setups are read
+from python, TOML, or JSON files (see config.loadSetupClass). The modules
+performing the computations are imported only once a command is run.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import json
+import argparse
+from .config import SWEEP_PARAMETERS, loadSetupClass, coerceParameter
+
+
+def _assignment(arg):
+    """parse KEY=VALUE, wherein VALUE is a JSON literal or a string"""
+    key, sep, val = arg.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError("expected KEY=VALUE, got %s"%(arg))
+    try:
+        val = json.loads(val)
+    except ValueError:
+        pass
+    return key, val
+
+
+def _fetchSetup(args):
+    """instance of the interface class with attributes overridden by --set"""
+    setup = loadSetupClass(args.setupFile, args.className)()
+    for key, val in args.set:
+        setattr(setup, key, coerceParameter(key, val))
+    return setup
+
+
+def _propagate(args):
+    from .interface import propagateInitialCondition, runFileName
+    setup = _fetchSetup(args)
+    if not hasattr(setup, 'fName') or any(key in SWEEP_PARAMETERS for key, _ in args.set):
+        setup.fName = runFileName(setup, getattr(setup, 'sweepPrefix', 'GLLE'))
+    propagateInitialCondition(setup, resume=args.resume, dtype=args.dtype)
+    print("# saved ./data/%s"%(setup.fName))
+
+
+def _stationary(args):
+    from .interface import findStationarySolution
+    setup = _fetchSetup(args)
+    if not hasattr(setup, 'fName'):
+        setup.fName = 'stationary_solution.dat'
+    findStationarySolution(setup, tol=args.tol)
+    print("# saved ./data_stationary_solution/%s"%(setup.fName))
+
+
+def _sweep(args):
+    from .interface import sweep
+    grid = dict((key, getattr(args, key)) for key in SWEEP_PARAMETERS if getattr(args, key) is not None)
+    summary = sweep(args.setupFile, grid, className=args.className, nWorkers=args.workers, nThreads=args.threads, manifest=args.manifest)
+    for name, rec in sorted(summary['records'].items()):
+        print("%-8s %10.3lf s  %s"%(rec['status'], rec.get('wallTime', float('nan')), name))
+    print("# done: %d, failed: %d, pending: %d, wall time (total/mean/max): %.3lf/%.3lf/%.3lf s"%(
+          summary['nDone'], summary['nFailed'], summary['nPending'],
+          summary['wallTimeTotal'], summary['wallTimeMean'], summary['wallTimeMax']))
+
+
+def _stability(args):
+    from .interface import analyzeStability
+    res = analyzeStability(_fetchSetup(args), nEig=args.nEig, sigma=args.sigma)
+    for lam, residual in zip(res['lam'], res['residual']):
+        print("%+14.8lf %+14.8lfi  (residual %.1e)"%(lam.real, lam.imag, residual))
+    print("# %s, growth rate: %.8lf, all eigenvalues within |lam - %g| < %.3lf found"%(
+          'stable' if res['stable'] else 'unstable', res['growthRate'], args.sigma, res['radius']))
+
+
+def main(argv=None):
+    """command line interface
+
+    Usage:
+        pyglle [-C DIR] propagate SETUPFILE [--set KEY=VALUE ...]
+            [--resume] [--dtype {complex128,complex64}] [--className NAME]
+        pyglle [-C DIR] stationary SETUPFILE [--set KEY=VALUE ...]
+            [--tol TOL] [--className NAME]
+        pyglle [-C DIR] sweep SETUPFILE [--P P [P ...]] [--theta THETA ...]
+            [--d2 ...] [--d3 ...] [--d4 ...] [--x0 ...] [--workers N]
+            [--threads N] [--className NAME] [--manifest FILE]
+        pyglle [-C DIR] stability SETUPFILE [--set KEY=VALUE ...]
+            [--nEig N] [--sigma SIGMA] [--className NAME]
+
+    SETUPFILE is a python, TOML, or JSON file (see config.loadSetupClass),
+    resolved before changing to DIR, wherein the output folders are
+    created, e.g. a separate folder for each job. Values of --set are JSON literals, e.g. 0.04, true, or "ssfm",
+    or strings. If propagate overrides one of the parameters of a sweep, or
+    if the setup has no attribute fName, the file name is composed of the
+    parameters (see interface.runFileName).
+    """
+    parser = argparse.ArgumentParser(prog='pyglle')
+    parser.add_argument('-C', dest='directory', default=None, help='working directory of the run, created if necessary')
+    sub = parser.add_subparsers(dest='command')
+
+    def _addSetup(p, overrides=True):
+        p.add_argument('setupFile', help='python, TOML, or JSON file defining the interface class')
+        p.add_argument('--className', default='SIM_SETUP', help='name of interface class')
+        if overrides:
+            p.add_argument('--set', type=_assignment, nargs='+', default=[], metavar='KEY=VALUE',
+                           help='attributes overriding those of the interface class')
+
+    pProp = sub.add_parser('propagate', help='propagate initial condition')
+    _addSetup(pProp)
+    pProp.add_argument('--resume', action='store_true', help='continue from checkpoint if available')
+    pProp.add_argument('--dtype', default='complex128', choices=('complex128', 'complex64'), help='datatype of the field')
+
+    pStat = sub.add_parser('stationary', help='determine stationary solution of the standard LLE')
+    _addSetup(pStat)
+    pStat.add_argument('--tol', type=float, default=1e-10, help='tolerance of root-finding procedure')
+
+    pSweep = sub.add_parser('sweep', help='propagate initial conditions for a grid of parameters')
+    _addSetup(pSweep, overrides=False)
+    for key in SWEEP_PARAMETERS:
+        pSweep.add_argument('--'+key, type=float, nargs='+', help='values of %s'%(key))
+    pSweep.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    pSweep.add_argument('--threads', type=int, default=1, help='number of BLAS/FFT threads per worker')
+    pSweep.add_argument('--manifest', default='./data/sweep_manifest.jsonl', help='manifest recording completed runs')
+
+    pStab = sub.add_parser('stability', help='linear stability analysis of the stationary solution')
+    _addSetup(pStab)
+    pStab.add_argument('--nEig', type=int, default=6, help='number of eigenvalues')
+    pStab.add_argument('--sigma', type=float, default=0.5, help='real shift')
+
+    args = parser.parse_args(argv)
+    commands = dict(propagate=_propagate, stationary=_stationary, sweep=_sweep, stability=_stability)
+    if args.command not in commands:
+        parser.print_help()
+        return
+
+    args.setupFile = os.path.abspath(args.setupFile)
+    if args.directory is not None:
+        os.makedirs(args.directory, exist_ok=True)
+        os.chdir(args.directory)
+    commands[args.command](args)
+
+
+if __name__ == '__main__':
+    main()
+
+# EOF: cli.py
@@ -0,0 +1,160 @@
+"""config.py
+
+Contains functions loading simulation setups, i.e. interface classes holding
+simulation parameters, from python, TOML, or JSON files. A TOML or JSON file
+holds the attributes of the interface class as key-value pairs, wherein the
+initial field is specified by the key initialField (see FileSetup).
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import sys
+import json
+import importlib.util
+import numpy as np
+
+# -- PARAMETERS OF THE GLLE THAT MIGHT BE VARIED IN A SWEEP
+SWEEP_PARAMETERS = ('P', 'theta', 'd2', 'd3', 'd4', 'x0')
+
+# -- PARAMETERS EXPECTED AS FLOAT, ALSO IF GIVEN AS INTEGER IN A SETUP FILE
+FLOAT_PARAMETERS = ('xMax', 'tMax', 'P', 'theta', 'd2', 'd3', 'd4', 'x0', 'h', 'tol', 'samplingTol', 'spectrumKMax',
+                    'tailTol', 'edgeTol', 'cacheMaxMB')
+
+
+def coerceParameter(key, val):
+    """convert integer values of float parameters to float
+
+    Args:
+        key (str): name of the attribute
+        val (object): value of the attribute
+
+    Returns:
+        val (object): value of the attribute, converted to float if key is
+            one of FLOAT_PARAMETERS and val is an integer
+    """
+    if key in FLOAT_PARAMETERS and isinstance(val, int) and not isinstance(val, bool):
+        return float(val)
+    return val
+
+
+def _readTOML(fName):
+    """read TOML file using tomllib (python>=3.11) or tomli"""
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+    with open(fName, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _readJSON(fName):
+    """read JSON file"""
+    with open(fName, 'r') as f:
+        return json.load(f)
+
+
+class FileSetup():
+    """interface class of simulation setups read from TOML or JSON files
+
+    Classes derived by loadSetupClass hold the entries of a setup file as
+    class attributes. Parameters of the standard LLE not specified default
+    to d2=-1, d3=0, d4=0, and x0=0. The initial field is specified by the
+    attribute initialField, being one of
+
+        'sech' (default): localized structure sqrt(2*theta)/cosh(
+            sqrt(theta)*(x-x0)) with the phase of a stationary solution,
+            i.e. the trial solution of the example workflows, to which the
+            root-finding procedure adds the homogeneous background
+        'stationary': stationary solution of the standard LLE obtained from
+            the trial solution 'sech' on the grid of the setup, fetched from
+            the cache of stationary solutions or computed (see
+            interface.fetchStationarySolution)
+        {file = NAME, key = 'Ax0', x = 'x'}: field stored under key in the
+            npz-file NAME, e.g. by findStationarySolution, on the mesh
+            stored under x, resampled spectrally onto the grid of the setup
+            (see resampling.resample). Relative file names refer to the
+            folder of the setup file
+
+    The file is read only if the initial field is requested.
+    """
+    d2 = -1.0
+    d3 = 0.0
+    d4 = 0.0
+    x0 = 0.0
+    initialField = 'sech'
+    setupDir = '.'
+
+    def _sech(self, x):
+        Ax_fnc = lambda x: np.sqrt(2*self.theta)/np.cosh(np.sqrt(self.theta)*x)
+        cosZeta = np.sqrt(8*self.theta)/self.P/np.pi
+        sinZeta = np.sqrt(1-cosZeta*cosZeta)
+        return Ax_fnc(x-self.x0)*(cosZeta+1j*sinZeta)
+
+    def _stationary(self, x):
+        from .interface import fetchStationarySolution
+        setup = type(self)()
+        setup.__dict__.update(self.__dict__)
+        setup.initialField, setup.d3 = 'sech', 0.0
+        return fetchStationarySolution(setup)[1]
+
+    def _stored(self, x, spec):
+        from .resampling import resample
+        fName = os.path.join(self.setupDir, spec['file'])
+        with np.load(fName) as dat:
+            return resample(dat[spec.get('x', 'x')], dat[spec.get('key', 'Ax0')], x)
+
+    def initial_field(self, x):
+        spec = self.initialField
+        if spec == 'sech':
+            return self._sech(x)
+        if spec == 'stationary':
+            return self._stationary(x)
+        if isinstance(spec, dict) and 'file' in spec:
+            return self._stored(x, spec)
+        raise ValueError("initialField: expected 'sech', 'stationary', or table with key file, got %s"%(spec))
+
+
+def loadSetupClass(setupFile, className='SIM_SETUP'):
+    """load interface class from a python, TOML, or JSON file
+
+    A python file is imported as a module, hence it must not start a
+    simulation run at import time (guard such code by if
+    __name__=='__main__'). Its folder is added to the module search path, as
+    for scripts, so that it might import neighbouring setup files. A TOML or
+    JSON file defines a class derived from FileSetup, holding its entries as
+    class attributes.
+
+    Args:
+        setupFile (str): path to setup file with suffix .py, .toml, or .json
+        className (str): name of the interface class defined in a python
+            file, or name of the class derived from a TOML or JSON file
+            (default 'SIM_SETUP')
+
+    Returns:
+        cls (object): interface class
+    """
+    setupFile = os.path.abspath(setupFile)
+    suffix = os.path.splitext(setupFile)[1].lower()
+
+    if suffix == '.py':
+        setupDir = os.path.dirname(setupFile)
+        if setupDir not in sys.path:
+            sys.path.insert(0, setupDir)
+        spec = importlib.util.spec_from_file_location('_pyGLLE_setup', setupFile)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, className)
+
+    if suffix == '.toml':
+        entries = _readTOML(setupFile)
+    elif suffix == '.json':
+        entries = _readJSON(setupFile)
+    else:
+        raise ValueError("setupFile: expected .py, .toml, or .json file, got %s"%(setupFile))
+
+    attrs = dict((key, coerceParameter(key, val)) for key, val in entries.items())
+    attrs['setupDir'] = os.path.dirname(setupFile)
+    return type(className, (FileSetup,), attrs)
+
+# EOF: config.py
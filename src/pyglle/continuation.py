@@ -0,0 +1,221 @@
+"""continuation.py
+
+Contains functions implementing numerical continuation of stationary
+solutions of the standard Lugiato-Lefever equation, i.e. the tracking of a
+branch of solutions upon variation of a parameter. Natural parameter
+continuation and pseudo-arclength continuation, the latter allowing to
+follow a branch around fold points, are implemented.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import numpy as np
+from .stationary_solution import stationarySolution, newtonKrylov
+
+
+def _wDot(u, v, Nx):
+    """weighted inner product of extended vectors (field components, parameter)
+
+    Field components are weighted by 1/Nx, so that the field enters in terms
+    of its mean squared deviation.
+    """
+    return np.dot(u[:-1], v[:-1])/Nx + u[-1]*v[-1]
+
+
+def _branch(pars, As, folds, success):
+    """assemble branch data"""
+    As = np.asarray(As)
+    return dict(par = np.asarray(pars),
+                A = As,
+                norm = np.sqrt(np.mean(np.abs(As)**2, axis=-1)),
+                folds = folds,
+                success = success)
+
+
+def naturalContinuation(x, A_ini, par_ini, parEnd, rhs, tol, ds=0.1, dsMin=1e-4, dsMax=1.0, nMax=1000, maxiter=200, analyticJacobian=True):
+    """natural parameter continuation of a stationary solution
+
+    Steps the parameter in increments ds, using a secant predictor based on
+    the previous two solutions as warm start for the root-finding
+    procedure. If analyticJacobian is True, the root-finding procedure uses
+    the analytic Jacobian-vector products and the spectral preconditioner of
+    the right-hand side, otherwise the Krylov subspace of the
+    finite-difference root-finding procedure is recycled across steps. If
+    the root-finding procedure fails, the increment is
+    halved, otherwise it is increased by a factor 1.5. Natural continuation
+    cannot pass fold points.
+
+    Args:
+        x (numpy-array): discretized x-domain
+        A_ini (numpy-array): stationary solution at parameter value par_ini
+        par_ini (float): initial parameter value
+        parEnd (float): final parameter value
+        rhs (object): function rhs(par) returning the right-hand side of the
+            LLE for parameter value par
+        tol (float): tolerance value used to terminate root-finding procedure
+        ds (float): initial parameter increment (default 0.1)
+        dsMin (float): minimal parameter increment (default 1e-4)
+        dsMax (float): maximal parameter increment (default 1.0)
+        nMax (int): maximal number of continuation steps (default 1000)
+        maxiter (int): maximal number of Newton iterations per step
+            (default 200)
+        analyticJacobian (bool): use methods jvp and preconditioner of the
+            right-hand side, e.g. a GLLEOperator (default True)
+
+    Returns:
+        branch (dict): parameter values par (numpy-array, ndim=1),
+            solutions A (numpy-array, ndim=2), root-mean-square amplitudes
+            norm (numpy-array, ndim=1), indices of fold points folds (list,
+            empty for natural continuation), and flag success indicating
+            whether parEnd was reached
+    """
+    sgn = np.sign(parEnd - par_ini)
+    ds = abs(ds)
+    pars, As = [par_ini], [np.asarray(A_ini, dtype=np.complex128)]
+    if analyticJacobian:
+        opts = dict(maxiter=maxiter)
+    else:
+        opts = dict(maxiter=maxiter, jac_options=dict(inner_outer_v=[]))
+
+    for n in range(nMax):
+        if (pars[-1] - parEnd)*sgn >= 0:
+            return _branch(pars, As, [], True)
+
+        par = pars[-1] + sgn*ds
+        if (par - parEnd)*sgn > 0:
+            par = parEnd
+
+        # -- SECANT PREDICTOR
+        A_pred = As[-1]
+        if len(As) > 1:
+            A_pred = As[-1] + (As[-1]-As[-2])*(par-pars[-1])/(pars[-1]-pars[-2])
+
+        LLE_rhs = rhs(par)
+        if analyticJacobian:
+            A, res = stationarySolution(x, A_pred, LLE_rhs, tol, options=opts, full_output=True,
+                                        jvp=LLE_rhs.jvp, precond=LLE_rhs.preconditioner)
+        else:
+            A, res = stationarySolution(x, A_pred, LLE_rhs, tol, options=opts, full_output=True)
+
+        if not res.success:
+            ds *= 0.5
+            if ds < dsMin:
+                break
+            continue
+
+        pars.append(par)
+        As.append(A)
+        ds = min(1.5*ds, dsMax)
+
+    return _branch(pars, As, [], (pars[-1] - parEnd)*sgn >= 0)
+
+
+def arclengthContinuation(x, A_ini, par_ini, parEnd, rhs, tol, ds=0.1, dsMin=1e-4, dsMax=1.0, nMax=1000, maxiter=200, analyticJacobian=True):
+    """pseudo-arclength continuation of a stationary solution
+
+    Treats the parameter as additional unknown and augments the stationary
+    LLE by the pseudo-arclength condition <y - y_pred, tau> = 0, wherein
+    y=(A, par), tau is the normalized secant tangent of the branch, and
+    y_pred = y + ds*tau is the predictor used as warm start. This allows to
+    follow the branch around fold points, which are detected by a sign
+    change of the parameter component of the tangent. If analyticJacobian
+    is True, the bordered Jacobian of the augmented system is assembled from
+    the analytic Jacobian-vector product of the right-hand side and a
+    finite-difference derivative with respect to the parameter, and
+    preconditioned by the spectral preconditioner of the right-hand side.
+    Otherwise, the Krylov subspace of the finite-difference root-finding
+    procedure is recycled across steps.
+
+    Args:
+        x (numpy-array): discretized x-domain
+        A_ini (numpy-array): stationary solution at parameter value par_ini
+        par_ini (float): initial parameter value
+        parEnd (float): final parameter value, continuation stops if the
+            branch leaves the interval spanned by par_ini and parEnd
+        rhs (object): function rhs(par) returning the right-hand side of the
+            LLE for parameter value par
+        tol (float): tolerance value used to terminate root-finding procedure
+        ds (float): initial arclength increment (default 0.1)
+        dsMin (float): minimal arclength increment (default 1e-4)
+        dsMax (float): maximal arclength increment (default 1.0)
+        nMax (int): maximal number of continuation steps (default 1000)
+        maxiter (int): maximal number of Newton iterations per step
+            (default 200)
+        analyticJacobian (bool): use methods jvp and preconditioner of the
+            right-hand side, e.g. a GLLEOperator (default True)
+
+    Returns:
+        branch (dict): see naturalContinuation, with folds (list) holding
+            the indices of the solutions closest to fold points, and flag
+            success indicating whether the branch left the parameter
+            interval
+    """
+    from scipy.optimize import root
+    Nx = x.size
+    pLo, pHi = min(par_ini, parEnd), max(par_ini, parEnd)
+    _ext = lambda A, par: np.append(np.asarray(A, dtype=np.complex128).view(np.float64), par)
+
+    # -- FIRST STEP BY NATURAL CONTINUATION TO OBTAIN AN INITIAL SECANT
+    b0 = naturalContinuation(x, A_ini, par_ini, par_ini + np.sign(parEnd-par_ini)*abs(ds),
+                             rhs, tol, ds=ds, dsMin=dsMin, dsMax=dsMax, nMax=20, maxiter=maxiter,
+                             analyticJacobian=analyticJacobian)
+    if b0['par'].size < 2:
+        return _branch(b0['par'], b0['A'], [], False)
+
+    pars, As, folds = list(b0['par']), list(b0['A']), []
+    y = _ext(As[-1], pars[-1])
+    dy = y - _ext(As[-2], pars[-2])
+    tau = dy/np.sqrt(_wDot(dy, dy, Nx))
+    ds = abs(ds)
+
+    opts = dict(maxiter=maxiter, jac_options=dict(inner_outer_v=[]))
+
+    def _G(yc, y_pred, tau):
+        A = yc[:-1].view(np.complex128)
+        return np.append(rhs(yc[-1])(A).view(np.float64), _wDot(yc - y_pred, tau, Nx))
+
+    # -- BORDERED JACOBIAN [[J, dF/dpar], [w*tau_A, tau_par]] OF AUGMENTED SYSTEM
+    _cache = dict(y=None, rhs=rhs(pars[-1]))
+    def _jvp(yc, v, tau):
+        if yc is not _cache['y']:
+            A, par = yc[:-1].view(np.complex128), yc[-1]
+            eps = 1e-7*max(1., abs(par))
+            LLE_rhs = rhs(par)
+            _cache.update(y=yc, A=A, rhs=LLE_rhs, dFdp=(rhs(par+eps)(A) - LLE_rhs(A))/eps)
+        JvA = _cache['rhs'].jvp(_cache['A'], v[:-1].view(np.complex128)) + v[-1]*_cache['dFdp']
+        return np.append(JvA.view(np.float64), _wDot(v, tau, Nx))
+
+    # -- PRECONDITIONER FROM LATEST LINEARIZATION POINT
+    def _M(v):
+        MvA = _cache['rhs'].preconditioner(v[:-1].view(np.complex128))
+        return np.append(MvA.view(np.float64), v[-1])
+
+    for n in range(nMax):
+        if not (pLo <= pars[-1] <= pHi):
+            break
+
+        y_pred = y + ds*tau
+        if analyticJacobian:
+            res = newtonKrylov(lambda yc: _G(yc, y_pred, tau), y_pred, lambda yc, v: _jvp(yc, v, tau), tol, M=_M, maxiter=maxiter)
+        else:
+            res = root(lambda yc: _G(yc, y_pred, tau), y_pred, method='krylov', tol=tol, options=opts)
+
+        if not res.success:
+            ds *= 0.5
+            if ds < dsMin:
+                break
+            continue
+
+        dy = res.x - y
+        tauNew = dy/np.sqrt(_wDot(dy, dy, Nx))
+        if tauNew[-1]*tau[-1] < 0:
+            folds.append(len(pars)-1)
+
+        y, tau = res.x, tauNew
+        pars.append(y[-1])
+        As.append(y[:-1].view(np.complex128).copy())
+        ds = min(1.5*ds, dsMax)
+
+    return _branch(pars, As, folds, not (pLo <= pars[-1] <= pHi))
+
+# EOF: continuation.py
@@ -0,0 +1,883 @@
+""" data_handler.py
+
+Contains class data structure handling data accumulation and output, a
+background writer storing measurements while the integration continues, and
+a reader providing lazy access to windows of the stored data.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import time
+import queue
+import atexit
+import threading
+import numpy as np
+from .fft_backend import getBackend
+
+
+# -- STORAGE FORMATS AND ARRAYS HOLDING THE FIELD CONFIGURATIONS
+FORMATS = ('complex', 'quantized')
+_FIELD_KEYS = dict(complex=('Axt',), quantized=('amp', 'phase', 'scale'))
+
+
+def quantize(Ax):
+    """quantize field configurations to 16 bit magnitude and phase
+
+    The magnitude is quantized linearly relative to the maximal magnitude of
+    each field configuration, the phase uniformly in [-pi, pi). The absolute
+    error of the magnitude is thus below 7.7e-6 times the maximal magnitude,
+    the error of the phase below 4.8e-5.
+
+    Args:
+        Ax (numpy-array): field configuration(s), x-axis last
+
+    Returns: (amp, phase, scale)
+        amp (numpy-array, dtype=uint16): quantized magnitude
+        phase (numpy-array, dtype=uint16): quantized phase
+        scale (numpy-array): maximal magnitude of each field configuration
+    """
+    Ax = np.asarray(Ax)
+    mag = np.abs(Ax)
+    scale = mag.max(axis=-1, initial=0.)
+    norm = np.where(scale > 0, scale, 1.)[..., np.newaxis]
+    amp = np.rint(mag/norm*65535).astype(np.uint16)
+    phase = (np.rint((np.angle(Ax)+np.pi)*(65536/(2*np.pi))).astype(np.int64)%65536).astype(np.uint16)
+    return amp, phase, scale
+
+
+def dequantize(amp, phase, scale, dtype=np.complex128):
+    """reconstruct field configurations from quantized magnitude and phase
+
+    Args:
+        amp (numpy-array, dtype=uint16): quantized magnitude
+        phase (numpy-array, dtype=uint16): quantized phase
+        scale (numpy-array): maximal magnitude of each field configuration
+        dtype (object): complex datatype of the result (default
+            numpy.complex128)
+
+    Returns:
+        Ax (numpy-array): field configuration(s)
+    """
+    rdtype = np.finfo(dtype).dtype
+    mag = np.asarray(amp, dtype=rdtype)*(np.asarray(scale, dtype=rdtype)/65535)[..., np.newaxis]
+    return (mag*np.exp(1j*(np.asarray(phase, dtype=rdtype)*(2*np.pi/65536) - np.pi))).astype(dtype, copy=False)
+
+
+class AdaptiveSampler():
+    """decides whether to keep a field configuration based on its change
+
+    A field configuration is kept if it differs from the last kept one by
+    more than a relative threshold rtol, or if nMax steps have passed since
+    the last kept one. The change is measured either in terms of the field,
+    i.e. ||A - A_last||/||A_last||, or in terms of the power spectrum, i.e.
+    sum|S - S_last|/sum S_last with S = |ifft(A)|^2. The latter is
+    insensitive to phase rotations and translations of the field and hence
+    suited for drifting or breathing localized structures.
+    """
+    METRICS = ('norm', 'spectrum')
+
+    def __init__(self, rtol=1e-2, metric='norm', nMax=100):
+        """generates instance of adaptive sampler
+
+        Args:
+            rtol (float): relative change triggering a measurement
+                (default 1e-2)
+            metric (str): change metric, one of 'norm', 'spectrum' (default
+                'norm')
+            nMax (int): maximal number of steps between kept field
+                configurations (default 100)
+        """
+        if metric not in self.METRICS:
+            raise ValueError("metric: expected one of %s, got %s"%(self.METRICS, metric))
+        self.rtol = rtol
+        self.metric = metric
+        self.nMax = nMax
+        self.nLast = None
+        self.ref = None
+
+    def _observable(self, Ax):
+        if self.metric == 'spectrum':
+            return np.abs(np.fft.ifft(Ax))**2
+        return np.array(Ax, dtype=np.complex128)
+
+    def _change(self, obs):
+        if self.metric == 'spectrum':
+            return np.sum(np.abs(obs - self.ref))/np.sum(self.ref)
+        return np.linalg.norm(obs - self.ref)/np.linalg.norm(self.ref)
+
+    def __call__(self, n, Ax):
+        """decide whether to keep field configuration
+
+        Args:
+            n (int): current propagation step
+            Ax (numpy-array, ndim=1): field components
+
+        Returns:
+            keep (bool): True if the field configuration is to be kept
+        """
+        obs = self._observable(Ax)
+        if self.nLast is not None and n - self.nLast < self.nMax and self._change(obs) <= self.rtol:
+            return False
+        self.nLast, self.ref = n, obs
+        return True
+
+    def getState(self):
+        """state of sampler, i.e. last kept step and reference observable"""
+        if self.nLast is None:
+            return dict(nLast=-1)
+        return dict(nLast=self.nLast, ref=self.ref)
+
+    def setState(self, state):
+        """restore state of sampler as returned by getState"""
+        nLast = int(state['nLast'])
+        self.nLast, self.ref = (None, None) if nLast < 0 else (nLast, np.asarray(state['ref']))
+
+
+class SpectrumRecorder():
+    """computes windowed and decimated spectral intensities |A_k|^2
+
+    Spectral intensities are computed with the FFT backend of the
+    right-hand-side, restricted to wavenumbers |k| <= kMax, decimated to
+    every nStep-th wavenumber, and stored in single precision in ascending
+    order of k, so that postprocessing needs no further transforms.
+    """
+    def __init__(self, fft=None, kMax=None, nStep=1):
+        """generates instance of spectrum recorder
+
+        Args:
+            fft (object): FFT backend instance or name of registered backend
+                (default None, i.e. the default backend of fft_backend)
+            kMax (float): maximal absolute wavenumber kept (default None,
+                i.e. all wavenumbers)
+            nStep (int): keep every nStep-th wavenumber (default 1)
+
+        Attrib:
+            k (numpy-array, ndim=1): kept wavenumbers in ascending order,
+                available after the first call
+        """
+        self.fft = getBackend() if fft is None else getBackend(fft)
+        self.kMax = kMax
+        self.nStep = nStep
+        self.k = None
+        self._idx = None
+
+    def wavenumbers(self, x):
+        """kept wavenumbers for given x coordinate axis"""
+        if self._idx is None:
+            x = np.asarray(x)
+            k = self.fft.fftshift(self.fft.fftfreq(x.size, d=x[1]-x[0])*2*np.pi)
+            idx = np.arange(x.size) if self.kMax is None else np.flatnonzero(np.abs(k) <= self.kMax)
+            # -- INDICES IN UNSHIFTED ORDER, DECIMATED SYMMETRICALLY ABOUT k=0
+            idx = idx[(idx - x.size//2)%self.nStep == 0]
+            self._idx = (idx - x.size//2)%x.size
+            self.k = k[idx]
+        return self.k
+
+    def __call__(self, x, Ax):
+        """spectral intensities of field configuration(s)
+
+        Args:
+            x (numpy-array, ndim=1): x coordinate axis
+            Ax (numpy-array): field configuration(s), x-axis last
+
+        Returns:
+            Ik (numpy-array, dtype=float32): spectral intensities at the kept
+                wavenumbers
+        """
+        self.wavenumbers(x)
+        Ak = self.fft.ifft(Ax)[..., self._idx]
+        return (Ak.real**2 + Ak.imag**2).astype(np.float32)
+
+
+class DataHandler():
+    """data structure holding accumulated data
+    """
+    def __init__(self, nSkip=1, sampler=None, dtype=None, fmt='complex', spectrum=None):
+        """generates instance of data handler
+
+        Args:
+            nSkip (int): consider every nSkip-th field configuration
+                (default 1)
+            sampler (object): function sampler(n, Ax) deciding whether a
+                considered field configuration is kept, e.g. an
+                AdaptiveSampler. If None, every considered field
+                configuration is kept (default None)
+            dtype (object): datatype kept field configurations are
+                converted to, e.g. numpy.complex64 to halve the storage of
+                double precision runs. If None, the datatype of the measured
+                field configurations is kept (default None)
+            fmt (str): storage format, one of 'complex' (all field
+                configurations in a compressed npz file) and 'quantized'
+                (16 bit magnitude and phase in uncompressed npy files,
+                allowing lazy access via SnapshotReader) (default 'complex')
+            spectrum (object): function spectrum(x, Ax) computing spectral
+                intensities stored alongside each kept field configuration,
+                e.g. a SpectrumRecorder. If None, no spectra are stored
+                (default None)
+
+        Attrib:
+            w (numpy-array, ndim=1): anglular frequency axis
+            t  (numpy-array, ndim=1): time axis
+            z (numpy-array, ndim=1): z-axis, i.e. propagation direction axis
+            u (numpy-array, ndim=2): frequency components of field
+        """
+        self.nSkip=nSkip
+        self.sampler = sampler
+        self.dtype = dtype
+        if fmt not in FORMATS:
+            raise ValueError("fmt: expected one of %s, got %s"%(FORMATS, fmt))
+        self.fmt = fmt
+        self.spectrum = spectrum
+        self.Ikt = []
+        self.Axt = []
+        self.t = []
+        self.x = []
+        self.info = "00 -- I:INFO, D:DATA\n"
+
+    def measure(self, n, t, x, Ax):
+        """measure
+
+        Callback function facilitating measurement
+
+        Args:
+            n (int): current propagation step
+            t (numpy-array, ndim=1): time-axis
+            x (numpy-array, ndim=1): x coordinate axis
+            Ax (numpy-array, ndim=1): field components
+        """
+        if self._keep(n, Ax):
+            self.Axt.append(Ax if self.dtype is None else np.asarray(Ax, dtype=self.dtype))
+            if self.spectrum is not None:
+                self.Ikt.append(self.spectrum(x, Ax))
+            self.t.append(t)
+            self.x = x
+
+    def considers(self, n):
+        """whether the field configuration at step n might be kept, i.e. is
+        passed on to the sampler, allowing to skip preparing others"""
+        return n%self.nSkip == 0
+
+    def _keep(self, n, Ax):
+        """decide whether field configuration at step n is kept"""
+        if not self.considers(n):
+            return False
+        return True if self.sampler is None else self.sampler(n, Ax)
+
+    def _samplerState(self, state):
+        if self.sampler is not None:
+            state['sampler'] = self.sampler.getState()
+        return state
+
+    def _keys(self):
+        """names of the arrays holding one row per kept field configuration"""
+        return _FIELD_KEYS[self.fmt] + (('Ikt',) if self.spectrum is not None else ())
+
+    def _spectrumData(self):
+        """wavenumbers of stored spectra, saved alongside the metadata"""
+        if self.spectrum is None or len(self.x) == 0:
+            return dict()
+        return dict(k=self.spectrum.wavenumbers(self.x))
+
+    def getState(self):
+        """state of data handler, allowing to resume measurements
+
+        Returns:
+            state (dict): accumulated data
+        """
+        state = dict(Axt=np.asarray(self.Axt), t=np.asarray(self.t), x=np.asarray(self.x))
+        if self.spectrum is not None:
+            state['Ikt'] = np.asarray(self.Ikt)
+        return self._samplerState(state)
+
+    def setState(self, state):
+        """restore state of data handler
+
+        Args:
+            state (dict): accumulated data as returned by getState
+        """
+        self.Axt = list(state['Axt'])
+        self.t = list(state['t'])
+        self.x = state['x']
+        if self.spectrum is not None:
+            self.Ikt = list(state['Ikt'])
+        if self.sampler is not None and 'sampler' in state:
+            self.sampler.setState(state['sampler'])
+
+    def close(self):
+        """store pending measurements, nothing to do for data kept in memory"""
+        pass
+
+    def save(self, fName, path='./',**kwargs):
+            """save data in numpy format
+
+            Saves data in numpy native compressed npz format. For the format
+            'quantized', the field configurations are stored in the files
+            fName.amp.npy, fName.phase.npy, and fName.scale.npy (see
+            quantize), and stored spectra in the file fName.Ikt.npy, so that
+            the npz file holds the metadata only. If no field configuration
+            was kept, e.g. since the run stopped early, empty arrays with
+            one row per kept field configuration are stored.
+
+            Args:
+                fName (str): base name for output files
+                path (str): path to folder where output will be stored
+                    (default './')
+                kwargs (dict): info dictionary
+            """
+            try:
+                os.makedirs(path)
+            except OSError:
+                pass
+
+            for key, val in sorted(kwargs.items()):
+               self.info += "%s: %s\n"%(key,val)
+
+            if self.t:
+                Axt, Ikt = np.asarray(self.Axt), np.asarray(self.Ikt, dtype=np.float32)
+            else:
+                # -- NO FIELD CONFIGURATION KEPT
+                Axt = np.zeros((0, len(self.x)), dtype=np.complex128 if self.dtype is None else self.dtype)
+                Ikt = np.zeros((0, 0), dtype=np.float32)
+
+            if self.fmt == 'quantized':
+                files = dict()
+                arrs = quantize(Axt) + ((Ikt,) if self.spectrum is not None else ())
+                for key, arr in zip(self._keys(), arrs):
+                    files[key+'File'] = fName + '.%s.npy'%(key)
+                    np.save(os.path.join(path, files[key+'File']), arr)
+                np.savez_compressed(os.path.join(path, fName),
+                        info=self.info,
+                        x=np.asarray(self.x),
+                        t=np.asarray(self.t),
+                        nRec=len(self.t),
+                        fmt=self.fmt,
+                        **dict(files, **self._spectrumData()))
+                return
+
+            spectra = dict() if self.spectrum is None else dict(Ikt=Ikt, **self._spectrumData())
+            np.savez_compressed(os.path.join(path, fName),
+                    info=self.info,
+                    x=np.asarray(self.x),
+                    t=np.asarray(self.t),
+                    Axt=Axt,
+                    **spectra)
+
+
+class AsyncWriter():
+    """background thread storing measurements
+
+    Measurements are copied into one of nBuffer preallocated buffers and
+    queued, while a background thread stores them, e.g. quantizes and writes
+    them to disk, and then returns the buffer. If all buffers are in use,
+    i.e. storing cannot keep up with the measurements, submitting blocks
+    until a buffer is returned (backpressure), so that the memory
+    consumption is bounded. After an exception was raised while storing,
+    every later call of submit, join, or close raises a RuntimeError, and
+    measurements queued in the meantime are discarded. Queued measurements
+    are stored upon close, which is also called at interpreter exit.
+    """
+    def __init__(self, store, nBuffer=2):
+        """generates instance of background writer
+
+        Args:
+            store (object): function store(*args, *buffers) storing a
+                measurement, called from the background thread
+            nBuffer (int): number of preallocated buffers (default 2, i.e.
+                double buffering)
+
+        Attrib:
+            nWait (int): number of measurements that waited for a buffer
+            tWait (float): total time waited for buffers in seconds
+        """
+        if not isinstance(nBuffer, int) or nBuffer < 1:
+            raise ValueError("nBuffer: expected positive int, got %s"%(nBuffer))
+        self.store = store
+        self.nBuffer = nBuffer
+        self.nWait = 0
+        self.tWait = 0.
+        self._free = queue.Queue()
+        self._todo = queue.Queue()
+        self._thread = None
+        self._error = None
+
+    def _start(self, arrays):
+        """allocate buffers matching the first measurement and start thread"""
+        if self._free.empty():
+            for _ in range(self.nBuffer):
+                self._free.put([np.empty_like(arr) for arr in arrays])
+        self._thread = threading.Thread(target=self._run, name='AsyncWriter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self._todo.get()
+            if item is None:
+                self._todo.task_done()
+                return
+            args, buffers = item
+            try:
+                if self._error is None:
+                    self.store(*(args + tuple(buffers)))
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._free.put(buffers)
+                self._todo.task_done()
+
+    def _raise(self):
+        if self._error is not None:
+            raise RuntimeError("AsyncWriter: storing a measurement failed") from self._error
+
+    def submit(self, args, arrays):
+        """queue a measurement, blocking while no buffer is free
+
+        Refuses the measurement if storing a previous one failed.
+
+        Args:
+            args (tuple): leading arguments of store, e.g. row and time
+            arrays (tuple): arrays copied into the buffers passed to store
+        """
+        self._raise()
+        if self._thread is None:
+            self._start(arrays)
+        try:
+            buffers = self._free.get_nowait()
+        except queue.Empty:
+            t0 = time.perf_counter()
+            buffers = self._free.get()
+            self.nWait += 1
+            self.tWait += time.perf_counter() - t0
+        for buf, arr in zip(buffers, arrays):
+            np.copyto(buf, arr)
+        self._todo.put((tuple(args), buffers))
+
+    def join(self):
+        """wait until all queued measurements are stored"""
+        if self._thread is not None:
+            self._todo.join()
+        self._raise()
+
+    def close(self):
+        """store queued measurements and stop the background thread"""
+        if self._thread is not None:
+            self._todo.put(None)
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.close)
+        self._raise()
+
+
+class StreamingDataHandler(DataHandler):
+    """data structure writing accumulated data to disk incrementally
+
+    Each kept field configuration is written to a preallocated array on disk
+    (npy memory map) as soon as it is measured, so that the memory
+    consumption is independent of the number of measurements and data
+    measured up to a crash is retained. For an output file name fName, the
+    data is stored in the files
+
+        fName.Axt.npy: field configurations, one row per measurement
+        fName.t.npy: time coordinates, unused rows hold NaN
+        fName.x.npy: x coordinate axis
+        fName.npz: info, x, t, and name of file holding the field, written
+            by save()
+
+    For the format 'quantized', the file fName.Axt.npy is replaced by the
+    files fName.amp.npy, fName.phase.npy, and fName.scale.npy (see quantize).
+    If spectra are recorded, they are stored in the file fName.Ikt.npy, and
+    the corresponding wavenumbers in the file fName.k.npy.
+
+    The rows are written in order, the time coordinate last, so that other
+    processes memory mapping the files (see aggregator.RunAggregator) read
+    the valid rows while the run proceeds. Placing path on a RAM-backed file
+    system, e.g. /dev/shm, turns the files into shared memory.
+
+    With nBuffer > 0, kept field configurations are quantized, written, and
+    flushed to disk by an AsyncWriter while the integration continues.
+    Sampling decisions and spectra are computed upon measurement, so that
+    the FFT backend is not shared between threads.
+    """
+    def __init__(self, fName, nMax, path='./', nSkip=1, nFlush=100, sampler=None, dtype=None, fmt='complex', spectrum=None, nBuffer=0):
+        """generates instance of streaming data handler
+
+        Args:
+            fName (str): base name for output files
+            nMax (int): maximal number of measurements, i.e. number of rows
+                of the preallocated arrays
+            path (str): path to folder where output will be stored
+                (default './')
+            nSkip (int): keep every nSkip-th field configuration (default 1)
+            nFlush (int): flush data to disk after every nFlush measurements
+                (default 100)
+            sampler (object): function sampler(n, Ax) deciding whether a
+                considered field configuration is kept (default None, see
+                DataHandler)
+            dtype (object): datatype of the array on disk (default None,
+                i.e. the datatype of the first measured field configuration)
+            fmt (str): storage format, one of 'complex', 'quantized'
+                (default 'complex')
+            spectrum (object): function spectrum(x, Ax) computing spectral
+                intensities (default None, see DataHandler)
+            nBuffer (int): number of buffers of the background writer, or 0
+                to store measurements synchronously (default 0)
+        """
+        DataHandler.__init__(self, nSkip, sampler, dtype, fmt, spectrum)
+        self.fName = fName
+        self.path = path
+        self.nMax = nMax
+        self.nFlush = nFlush
+        self.nRec = 0
+        self.writer = AsyncWriter(self._store, nBuffer) if nBuffer else None
+
+    def _fileName(self, key):
+        return os.path.join(self.path, self.fName + '.%s.npy'%(key))
+
+    def _allocate(self, x, Ax):
+        """preallocate arrays on disk upon first measurement"""
+        try:
+            os.makedirs(self.path)
+        except OSError:
+            pass
+        # -- REMOVE FILES OF A PREVIOUS RUN INSTEAD OF TRUNCATING THEM, SO THAT
+        # -- READERS STILL MAPPING THEM ARE NOT AFFECTED
+        for key in ('t', 'Axt', 'amp', 'phase', 'scale', 'Ikt', 'k'):
+            if os.path.isfile(self._fileName(key)):
+                os.remove(self._fileName(key))
+        self.x = np.asarray(x)
+        np.save(self._fileName('x'), self.x)
+        _open = lambda key, dtype, shape: np.lib.format.open_memmap(self._fileName(key), mode='w+', dtype=dtype, shape=shape)
+        if self.fmt == 'quantized':
+            self.amp = _open('amp', np.uint16, (self.nMax, self.x.size))
+            self.phase = _open('phase', np.uint16, (self.nMax, self.x.size))
+            self.scale = _open('scale', np.float64, (self.nMax,))
+        else:
+            self.Axt = _open('Axt', np.asarray(Ax).dtype if self.dtype is None else self.dtype, (self.nMax, self.x.size))
+        if self.spectrum is not None:
+            np.save(self._fileName('k'), self.spectrum.wavenumbers(self.x))
+            self.Ikt = _open('Ikt', np.float32, (self.nMax, self.spectrum.k.size))
+        # -- TIME COORDINATES LAST, FILLED WITH NAN AND MOVED INTO PLACE
+        # -- ATOMICALLY, SO THAT READERS NEVER SEE UNUSED ROWS AS VALID
+        tmpName = self._fileName('t.tmp')
+        np.save(tmpName, np.full(self.nMax, np.nan))
+        os.replace(tmpName, self._fileName('t'))
+        self.t = np.lib.format.open_memmap(self._fileName('t'), mode='r+')
+
+    def measure(self, n, t, x, Ax):
+        """measure
+
+        Callback function facilitating measurement. Measurements exceeding
+        the preallocated number of rows are discarded.
+
+        Args:
+            n (int): current propagation step
+            t (numpy-array, ndim=1): time-axis
+            x (numpy-array, ndim=1): x coordinate axis
+            Ax (numpy-array, ndim=1): field components
+        """
+        if self.nRec < self.nMax and self._keep(n, Ax):
+            if self.nRec == 0:
+                self._allocate(x, Ax)
+            arrays = (Ax,) if self.spectrum is None else (Ax, self.spectrum(x, Ax))
+            if self.writer is None:
+                self._store(self.nRec, t, *arrays)
+            else:
+                self.writer.submit((self.nRec, t), arrays)
+            self.nRec += 1
+
+    def _store(self, row, t, Ax, Ik=None):
+        """write measurement to row of the arrays on disk"""
+        if self.fmt == 'quantized':
+            self.amp[row], self.phase[row], self.scale[row] = quantize(Ax)
+        else:
+            self.Axt[row] = Ax
+        if Ik is not None:
+            self.Ikt[row] = Ik
+        self.t[row] = t
+        if (row+1)%self.nFlush==0:
+            self._flushArrays()
+
+    def _flushArrays(self):
+        if self.nRec > 0:
+            for key in self._keys() + ('t',):
+                getattr(self, key).flush()
+
+    def flush(self):
+        """write pending measurements to disk"""
+        if self.writer is not None:
+            self.writer.join()
+        self._flushArrays()
+
+    def close(self):
+        """write pending measurements to disk and stop the background writer"""
+        if self.writer is not None:
+            self.writer.close()
+        self._flushArrays()
+
+    def getState(self):
+        """state of data handler, allowing to resume measurements
+
+        Flushes pending measurements, so that the data on disk is consistent
+        with the returned state.
+
+        Returns:
+            state (dict): number of stored measurements
+        """
+        self.flush()
+        return self._samplerState(dict(nRec=self.nRec))
+
+    def setState(self, state):
+        """restore state of data handler
+
+        Reopens the arrays on disk and discards measurements beyond the
+        restored number of measurements.
+
+        Args:
+            state (dict): number of stored measurements as returned by
+                getState
+        """
+        self.nRec = int(state['nRec'])
+        if self.nRec > 0:
+            self.x = np.load(self._fileName('x'))
+            for key in self._keys() + ('t',):
+                setattr(self, key, np.lib.format.open_memmap(self._fileName(key), mode='r+'))
+            self.t[self.nRec:] = np.nan
+        if self.sampler is not None and 'sampler' in state:
+            self.sampler.setState(state['sampler'])
+
+    def _saveEmpty(self):
+        """write empty arrays on disk if no field configuration was kept"""
+        try:
+            os.makedirs(self.path)
+        except OSError:
+            pass
+        # -- NO FIELD CONFIGURATION KEPT, FILES OF A PREVIOUS RUN ARE REMOVED
+        for key in ('t', 'Axt', 'amp', 'phase', 'scale', 'Ikt', 'k'):
+            if os.path.isfile(self._fileName(key)):
+                os.remove(self._fileName(key))
+        Axt = np.zeros((0, len(self.x)), dtype=np.complex128 if self.dtype is None else self.dtype)
+        arrs = quantize(Axt) if self.fmt == 'quantized' else (Axt,)
+        arrs += (np.zeros((0, 0), dtype=np.float32),) if self.spectrum is not None else ()
+        for key, arr in zip(self._keys() + ('x', 't'), arrs + (np.asarray(self.x), np.zeros(0))):
+            np.save(self._fileName(key), arr)
+
+    def save(self, fName=None, path=None, **kwargs):
+            """save data in numpy format
+
+            Flushes the memory mapped arrays and saves metadata in numpy
+            native compressed npz format. The field configurations remain
+            in file fName.Axt.npy (or the files of the quantized format),
+            see loadData and SnapshotReader. If no field configuration was
+            kept, these files hold empty arrays.
+
+            Args:
+                fName (str): base name for output files (default: as
+                    supplied to the constructor)
+                path (str): path to folder where output will be stored
+                    (default: as supplied to the constructor)
+                kwargs (dict): info dictionary
+            """
+            fName = self.fName if fName is None else fName
+            path = self.path if path is None else path
+            self.close()
+            if self.nRec == 0:
+                self._saveEmpty()
+
+            try:
+                os.makedirs(path)
+            except OSError:
+                pass
+
+            for key, val in sorted(kwargs.items()):
+               self.info += "%s: %s\n"%(key,val)
+
+            # -- FILES IN ANOTHER FOLDER, E.G. ON /dev/shm, ARE REFERENCED BY ABSOLUTE PATH
+            _ref = lambda fName: os.path.basename(fName) if os.path.abspath(os.path.dirname(fName)) == os.path.abspath(path) else os.path.abspath(fName)
+            files = dict((key+'File', _ref(self._fileName(key))) for key in self._keys())
+            np.savez_compressed(os.path.join(path, fName),
+                    info=self.info,
+                    x=np.asarray(self.x),
+                    t=np.asarray(self.t[:self.nRec]),
+                    nRec=self.nRec,
+                    fmt=self.fmt,
+                    **dict(files, **self._spectrumData()))
+
+
+class SnapshotReader():
+    """lazy access to data stored by DataHandler or StreamingDataHandler
+
+    Field configurations stored in npy files, i.e. by a StreamingDataHandler
+    or in the format 'quantized', are memory mapped, so that only the
+    requested windows in time and x are read from disk. Field configurations
+    stored in a compressed npz file are loaded in full on first access. If
+    a streamed run did not finish (no npz file present), the valid rows are
+    inferred from the stored time coordinates.
+
+    Args:
+        iPath (str): path to npz file, or base path fName of the files
+            written by a StreamingDataHandler
+
+    Attrib:
+        x (numpy-array, ndim=1): x coordinate axis
+        t (numpy-array, ndim=1): time coordinates
+        k (numpy-array, ndim=1): wavenumbers of stored spectra (None if no
+            spectra were stored)
+        info (str): metadata
+        nRec (int): number of stored field configurations
+        fmt (str): storage format, one of 'complex', 'quantized'
+    """
+    def __init__(self, iPath):
+        base = iPath[:-4] if iPath.endswith('.npz') else iPath
+        dirName = os.path.dirname(base)
+        self._data = dict()
+
+        if os.path.isfile(base + '.npz'):
+            data = np.load(base + '.npz')
+            self.x, self.t, self.info = data['x'], data['t'], str(data['info'])
+            self.fmt = str(data['fmt']) if 'fmt' in data else 'complex'
+            self.k = data['k'] if 'k' in data else None
+            self.nRec = self.t.size
+            if 'Axt' in data:
+                self._npz = data
+                return
+            keys = _FIELD_KEYS[self.fmt] + (('Ikt',) if 'IktFile' in data else ())
+            files = dict((key, os.path.join(dirName, str(data[key+'File']))) for key in keys)
+        else:
+            t = np.load(base + '.t.npy')
+            self.nRec = int(np.sum(np.isfinite(t)))
+            self.x, self.t, self.info = np.load(base + '.x.npy'), t[:self.nRec], ""
+            self.fmt = 'quantized' if os.path.isfile(base + '.amp.npy') else 'complex'
+            self.k = np.load(base + '.k.npy') if os.path.isfile(base + '.k.npy') else None
+            keys = _FIELD_KEYS[self.fmt] + (('Ikt',) if self.k is not None else ())
+            files = dict((key, base + '.%s.npy'%(key)) for key in keys)
+
+        for key, fName in files.items():
+            self._data[key] = np.load(fName, mmap_mode='r')[:self.nRec]
+
+    def _array(self, key):
+        if key not in self._data:
+            self._data[key] = self._npz[key]
+        return self._data[key]
+
+    def window(self, tLim, xLim, tStep=1, x=None):
+        """index slices of the time window and of the x window (or of a window
+        of another axis x, e.g. the wavenumbers k)"""
+        _slice = lambda z, lim, step: slice(None, None, step) if lim is None else \
+                slice(np.searchsorted(z, lim[0], side='left'), np.searchsorted(z, lim[1], side='right'), step)
+        return _slice(self.t, tLim, tStep), _slice(self.x if x is None else x, xLim, None)
+
+    def field(self, tLim=None, xLim=None, tStep=1):
+        """field configurations in a window of time and x
+
+        Args:
+            tLim (tuple): time interval (tMin, tMax) (default None, i.e. all
+                times)
+            xLim (tuple): x interval (xMin, xMax) (default None, i.e. full
+                x-domain)
+            tStep (int): stride along the time axis (default 1)
+
+        Returns: (x, t, Axt)
+            x (numpy-array, ndim=1): x coordinates of the window
+            t (numpy-array, ndim=1): time coordinates of the window
+            Axt (numpy-array, ndim=2): field configurations in the window
+        """
+        it, ix = self.window(tLim, xLim, tStep)
+        if self.fmt == 'quantized':
+            Axt = dequantize(self._array('amp')[it, ix], self._array('phase')[it, ix], self._array('scale')[it])
+        else:
+            Axt = np.asarray(self._array('Axt')[it, ix])
+        return self.x[ix], self.t[it], Axt
+
+    def intensity(self, tLim=None, xLim=None, tStep=1):
+        """intensity |A|^2 in a window of time and x
+
+        For the format 'quantized' only the magnitude is read from disk.
+
+        Args:
+            tLim (tuple): time interval (tMin, tMax) (default None)
+            xLim (tuple): x interval (xMin, xMax) (default None)
+            tStep (int): stride along the time axis (default 1)
+
+        Returns: (x, t, Ixt)
+            x (numpy-array, ndim=1): x coordinates of the window
+            t (numpy-array, ndim=1): time coordinates of the window
+            Ixt (numpy-array, ndim=2): intensities in the window
+        """
+        it, ix = self.window(tLim, xLim, tStep)
+        if self.fmt == 'quantized':
+            mag = self._array('amp')[it, ix]*(self._array('scale')[it]/65535)[:, np.newaxis]
+            return self.x[ix], self.t[it], mag*mag
+        Axt = self._array('Axt')[it, ix]
+        return self.x[ix], self.t[it], Axt.real**2 + Axt.imag**2
+
+    def spectrum(self, tLim=None, kLim=None, tStep=1):
+        """stored spectral intensities in a window of time and k
+
+        Args:
+            tLim (tuple): time interval (tMin, tMax) (default None)
+            kLim (tuple): wavenumber interval (kMin, kMax) (default None)
+            tStep (int): stride along the time axis (default 1)
+
+        Returns: (k, t, Ikt)
+            k (numpy-array, ndim=1): wavenumbers of the window
+            t (numpy-array, ndim=1): time coordinates of the window
+            Ikt (numpy-array, ndim=2): spectral intensities in the window
+        """
+        if self.k is None:
+            raise ValueError("spectrum: no spectra stored, got k=None")
+        it, ik = self.window(tLim, kLim, tStep, x=self.k)
+        return self.k[ik], self.t[it], np.asarray(self._array('Ikt')[it, ik])
+
+    def chunks(self, nChunk=256, tLim=None, tStep=1):
+        """iterate over the time window in chunks of field configurations
+
+        Args:
+            nChunk (int): maximal number of field configurations per chunk
+                (default 256)
+            tLim (tuple): time interval (tMin, tMax) (default None)
+            tStep (int): stride along the time axis (default 1)
+
+        Yields: (t, Axt, Ikt)
+            t (numpy-array, ndim=1): time coordinates of the chunk
+            Axt (numpy-array, ndim=2): field configurations on the full
+                x-domain
+            Ikt (numpy-array, ndim=2): stored spectral intensities (None if
+                no spectra were stored)
+        """
+        idx = np.arange(self.nRec)[self.window(tLim, None, tStep)[0]]
+        for n in range(0, idx.size, nChunk):
+            it = idx[n:n+nChunk]
+            it = slice(it[0], it[-1]+1, tStep)
+            if self.fmt == 'quantized':
+                Axt = dequantize(self._array('amp')[it], self._array('phase')[it], self._array('scale')[it])
+            else:
+                Axt = np.asarray(self._array('Axt')[it])
+            yield self.t[it], Axt, None if self.k is None else np.asarray(self._array('Ikt')[it])
+
+
+def loadData(iPath):
+    """load data stored by DataHandler or StreamingDataHandler
+
+    For data written by a StreamingDataHandler in the format 'complex', the
+    field configurations are memory mapped, i.e. not read into memory until
+    accessed. Field configurations stored in the format 'quantized' are
+    reconstructed in full. For access to windows of large runs, see
+    SnapshotReader.
+
+    Args:
+        iPath (str): path to npz file, or base path fName of the files
+            written by a StreamingDataHandler
+
+    Returns: (x, t, Axt, info)
+        x (numpy-array, ndim=1): x coordinate axis
+        t (numpy-array, ndim=1): time coordinates
+        Axt (numpy-array, ndim=2): field configurations
+        info (str): metadata
+    """
+    reader = SnapshotReader(iPath)
+    if reader.fmt == 'quantized':
+        return reader.x, reader.t, reader.field()[2], reader.info
+    return reader.x, reader.t, reader._array('Axt'), reader.info
+
+# EOF: data_handler.py
@@ -0,0 +1,182 @@
+"""fft_backend.py
+
+Contains a registry of FFT backends providing a common interface to the
+discrete Fourier transforms of scipys fft module (multithreaded via
+workers), pyFFTW (planned transforms with wisdom cached on disk), and numpys
+fft module (fallback).
+
+All backends follow the sign and normalization convention of the remaining
+modules, i.e. ifft maps the x-domain to the k-domain and fft maps back.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import abc
+import pickle
+import numpy as np
+
+
+_BACKENDS = dict()
+_INSTANCES = dict()
+
+
+def register(name):
+    """class decorator adding an FFT backend to the registry"""
+    def _register(cls):
+        _BACKENDS[name] = cls
+        return cls
+    return _register
+
+
+def getBackend(name='scipy', **kwargs):
+    """get instance of FFT backend
+
+    Instances are cached, so that repeated requests for the same backend and
+    options, e.g. from different right-hand-side objects, reuse the same
+    plans.
+
+    Args:
+        name (str): name of backend, one of the keys of availableBackends()
+            (default 'scipy')
+        kwargs (dict): backend options, e.g. workers (int) for 'scipy' and
+            'pyfftw', and wisdomFile (str) for 'pyfftw'
+
+    Returns:
+        backend (object): instance of FFT backend
+    """
+    if isinstance(name, FFTBackend):
+        return name
+    if name not in _BACKENDS:
+        raise ValueError("fft backend: expected one of %s, got %s"%(availableBackends(), name))
+    key = (name, tuple(sorted(kwargs.items())))
+    if key not in _INSTANCES:
+        _INSTANCES[key] = _BACKENDS[name](**kwargs)
+    return _INSTANCES[key]
+
+
+def availableBackends():
+    """names of registered FFT backends"""
+    return tuple(sorted(_BACKENDS.keys()))
+
+
+class FFTBackend(abc.ABC):
+    """base class for FFT backends
+
+    Transforms act along the last axis of the supplied array.
+    """
+    name = None
+
+    @abc.abstractmethod
+    def fft(self, a, overwrite_x=False):
+        """transform from the k-domain to the x-domain"""
+
+    @abc.abstractmethod
+    def ifft(self, a, overwrite_x=False):
+        """transform from the x-domain to the k-domain"""
+
+    def fftfreq(self, n, d=1.0):
+        return np.fft.fftfreq(n, d=d)
+
+    def fftshift(self, a, axes=-1):
+        return np.fft.fftshift(a, axes=axes)
+
+
+@register('numpy')
+class NumpyFFT(FFTBackend):
+    """FFT backend using numpys fft module
+
+    Numpy computes all transforms in double precision, single precision
+    results are rounded to the datatype of the input.
+    """
+    name = 'numpy'
+
+    def fft(self, a, overwrite_x=False):
+        return np.fft.fft(a, axis=-1).astype(np.result_type(a, np.complex64), copy=False)
+
+    def ifft(self, a, overwrite_x=False):
+        return np.fft.ifft(a, axis=-1).astype(np.result_type(a, np.complex64), copy=False)
+
+
+@register('scipy')
+class ScipyFFT(FFTBackend):
+    """FFT backend using scipys fft module
+
+    Args:
+        workers (int): number of threads used for each transform (default 1)
+    """
+    name = 'scipy'
+
+    def __init__(self, workers=1):
+        import scipy.fft
+        self._sfft = scipy.fft
+        self.workers = workers
+
+    def fft(self, a, overwrite_x=False):
+        return self._sfft.fft(a, axis=-1, overwrite_x=overwrite_x, workers=self.workers)
+
+    def ifft(self, a, overwrite_x=False):
+        return self._sfft.ifft(a, axis=-1, overwrite_x=overwrite_x, workers=self.workers)
+
+
+@register('pyfftw')
+class PyFFTW(FFTBackend):
+    """FFT backend using planned transforms of pyFFTW
+
+    Plans are generated once for each array shape and datatype and reused
+    for all subsequent transforms. Accumulated wisdom is read from and
+    written to disk, so that plans are reused across runs.
+
+    Args:
+        workers (int): number of threads used for each transform (default 1)
+        wisdomFile (str): path to file holding FFTW wisdom. If None, wisdom is
+            not stored (default None)
+        planner (str): FFTW planner effort (default 'FFTW_MEASURE')
+    """
+    name = 'pyfftw'
+
+    def __init__(self, workers=1, wisdomFile=None, planner='FFTW_MEASURE'):
+        import pyfftw
+        self._pyfftw = pyfftw
+        self.workers = workers
+        self.wisdomFile = wisdomFile
+        self.planner = planner
+        self._plans = dict()
+        if wisdomFile is not None and os.path.isfile(wisdomFile):
+            with open(wisdomFile, 'rb') as f:
+                pyfftw.import_wisdom(pickle.load(f))
+
+    def _plan(self, kind, a):
+        key = (kind, a.shape, a.dtype.str)
+        if key not in self._plans:
+            build = self._pyfftw.builders.fft if kind=='fft' else self._pyfftw.builders.ifft
+            self._plans[key] = build(self._pyfftw.empty_aligned(a.shape, dtype=a.dtype),
+                                     axis=-1,
+                                     threads=self.workers,
+                                     planner_effort=self.planner)
+            self.saveWisdom()
+        return self._plans[key]
+
+    def _execute(self, kind, a):
+        a = np.asarray(a)
+        if not np.iscomplexobj(a):
+            a = a.astype(np.complex128)
+        # -- PLANS OWN THEIR OUTPUT ARRAY, HENCE RETURN A COPY
+        return self._plan(kind, a)(a).copy()
+
+    def fft(self, a, overwrite_x=False):
+        return self._execute('fft', a)
+
+    def ifft(self, a, overwrite_x=False):
+        return self._execute('ifft', a)
+
+    def saveWisdom(self):
+        """write accumulated FFTW wisdom to disk (atomically)"""
+        if self.wisdomFile is None:
+            return
+        tmpFile = self.wisdomFile + '.tmp%d'%(os.getpid())
+        with open(tmpFile, 'wb') as f:
+            pickle.dump(self._pyfftw.export_wisdom(), f)
+        os.replace(tmpFile, self.wisdomFile)
+
+# EOF: fft_backend.py
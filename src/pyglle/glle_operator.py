@@ -0,0 +1,217 @@
+"""glle_operator.py
+
+Contains class data structure implementing the right-hand-side of the
+generalized Lugiato-Lefever equation (GLLE) with precomputed spectral
+multipliers and preallocated work buffers.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import numpy as np
+from .fft_backend import getBackend
+from .kernels import getKernels
+
+
+def _col(p):
+    """broadcast per-member parameters along the x-axis"""
+    return p if np.ndim(p)==0 else np.asarray(p, dtype=np.float64)[:, np.newaxis]
+
+
+class GLLEOperator():
+    """right-hand-side of the generalized Lugiato-Lefever equation
+
+    Implements the right-hand-side
+
+        P - (1+i*theta)*A + fft(Dk*ifft(A)) + i*|A|^2*A
+
+    wherein Dk = i*(d2*k^2 + d3*k^3 + d4*k^4) is the dispersion multiplier in
+    the Fourier domain. The standard LLE is obtained for d2=-1, d3=d4=0.
+
+    The operator also acts on ensembles of M fields, stacked in an array of
+    shape (M, Nx). In this case the parameters might be supplied as arrays of
+    shape (M,), holding the parameters of the individual members.
+
+    Fields might be represented in single precision (complex64). In this
+    case the right-hand-side is evaluated in single precision, while the
+    spectral multipliers Dk and Lk, from which integration schemes compute
+    their exponentials, are kept in double precision.
+
+    The pointwise terms and the spectral multiplication are evaluated by
+    exchangeable compute kernels (see kernels.py), e.g. fused single-pass
+    kernels compiled by numba.
+    """
+    def __init__(self, k, P, theta, d2=-1.0, d3=0.0, d4=0.0, fft=None, dtype=np.complex128, kernels=None):
+        """generates instance of GLLE operator
+
+        Args:
+            k (numpy-array, ndim=1): angular wavenumbers of the x-domain
+            P (float or numpy-array): amplitude of homogeneous driving field
+            theta (float or numpy-array): detuning
+            d2 (float or numpy-array): second order dispersion coefficient
+                (default -1.0)
+            d3 (float or numpy-array): third order dispersion coefficient
+                (default 0.0)
+            d4 (float or numpy-array): fourth order dispersion coefficient
+                (default 0.0)
+            fft (object): FFT backend instance or name of registered backend
+                (default None, i.e. the default backend of fft_backend)
+            dtype (object): complex datatype of the fields, one of
+                numpy.complex64, numpy.complex128 (default numpy.complex128)
+            kernels (object): compute kernels instance or name of registered
+                kernels (default None, i.e. the numpy kernels)
+
+        Attrib:
+            Dk (numpy-array): dispersion multiplier
+            Lk (numpy-array): full linear operator in the Fourier domain,
+                including loss and detuning
+        """
+        self.k = k
+        self.P = _col(P)
+        self.theta = _col(theta)
+        self.d2 = _col(d2)
+        self.d3 = _col(d3)
+        self.d4 = _col(d4)
+        self.fft = getBackend() if fft is None else getBackend(fft)
+        self.kernels = getKernels() if kernels is None else getKernels(kernels)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.complex64, np.complex128):
+            raise ValueError("dtype: expected complex64 or complex128, got %s"%(self.dtype))
+
+        # -- PRECOMPUTE SPECTRAL MULTIPLIERS (HORNER SCHEME)
+        self.Dk = 1j*k*k*(self.d2 + k*(self.d3 + k*self.d4))
+        self.Lk = self.Dk - (1+1j*self.theta)
+        self._Dk = self.Dk.astype(self.dtype, copy=False)
+
+        # -- PREALLOCATE WORK BUFFERS
+        self._allocate(self.Lk.shape)
+
+    def setParameters(self, P=None, theta=None):
+        """update amplitude of driving field and detuning in place
+
+        Allows to reuse the operator, i.e. its work buffers and dispersion
+        multiplier, for different parameter values, e.g. when tracing a
+        branch of stationary solutions by numerical continuation.
+
+        Args:
+            P (float or numpy-array): amplitude of homogeneous driving field
+                (default None, i.e. unchanged)
+            theta (float or numpy-array): detuning (default None, i.e.
+                unchanged)
+        """
+        if P is not None:
+            self.P = _col(P)
+        if theta is not None:
+            self.theta = _col(theta)
+            self.Lk = self.Dk - (1+1j*self.theta)
+            self.__dict__.pop('_LkInv', None)
+
+    def _allocate(self, shape):
+        """allocate work buffers for fields of given shape"""
+        self._wk = np.empty(shape, dtype=self.dtype)
+        self._wr = np.empty(shape, dtype=np.finfo(self.dtype).dtype)
+        self._wi = np.empty(shape, dtype=np.finfo(self.dtype).dtype)
+
+    def _intensity(self, A):
+        """store |A|^2 in work buffer without temporaries"""
+        if self._wr.shape != A.shape:
+            self._allocate(A.shape)
+        np.multiply(A.real, A.real, out=self._wr)
+        np.multiply(A.imag, A.imag, out=self._wi)
+        return np.add(self._wr, self._wi, out=self._wr)
+
+    def __call__(self, A, out=None):
+        """evaluate right-hand-side
+
+        Args:
+            A (numpy-array): field configuration(s)
+            out (numpy-array): array the result is written to. Must
+                not share memory with A. If None, a new array is allocated
+                (default None)
+
+        Returns:
+            out (numpy-array): right-hand-side of the GLLE
+        """
+        if out is None:
+            out = np.empty(A.shape, dtype=self.dtype)
+
+        # -- DISPERSION TERM IN FOURIER DOMAIN
+        if self._wk.shape != A.shape:
+            self._allocate(A.shape)
+        self.kernels.multiply(self._Dk, self.fft.ifft(A), self._wk)
+        Ax_disp = self.fft.fft(self._wk, overwrite_x=True)
+
+        # -- POINTWISE TERMS: (i*|A|^2 - (1+i*theta))*A + P + DISPERSION TERM
+        return self.kernels.rhs(A, Ax_disp, self.P, 1+1j*self.theta, out, self._wr, self._wi)
+
+    def nonlinear(self, A, out=None):
+        """evaluate nonlinear and pump terms P + i*|A|^2*A
+
+        Complements the linear operator Lk for integration schemes that treat
+        the linear part in the Fourier domain exactly.
+
+        Args:
+            A (numpy-array): field configuration(s)
+            out (numpy-array): array the result is written to. Must
+                not share memory with A. If None, a new array is allocated
+                (default None)
+
+        Returns:
+            out (numpy-array): nonlinear part of the right-hand-side
+        """
+        if out is None:
+            out = np.empty(A.shape, dtype=self.dtype)
+        if self._wr.shape != A.shape:
+            self._allocate(A.shape)
+        return self.kernels.nonlinear(A, self.P, out, self._wr, self._wi)
+
+    def jvp(self, A, V, out=None):
+        """evaluate Jacobian-vector product of the right-hand-side
+
+        Since the Kerr term depends on the complex conjugate of the field,
+        the Jacobian is real-linear only, i.e.
+
+            J(A)V = fft(Dk*ifft(V)) - (1+i*theta)*V + 2i*|A|^2*V + i*A^2*conj(V)
+
+        Args:
+            A (numpy-array): field configuration at which the Jacobian is
+                evaluated
+            V (numpy-array): perturbation
+            out (numpy-array): array the result is written to. Must not
+                share memory with A or V. If None, a new array is allocated
+                (default None)
+
+        Returns:
+            out (numpy-array): Jacobian-vector product
+        """
+        if out is None:
+            out = np.empty(V.shape, dtype=np.complex128)
+
+        # -- POINTWISE TERMS: (2i*|A|^2 - (1+i*theta))*V + i*A^2*conj(V)
+        np.multiply(self._intensity(A), 2j, out=out)
+        np.subtract(out, 1+1j*self.theta, out=out)
+        np.multiply(out, V, out=out)
+        out += 1j*A*A*np.conj(V)
+
+        # -- DISPERSION TERM IN FOURIER DOMAIN
+        np.multiply(self.Dk, self.fft.ifft(V), out=self._wk)
+        return np.add(out, self.fft.fft(self._wk, overwrite_x=True), out=out)
+
+    def preconditioner(self, V):
+        """apply inverse of the linear part of the right-hand-side
+
+        The linear part fft(Lk*ifft(V)), with Lk = Dk - (1+i*theta), is
+        diagonal in the Fourier domain and invertible since Re(Lk)=-1. Its
+        inverse serves as preconditioner for Krylov methods solving linear
+        systems involving the Jacobian.
+
+        Args:
+            V (numpy-array): field configuration
+
+        Returns:
+            W (numpy-array): fft(ifft(V)/Lk)
+        """
+        if not hasattr(self, '_LkInv'):
+            self._LkInv = 1./self.Lk
+        return self.fft.fft(self._LkInv*self.fft.ifft(V), overwrite_x=True)
+
+# EOF: glle_operator.py
@@ -0,0 +1,129 @@
+"""grid_monitor.py
+
+Contains functions and a class data structure monitoring whether the
+computational grid resolves a propagating field. The spectral tail energy,
+i.e. the fraction of the spectral energy in the outermost wavenumbers,
+indicates an insufficient resolution, leading to aliasing of the Kerr term.
+The edge energy, i.e. the fraction of the energy of the deviation from the
+homogeneous background within the outermost parts of the x-domain,
+indicates an insufficient domain size, leading to radiation re-entering the
+periodic domain.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import warnings
+import numpy as np
+from .fft_backend import getBackend
+
+
+def spectralTail(A, fft=None, band=0.1):
+    """fraction of the spectral energy in the outermost wavenumbers
+
+    Args:
+        A (numpy-array, ndim=1): field on periodic mesh
+        fft (object): FFT backend instance or name of registered backend
+            (default None, i.e. the default backend of fft_backend)
+        band (float): relative width of the band of outermost wavenumbers
+            |k| > (1-band)*kNyquist (default 0.1)
+
+    Returns:
+        tail (float): spectral energy within the band relative to the total
+            spectral energy
+    """
+    fft = getBackend() if fft is None else getBackend(fft)
+    Ak = fft.ifft(A)
+    Ik = Ak.real**2 + Ak.imag**2
+    m = np.abs(fft.fftfreq(A.size))
+    total = np.sum(Ik)
+    return float(np.sum(Ik[m > 0.5*(1-band)])/total) if total > 0 else 0.
+
+
+def edgeEnergy(A, background, band=0.05):
+    """fraction of the deviation energy at the boundaries of the x-domain
+
+    Args:
+        A (numpy-array, ndim=1): field on periodic mesh
+        background (complex): homogeneous background
+        band (float): relative width of the boundary layers at both ends of
+            the x-domain (default 0.05)
+
+    Returns:
+        edge (float): energy of the deviation from the background within
+            the boundary layers relative to its total energy
+    """
+    I = np.abs(A - background)**2
+    nEdge = max(1, int(band*A.size))
+    total = np.sum(I)
+    return float((np.sum(I[:nEdge]) + np.sum(I[-nEdge:]))/total) if total > 0 else 0.
+
+
+class GridMonitor():
+    """monitor of spectral tail energy and edge energy during propagation
+
+    Records the maximal values of both measures and the first times at
+    which they exceed their thresholds, issuing a RuntimeWarning at these
+    times.
+
+    Args:
+        background (complex): homogeneous background of the field
+        fft (object): FFT backend instance or name of registered backend
+            (default None, i.e. the default backend of fft_backend)
+        tailTol (float): threshold of the spectral tail energy (default
+            1e-10)
+        edgeTol (float): threshold of the edge energy (default 1e-6)
+        nStep (int): number of measurements between evaluations (default 1)
+    """
+    def __init__(self, background, fft=None, tailTol=1e-10, edgeTol=1e-6, nStep=1):
+        self.background = background
+        self.fft = getBackend() if fft is None else getBackend(fft)
+        self.tailTol = tailTol
+        self.edgeTol = edgeTol
+        self.nStep = nStep
+        self.tailMax = 0.
+        self.edgeMax = 0.
+        self.tTail = None
+        self.tEdge = None
+        self.regrids = []
+
+    def __call__(self, n, t, x, Ax):
+        """evaluate both measures for a field configuration
+
+        Args:
+            n (int): current propagation step
+            t (float): current time coordinate
+            x (numpy-array): discrete x-domain
+            Ax (numpy-array): field configuration at t
+
+        Returns: (tailExceeded, edgeExceeded)
+            tailExceeded (bool): True if the spectral tail energy exceeds
+                tailTol
+            edgeExceeded (bool): True if the edge energy exceeds edgeTol
+        """
+        if n%self.nStep:
+            return False, False
+        tail = spectralTail(Ax, self.fft)
+        edge = edgeEnergy(Ax, self.background)
+        self.tailMax = max(self.tailMax, tail)
+        self.edgeMax = max(self.edgeMax, edge)
+        if tail > self.tailTol and self.tTail is None:
+            self.tTail = t
+            warnings.warn("spectral tail energy %.1e exceeds tailTol=%.1e at t=%g, the grid might alias"%(
+                          tail, self.tailTol, t), RuntimeWarning)
+        if edge > self.edgeTol and self.tEdge is None:
+            self.tEdge = t
+            warnings.warn("edge energy %.1e exceeds edgeTol=%.1e at t=%g, radiation might re-enter the domain"%(
+                          edge, self.edgeTol, t), RuntimeWarning)
+        return tail > self.tailTol, edge > self.edgeTol
+
+    def info(self):
+        """monitored quantities as meta-data for data-management"""
+        _at = lambda t: 'never' if t is None else 't=%g'%(t)
+        info = dict()
+        info["G01 SPECTRAL-TAIL"] = "max %.3e (tol %.1e), exceeded: %s"%(self.tailMax, self.tailTol, _at(self.tTail))
+        info["G02 EDGE-ENERGY"]   = "max %.3e (tol %.1e), exceeded: %s"%(self.edgeMax, self.edgeTol, _at(self.tEdge))
+        if self.regrids:
+            info["G03 REGRID"] = ", ".join("t=%g: Nx=%d, xMax=%g"%(t, Nx, xMax) for t, Nx, xMax in self.regrids)
+        return info
+
+# EOF: grid_monitor.py
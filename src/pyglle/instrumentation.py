@@ -0,0 +1,155 @@
+"""instrumentation.py
+
+Contains class data structures collecting performance counters during the
+numerical integration of the generalized Lugiato-Lefever equation, i.e. the
+number of right-hand-side evaluations, accepted and rejected steps, FFT calls
+and the time spent therein, the wall time per output interval, and the memory
+high-water mark of the process.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import time
+import numpy as np
+from .fft_backend import FFTBackend
+
+try:
+    import resource
+except ImportError:
+    # -- NOT AVAILABLE ON WINDOWS
+    resource = None
+
+
+def maxRSS():
+    """memory high-water mark of the process in MiB (None if unavailable)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # -- ru_maxrss IS GIVEN IN BYTES ON MACOS, IN KIB ELSEWHERE
+    return rss/2.**20 if sys.platform == 'darwin' else rss/2.**10
+
+
+class SolverStats():
+    """performance counters of a single run of solver.solve
+
+    An instance is passed to solver.solve via its argument stats and filled
+    in during the integration. FFT calls are only counted for transforms
+    carried out by an InstrumentedFFT backend bound to the instance (see
+    wrapFFT), so that the backend of the right-hand-side should be wrapped as
+    well.
+
+    Attrib:
+        nfev (int): number of evaluations of the right-hand-side (DOP853) or
+            its nonlinear part (remaining methods)
+        nAccept (int): number of accepted steps
+        nReject (int): number of rejected steps
+        nFFT (int): number of FFT calls
+        tFFT (float): wall time spent in FFT calls in seconds
+        tWall (float): total wall time of the integration in seconds
+        tInterval (list): wall time in seconds spent on integrating each
+            output interval, excluding the time spent in the callback
+        maxRSS (float): memory high-water mark of the process in MiB at the
+            end of the integration (None if unavailable)
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """set all counters to zero"""
+        self.nfev = 0
+        self.nAccept = 0
+        self.nReject = 0
+        self.nFFT = 0
+        self.tFFT = 0.
+        self.tWall = 0.
+        self.tInterval = []
+        self.maxRSS = None
+
+    def wrapFFT(self, fft):
+        """wrap FFT backend so that its transforms are counted
+
+        Args:
+            fft (object): instance of FFT backend
+
+        Returns:
+            fft (object): instance of InstrumentedFFT
+        """
+        if isinstance(fft, InstrumentedFFT) and fft.stats is self:
+            return fft
+        return InstrumentedFFT(fft, self)
+
+    def countCalls(self, func):
+        """wrap function so that its calls are counted as evaluations"""
+        def _func(*args, **kwargs):
+            self.nfev += 1
+            return func(*args, **kwargs)
+        return _func
+
+    def summary(self):
+        """summary of the collected counters
+
+        Returns:
+            summary (dict): counters, fraction fftShare of the wall time spent
+                in FFT calls, and mean and maximal wall time per output
+                interval, together with the index of the slowest interval
+        """
+        tInt = np.asarray(self.tInterval)
+        return dict(nfev = self.nfev,
+                    nAccept = self.nAccept,
+                    nReject = self.nReject,
+                    nFFT = self.nFFT,
+                    tFFT = self.tFFT,
+                    tWall = self.tWall,
+                    fftShare = self.tFFT/self.tWall if self.tWall > 0 else 0.,
+                    tIntervalMean = tInt.mean() if tInt.size else 0.,
+                    tIntervalMax = tInt.max() if tInt.size else 0.,
+                    nIntervalMax = int(tInt.argmax()) if tInt.size else -1,
+                    maxRSS = self.maxRSS)
+
+    def info(self):
+        """summary formatted as entries of the info metadata of a data handler"""
+        s = self.summary()
+        info = dict()
+        info["P01 NFEV"]     = "%d"%(s['nfev'])
+        info["P02 STEPS"]    = "accepted=%d, rejected=%d"%(s['nAccept'], s['nReject'])
+        info["P03 FFT"]      = "calls=%d, time=%.3fs, share=%.3f"%(s['nFFT'], s['tFFT'], s['fftShare'])
+        info["P04 WALLTIME"] = "total=%.3fs, interval-mean=%.3es, interval-max=%.3es (n=%d)"%(
+                                s['tWall'], s['tIntervalMean'], s['tIntervalMax'], s['nIntervalMax'])
+        info["P05 MAXRSS"]   = "n/a" if s['maxRSS'] is None else "%.1fMiB"%(s['maxRSS'])
+        return info
+
+
+class InstrumentedFFT(FFTBackend):
+    """FFT backend counting and timing the transforms of another backend
+
+    Args:
+        fft (object): instance of FFT backend carrying out the transforms
+        stats (object): instance of SolverStats accumulating the counters
+    """
+    def __init__(self, fft, stats):
+        self.backend = fft
+        self.stats = stats
+        self.name = fft.name
+
+    def fft(self, a, overwrite_x=False):
+        t0 = time.perf_counter()
+        res = self.backend.fft(a, overwrite_x=overwrite_x)
+        self.stats.tFFT += time.perf_counter() - t0
+        self.stats.nFFT += 1
+        return res
+
+    def ifft(self, a, overwrite_x=False):
+        t0 = time.perf_counter()
+        res = self.backend.ifft(a, overwrite_x=overwrite_x)
+        self.stats.tFFT += time.perf_counter() - t0
+        self.stats.nFFT += 1
+        return res
+
+    def fftfreq(self, n, d=1.0):
+        return self.backend.fftfreq(n, d=d)
+
+    def fftshift(self, a, axes=-1):
+        return self.backend.fftshift(a, axes=axes)
+
+# EOF: instrumentation.py
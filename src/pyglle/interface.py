@@ -0,0 +1,972 @@
+"""interface.py
+
+Main module implementing functions for determining stationary solutions to the
+standard Lugiato-Lefever equation (LLE) and for propagating a user supplied
+initial condtions in terms of the genaralized LLE.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import os
+import datetime
+import numpy as np
+from . import __version__
+from .stationary_solution import stationarySolution, stationarySolution_homogeneous
+from .data_handler import DataHandler, StreamingDataHandler, AdaptiveSampler, SpectrumRecorder, FORMATS
+from .solver import solve, METHODS
+from .glle_operator import GLLEOperator
+from .fft_backend import getBackend, availableBackends
+from .kernels import getKernels, availableKernels
+from .sweep import parameterGrid, runSweep
+from .continuation import naturalContinuation, arclengthContinuation
+from .checkpoint import saveCheckpoint, loadCheckpoint
+from .instrumentation import SolverStats
+from .solution_cache import SolutionCache, trialHash
+from .resampling import resample
+from .stability import leadingEigenvalues, stabilityVerdict
+from .grid_monitor import GridMonitor
+from .aggregator import RunAggregator
+from .config import loadSetupClass, SWEEP_PARAMETERS
+
+
+def _fetchFFTBackend(setup):
+    """set up FFT backend from the optional setup attributes
+
+    The optional attributes fftBackend (default 'scipy'), fftWorkers (default
+    1), and fftWisdomFile (pyfftw only, default None) select the FFT backend.
+    Plans, and for pyfftw wisdom stored on disk, are reused across calls.
+
+    Args:
+        setup (object): interface class holding simulation paramters
+
+    Returns:
+        fft (object): instance of FFT backend
+    """
+    name = getattr(setup, 'fftBackend', 'scipy')
+    if name not in availableBackends():
+        raise ValueError("fftBackend: expected one of %s, got %s"%(availableBackends(), name))
+
+    workers = getattr(setup, 'fftWorkers', 1)
+    if not isinstance(workers, int):
+        raise ValueError("fftWorkers: expected int, got %s"%(type(workers)))
+
+    opts = dict()
+    if name != 'numpy':
+        opts['workers'] = workers
+    if name == 'pyfftw':
+        opts['wisdomFile'] = getattr(setup, 'fftWisdomFile', None)
+    return getBackend(name, **opts)
+
+
+def _fetchKernels(setup):
+    """set up compute kernels of the right-hand-side from the optional setup attributes
+
+    The optional attribute kernels (default 'numpy') selects the compute
+    kernels evaluating the pointwise terms of the right-hand-side. The value
+    'numba' selects fused kernels compiled by numba, 'auto' selects them only
+    if numba is installed, and 'numexpr' selects kernels evaluated by
+    numexpr. The optional attribute kernelThreads (default 1) sets the
+    number of threads evaluating the kernels. Together with fftWorkers, it
+    allows to use several cores for a single run. The optional attribute
+    kernelMinChunk (default 8192) sets the minimal number of mesh points
+    per thread, so that grids with Nx<2*kernelMinChunk, e.g. Nx=2^13, are
+    processed without threads (see kernels.ThreadedKernels).
+
+    Args:
+        setup (object): interface class holding simulation paramters
+
+    Returns:
+        kernels (object): instance of compute kernels
+    """
+    name = getattr(setup, 'kernels', 'numpy')
+    if name not in availableKernels() + ('auto',):
+        raise ValueError("kernels: expected one of %s, got %s"%(availableKernels() + ('auto',), name))
+
+    threads = getattr(setup, 'kernelThreads', 1)
+    if not isinstance(threads, int):
+        raise ValueError("kernelThreads: expected int, got %s"%(type(threads)))
+
+    minChunk = getattr(setup, 'kernelMinChunk', 8192)
+    if not isinstance(minChunk, int) or minChunk < 1:
+        raise ValueError("kernelMinChunk: expected positive int, got %s"%(minChunk))
+    return getKernels(name, threads, minChunk)
+
+
+def _stationaryTrialSolution(setup, x):
+    """compose trial solution for root-finding procedure
+
+    Args:
+        setup (object): interface class holding simulation paramters
+        x (numpy-array): discretized x-domain
+
+    Returns:
+        Ax0_ini (numpy-array): user defined trial solution on top of the
+            homogeneous stationary solution
+    """
+    # -- FETCH USER DEFINED TRIAL SOLUTION
+    Ax0_loc = setup.initial_field(x)
+
+    # -- DETERMINE HOMOGENEOUS STATIONARY SOLUTION
+    reA0, imA0 = stationarySolution_homogeneous(setup.theta,setup.P)
+
+    return Ax0_loc + (reA0+1j*imA0)
+
+
+def _fetchSolutionCache(setup):
+    """set up cache of stationary solutions from the optional setup attributes
+
+    The optional attribute cacheDir (default
+    './data_stationary_solution/cache/') sets the folder holding the cache,
+    None disables the cache. The optional attributes cacheMaxEntries
+    (default 64) and cacheMaxMB (default None, i.e. unbounded) bound the
+    cache, evicting least recently used solutions.
+
+    Args:
+        setup (object): interface class holding simulation paramters
+
+    Returns:
+        cache (object): instance of SolutionCache, or None
+    """
+    path = getattr(setup, 'cacheDir', './data_stationary_solution/cache/')
+    if path is None:
+        return None
+    if not isinstance(path, str):
+        raise ValueError("cacheDir: expected str, got %s"%(type(path)))
+
+    maxEntries = getattr(setup, 'cacheMaxEntries', 64)
+    if not isinstance(maxEntries, int):
+        raise ValueError("cacheMaxEntries: expected int, got %s"%(type(maxEntries)))
+
+    maxMB = getattr(setup, 'cacheMaxMB', None)
+    if maxMB is not None and not isinstance(maxMB, float):
+        raise ValueError("cacheMaxMB: expected float, got %s"%(type(maxMB)))
+    return SolutionCache(path, maxEntries=maxEntries, maxMB=maxMB)
+
+
+def _fetchCoarseLevels(setup):
+    """number of coarse grids of the root-finding procedure from the optional setup attributes
+
+    The optional attribute coarseLevels (default 0) sets the number of
+    successively coarsened grids, each with half the mesh points of the
+    next finer one, on which the stationary solution is determined before
+    it is determined on the grid of the setup (see fetchStationarySolution).
+    The coarsest grid should still resolve the localized structures, so
+    that the mode pays off for grids finer than necessary for the
+    stationary solution, e.g. the grids of propagation runs.
+
+    Args:
+        setup (object): interface class holding simulation paramters
+
+    Returns:
+        nLevels (int): number of coarse grids
+    """
+    nLevels = getattr(setup, 'coarseLevels', 0)
+    if not isinstance(nLevels, int) or nLevels < 0:
+        raise ValueError("coarseLevels: expected non-negative int, got %s"%(nLevels))
+    if setup.Nx%(2**nLevels):
+        raise ValueError("coarseLevels: expected Nx divisible by 2**coarseLevels, got Nx=%d"%(setup.Nx))
+    return nLevels
+
+
+def _stationarySolver(setup, Nx, tol, analyticJacobian):
+    """set up root-finding procedure for the standard LLE on a grid with Nx mesh points
+
+    Returns: (x, solve)
+        x (numpy-array): discrete x-mesh defining the computational domain
+        solve (object): function solve(A_ini, roundoff=False) returning the
+            stationary solution for the initial guess A_ini. If roundoff is
+            True and the analytic Jacobian is used, the root-finding
+            procedure terminates as soon as the residual reaches the level
+            of rounding errors of the linear part, estimated by
+            eps*max|Lk|*max|A_ini|*sqrt(2*Nx)
+    """
+    # -- INITIALIZE COMPUTATIONAL DOMAIN
+    fft = _fetchFFTBackend(setup)
+    x = np.linspace(-setup.xMax, setup.xMax, Nx, endpoint=False)
+    k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+
+    # -- RIGHT HAND SIDE OF STANDARD LUGIATO-LEFEVER PDE
+    LLE_rhs = GLLEOperator(k, setup.P, setup.theta, d2=-1.0, fft=fft, kernels=_fetchKernels(setup))
+
+    def _solve(A_ini, roundoff=False):
+        if analyticJacobian:
+            ftol = np.finfo(np.float64).eps*np.max(np.abs(LLE_rhs.Lk))*np.max(np.abs(A_ini))*np.sqrt(2*Nx) if roundoff else 0.
+            return stationarySolution(x, A_ini, LLE_rhs, tol, jvp=LLE_rhs.jvp, precond=LLE_rhs.preconditioner, options=dict(ftol=ftol))
+        return stationarySolution(x, A_ini, LLE_rhs, tol)
+    return x, _solve
+
+
+def fetchStationarySolution(setup, tol=1e-10, analyticJacobian=True):
+    """fetch stationary solution for standard LLE
+
+    Returns the stationary solution from the cache of stationary solutions
+    (see _fetchSolutionCache) if available. Otherwise, the root-finding
+    procedure is started from a solution for identical parameters on a
+    different grid, resampled spectrally onto the grid of the setup, or from
+    the trial solution, and the result is stored in the cache. If the optional
+    attribute coarseLevels of the setup is positive (see
+    _fetchCoarseLevels), the initial guess is first restricted to the
+    coarsest grid, and the solution found on each grid, resampled
+    spectrally, serves as initial guess on the next finer grid, so that
+    only few Newton iterations are performed on the grid of the setup. Each
+    grid terminates once the residual reaches the level of rounding errors,
+    since further Newton steps would drift along the translation mode of
+    localized solutions.
+
+    Args:
+        setup (object): interface class holding simulation paramters, see
+            findStationarySolution
+        tol (float): tolerance for root-finding procedure  (default 1e-10)
+        analyticJacobian (bool): if True, use the analytic Jacobian-vector
+            product and the spectral preconditioner of the LLE (default
+            True)
+
+    Returns: (x, Ax0, source)
+        x (numpy-array): discrete x-mesh defining the computational domain
+        Ax0 (numpy-array): stationary solution
+        source (str): one of 'hit', 'warm', 'cold' (see
+            SolutionCache.lookup), or 'none' if the cache is disabled
+    """
+    nLevels = _fetchCoarseLevels(setup)
+    x, _solveFine = _stationarySolver(setup, setup.Nx, tol, analyticJacobian)
+
+    # -- COMPOSE INITIAL GUESS FOR STATIONARY SOLUTION
+    Ax0_ini = _stationaryTrialSolution(setup, x)
+    reA0, imA0 = stationarySolution_homogeneous(setup.theta, setup.P)
+    A0 = reA0 + 1j*imA0
+
+    # -- DETERMINE STATIONARY SOLUTION FOR STANDART LLE, COARSE TO FINE
+    def _solve(A_ini):
+        # -- WARM STARTS FROM THE CACHE ARE REFINED ON THE GRID OF THE SETUP ONLY
+        if A_ini is not Ax0_ini:
+            return _solveFine(A_ini, roundoff=True)
+        xPrev, A = x, A_ini
+        for level in range(nLevels, 0, -1):
+            xCurr, _solveCoarse = _stationarySolver(setup, setup.Nx//2**level, tol, analyticJacobian)
+            A = _solveCoarse(resample(xPrev, A, xCurr, A0), roundoff=True)
+            xPrev = xCurr
+        return _solveFine(resample(xPrev, A, x, A0), roundoff=nLevels > 0)
+
+    cache = _fetchSolutionCache(setup)
+    if cache is None:
+        return x, _solve(Ax0_ini), 'none'
+
+    meta = dict(P=setup.P, theta=setup.theta, d3=getattr(setup, 'd3', 0.0), x0=getattr(setup, 'x0', 0.0),
+                Nx=setup.Nx, xMax=setup.xMax, tol=tol, trial=trialHash(setup.initial_field))
+    A_statSol, source = cache.lookup(meta, x, Ax0_ini, _solve, A0)
+    return x, A_statSol, source
+
+
+def findStationarySolution(setup, tol=1e-10, analyticJacobian=True):
+    """determine stationary solution for standard LLE
+
+    uses root-finding procedure to determine stationary solution to the
+    standard Lugiato-Lefever equation. Solutions are reused from the cache
+    of stationary solutions, see fetchStationarySolution.
+
+    Args:
+        setup (object): interface class holding simulation paramters. The
+            optional attributes fftBackend, fftWorkers, and fftWisdomFile
+            select the FFT backend (see _fetchFFTBackend), the optional
+            attribute kernels the compute kernels (see _fetchKernels), the
+            optional attributes cacheDir, cacheMaxEntries, and cacheMaxMB
+            the cache (see _fetchSolutionCache), and the optional attribute
+            coarseLevels the number of coarse grids (see
+            _fetchCoarseLevels)
+        tol (float): tolerance for root-finding procedure  (default 1e-10)
+        analyticJacobian (bool): if True, use the analytic Jacobian-vector
+            product and the spectral preconditioner of the LLE, otherwise
+            use finite-difference Jacobian-vector products (default True)
+
+    Returns: nothing, but saves result of root-finding procedure in folder
+       ./data_stationary_solution/. The stored data consists of
+
+        x (array): discrete x-mesh defining the computational domain
+        Ax0_ini (array): trial solution
+        Ax0 (array): result of root-finding procedure
+        P (float): amplitude of homogeneous driving field
+        theta (float): detuning
+        Nx (int): number of mesh-points for discretizing x
+        xMax (float): bound of x domain
+    """
+    x, A_statSol, source = fetchStationarySolution(setup, tol, analyticJacobian)
+    Ax0_ini = _stationaryTrialSolution(setup, x)
+
+    # -- SAVE DATA
+    path = './data_stationary_solution/'
+    try:
+        os.makedirs(path)
+    except OSError:
+        pass
+    np.savez_compressed(path+setup.fName, x = np.asarray(x), Ax0 = np.asarray(A_statSol), P = setup.P, theta=setup.theta, d3=setup.d3, x0=setup.x0, Nx = setup.Nx, xMax=setup.xMax, Ax0_ini=np.asarray(Ax0_ini))
+
+
+def traceStationaryBranch(setup, par, parEnd, ds=0.1, method='arclength', tol=1e-10, nMax=1000, analyticJacobian=True):
+    """trace branch of stationary solutions for standard LLE
+
+    determines the stationary solution for the parameters of the supplied
+    setup, and tracks it upon variation of the parameter par up to the value
+    parEnd by numerical continuation, using each converged solution as warm
+    start for the next parameter value.
+
+    Args:
+        setup (object): interface class holding simulation paramters
+        par (str): name of continuation parameter, 'P' or 'theta'
+        parEnd (float): final value of continuation parameter
+        ds (float): initial step size of continuation (default 0.1)
+        method (str): continuation method, 'natural' or 'arclength'
+            (default 'arclength')
+        tol (float): tolerance for root-finding procedure  (default 1e-10)
+        nMax (int): maximal number of continuation steps (default 1000)
+        analyticJacobian (bool): if True, use the analytic Jacobian-vector
+            product and the spectral preconditioner of the LLE (default True)
+
+    Returns: nothing, but saves the branch in folder
+       ./data_stationary_solution/. The stored data consists of
+
+        x (array): discrete x-mesh defining the computational domain
+        par (str): name of continuation parameter
+        parVals (array): values of the continuation parameter
+        Ax (array): stationary solutions, one row for each parameter value
+        norm (array): root-mean-square amplitude of the solutions
+        folds (array): indices of solutions closest to fold points
+        success (bool): flag indicating whether the continuation completed
+        P (float): amplitude of homogeneous driving field of the setup
+        theta (float): detuning of the setup
+        Nx (int): number of mesh-points for discretizing x
+        xMax (float): bound of x domain
+    """
+    if par not in ('P', 'theta'):
+        raise ValueError("par: expected one of ('P', 'theta'), got %s"%(par))
+
+    if method not in ('natural', 'arclength'):
+        raise ValueError("method: expected one of ('natural', 'arclength'), got %s"%(method))
+
+    # -- INITIALIZE COMPUTATIONAL DOMAIN
+    fft = _fetchFFTBackend(setup)
+    x = np.linspace(-setup.xMax, setup.xMax, setup.Nx, endpoint=False)
+    k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+
+    # -- RIGHT HAND SIDE OF STANDARD LLE FOR VALUE OF CONTINUATION PARAMETER.
+    # -- OPERATORS OF THE MOST RECENT VALUES ARE KEPT, THE LEAST RECENTLY USED
+    # -- ONE IS UPDATED IN PLACE FOR A NEW VALUE, SO THAT RESIDUAL EVALUATIONS
+    # -- OF THE CONTINUATION REUSE WORK BUFFERS INSTEAD OF SETTING UP OPERATORS
+    _ops = dict()
+    def _LLE_rhs(val):
+        if val in _ops:
+            _ops[val] = _ops.pop(val)
+        elif len(_ops) < 4:
+            _ops[val] = GLLEOperator(k, setup.P, setup.theta, d2=-1.0, fft=fft)
+            _ops[val].setParameters(**{par: val})
+        else:
+            _ops[val] = _ops.pop(next(iter(_ops)))
+            _ops[val].setParameters(**{par: val})
+        return _ops[val]
+
+    # -- DETERMINE STATIONARY SOLUTION AT INITIAL PARAMETER VALUE
+    par_ini = getattr(setup, par)
+    LLE_rhs = _LLE_rhs(par_ini)
+    if analyticJacobian:
+        A_ini = stationarySolution(x, _stationaryTrialSolution(setup, x), LLE_rhs, tol, jvp=LLE_rhs.jvp, precond=LLE_rhs.preconditioner)
+    else:
+        A_ini = stationarySolution(x, _stationaryTrialSolution(setup, x), LLE_rhs, tol)
+
+    # -- TRACE BRANCH
+    _continuation = arclengthContinuation if method == 'arclength' else naturalContinuation
+    branch = _continuation(x, A_ini, par_ini, parEnd, _LLE_rhs, tol, ds=ds, nMax=nMax, analyticJacobian=analyticJacobian)
+
+    # -- SAVE DATA
+    path = './data_stationary_solution/'
+    try:
+        os.makedirs(path)
+    except OSError:
+        pass
+    np.savez_compressed(path+setup.fName, x = np.asarray(x), par = par, parVals = branch['par'], Ax = branch['A'], norm = branch['norm'], folds = np.asarray(branch['folds'], dtype=int), success = branch['success'], P = setup.P, theta=setup.theta, Nx = setup.Nx, xMax=setup.xMax)
+
+
+def analyzeStability(setup, nEig=6, sigma=0.5, tol=1e-10, analyticJacobian=True):
+    """linear stability analysis of stationary solution for standard LLE
+
+    fetches the stationary solution for the supplied setup (see
+    fetchStationarySolution) and computes the eigenvalues of the
+    linearized LLE about it closest to the shift sigma, using matrix-free
+    Jacobian-vector products and ARPACK in shift-invert mode (see
+    stability.leadingEigenvalues). The solution is classified as unstable
+    if a non-neutral eigenvalue has positive real part. Compared to a
+    propagation run, this takes seconds, e.g. 1.3s for Nx=2^13.
+
+    Args:
+        setup (object): interface class holding simulation paramters, see
+            findStationarySolution
+        nEig (int): number of eigenvalues. Should exceed the number of
+            discrete modes of the solution, which are closer to sigma than
+            the essential spectrum (default 6)
+        sigma (float): real shift (default 0.5)
+        tol (float): tolerance for root-finding procedure  (default 1e-10)
+        analyticJacobian (bool): if True, use the analytic Jacobian-vector
+            product and the spectral preconditioner of the LLE for the
+            root-finding procedure (default True)
+
+    Returns:
+        res (dict): stability verdict stable (bool), largest real part of
+            the non-neutral eigenvalues growthRate, eigenvalues lam ordered
+            by decreasing real part, residual norms of the eigenpairs
+            residual, and radius about sigma within which all eigenvalues
+            were found (see stability.leadingEigenvalues)
+    """
+    x, A_statSol, source = fetchStationarySolution(setup, tol, analyticJacobian)
+
+    # -- LINEARIZED STANDARD LLE ABOUT STATIONARY SOLUTION
+    fft = _fetchFFTBackend(setup)
+    k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+    LLE_rhs = GLLEOperator(k, setup.P, setup.theta, d2=-1.0, fft=fft)
+
+    lam, V, info = leadingEigenvalues(LLE_rhs, A_statSol, nEig=nEig, sigma=sigma)
+    stable, growthRate = stabilityVerdict(lam)
+    return dict(stable=stable, growthRate=growthRate, lam=lam, residual=info['residual'], radius=info['radius'])
+
+
+def _checkPropagationSetup(setup):
+    """catch possible datatype errors of supplied parameters
+
+    Args:
+        setup (object): interface class holding simulation paramters
+
+    Returns:
+        opts (dict): values of the optional attributes method, h, tol,
+            denseOutput, streaming, nFlush, streamPath, nCheckpoint, profile, sampling,
+            samplingTol, samplingMaxInterval, storageFormat, storeSpectrum,
+            spectrumKMax, spectrumStep, tailTol, edgeTol, regrid,
+            regridMaxNx, asyncWriter, and writerBuffers
+    """
+    if not isinstance(setup.xMax, float):
+        raise ValueError("xMax: expected float, got %s"%(type(setup.xMax)))
+
+    if not isinstance(setup.Nx, int):
+        raise ValueError("Nx: expected int, got %s"%(type(setup.Nx)))
+
+    if not isinstance(setup.tMax, float):
+        raise ValueError("tMax: expected float, got %s"%(type(setup.tMax)))
+
+    if not isinstance(setup.Nt, int):
+        raise ValueError("Nt: expected int, got %s"%(type(setup.Nt)))
+
+    if not isinstance(setup.nSkip, int):
+        raise ValueError("nSkip: expected int, got %s"%(type(setup.nSkip)))
+
+    if not isinstance(setup.P, float):
+        raise ValueError("P: expected float, got %s"%(type(setup.P)))
+
+    if not isinstance(setup.theta, float):
+        raise ValueError("theta: expected float, got %s"%(type(setup.theta)))
+
+    if not isinstance(setup.d3, float):
+        raise ValueError("d3: expected float, got %s"%(type(setup.d3)))
+
+    if not isinstance(setup.d4, float):
+        raise ValueError("d4: expected float, got %s"%(type(setup.d4)))
+
+    if not isinstance(setup.fName, str):
+        raise ValueError("fName: expected str, got %s"%(type(setup.fName)))
+
+    method = getattr(setup, 'method', 'dop853')
+    if method not in METHODS:
+        raise ValueError("method: expected one of %s, got %s"%(METHODS, method))
+
+    h = getattr(setup, 'h', None)
+    if h is not None and not isinstance(h, float):
+        raise ValueError("h: expected float, got %s"%(type(h)))
+
+    tol = getattr(setup, 'tol', None)
+    if tol is not None and not isinstance(tol, float):
+        raise ValueError("tol: expected float, got %s"%(type(tol)))
+
+    denseOutput = getattr(setup, 'denseOutput', True)
+    if not isinstance(denseOutput, bool):
+        raise ValueError("denseOutput: expected bool, got %s"%(type(denseOutput)))
+
+    streaming = getattr(setup, 'streaming', False)
+    if not isinstance(streaming, bool):
+        raise ValueError("streaming: expected bool, got %s"%(type(streaming)))
+
+    nFlush = getattr(setup, 'nFlush', 100)
+    if not isinstance(nFlush, int):
+        raise ValueError("nFlush: expected int, got %s"%(type(nFlush)))
+
+    streamPath = getattr(setup, 'streamPath', './data/')
+    if not isinstance(streamPath, str):
+        raise ValueError("streamPath: expected str, got %s"%(type(streamPath)))
+    if streamPath != './data/' and not streaming:
+        raise ValueError("streamPath: only supported together with streaming")
+
+    nCheckpoint = getattr(setup, 'nCheckpoint', None)
+    if nCheckpoint is not None and not isinstance(nCheckpoint, int):
+        raise ValueError("nCheckpoint: expected int, got %s"%(type(nCheckpoint)))
+
+    profile = getattr(setup, 'profile', False)
+    if not isinstance(profile, bool):
+        raise ValueError("profile: expected bool, got %s"%(type(profile)))
+
+    sampling = getattr(setup, 'sampling', 'fixed')
+    if sampling not in ('fixed',) + AdaptiveSampler.METRICS:
+        raise ValueError("sampling: expected one of %s, got %s"%(('fixed',) + AdaptiveSampler.METRICS, sampling))
+
+    samplingTol = getattr(setup, 'samplingTol', 1e-2)
+    if not isinstance(samplingTol, float):
+        raise ValueError("samplingTol: expected float, got %s"%(type(samplingTol)))
+
+    samplingMaxInterval = getattr(setup, 'samplingMaxInterval', 100)
+    if not isinstance(samplingMaxInterval, int):
+        raise ValueError("samplingMaxInterval: expected int, got %s"%(type(samplingMaxInterval)))
+
+    storageFormat = getattr(setup, 'storageFormat', 'complex')
+    if storageFormat not in FORMATS:
+        raise ValueError("storageFormat: expected one of %s, got %s"%(FORMATS, storageFormat))
+
+    storeSpectrum = getattr(setup, 'storeSpectrum', False)
+    if not isinstance(storeSpectrum, bool):
+        raise ValueError("storeSpectrum: expected bool, got %s"%(type(storeSpectrum)))
+
+    spectrumKMax = getattr(setup, 'spectrumKMax', None)
+    if spectrumKMax is not None and not isinstance(spectrumKMax, float):
+        raise ValueError("spectrumKMax: expected float, got %s"%(type(spectrumKMax)))
+
+    spectrumStep = getattr(setup, 'spectrumStep', 1)
+    if not isinstance(spectrumStep, int):
+        raise ValueError("spectrumStep: expected int, got %s"%(type(spectrumStep)))
+
+    tailTol = getattr(setup, 'tailTol', None)
+    if tailTol is not None and not isinstance(tailTol, float):
+        raise ValueError("tailTol: expected float, got %s"%(type(tailTol)))
+
+    edgeTol = getattr(setup, 'edgeTol', None)
+    if edgeTol is not None and not isinstance(edgeTol, float):
+        raise ValueError("edgeTol: expected float, got %s"%(type(edgeTol)))
+
+    regrid = getattr(setup, 'regrid', False)
+    if not isinstance(regrid, bool):
+        raise ValueError("regrid: expected bool, got %s"%(type(regrid)))
+    if regrid and nCheckpoint is not None:
+        raise ValueError("regrid: not supported together with nCheckpoint")
+
+    regridMaxNx = getattr(setup, 'regridMaxNx', 2**16)
+    if not isinstance(regridMaxNx, int):
+        raise ValueError("regridMaxNx: expected int, got %s"%(type(regridMaxNx)))
+
+    asyncWriter = getattr(setup, 'asyncWriter', False)
+    if not isinstance(asyncWriter, bool):
+        raise ValueError("asyncWriter: expected bool, got %s"%(type(asyncWriter)))
+    if asyncWriter and not streaming:
+        raise ValueError("asyncWriter: only supported together with streaming")
+
+    writerBuffers = getattr(setup, 'writerBuffers', 2)
+    if not isinstance(writerBuffers, int) or writerBuffers < 1:
+        raise ValueError("writerBuffers: expected positive int, got %s"%(writerBuffers))
+
+    return dict(method=method, h=h, tol=tol, denseOutput=denseOutput, streaming=streaming, nFlush=nFlush, streamPath=streamPath, nCheckpoint=nCheckpoint, profile=profile,
+                sampling=sampling, samplingTol=samplingTol, samplingMaxInterval=samplingMaxInterval, storageFormat=storageFormat,
+                storeSpectrum=storeSpectrum, spectrumKMax=spectrumKMax, spectrumStep=spectrumStep,
+                tailTol=tailTol, edgeTol=edgeTol, regrid=regrid, regridMaxNx=regridMaxNx,
+                asyncWriter=asyncWriter, writerBuffers=writerBuffers)
+
+
+def _checkDtype(dtype):
+    """catch unsupported datatypes of the propagated field"""
+    dtype = np.dtype(dtype)
+    if dtype not in (np.complex64, np.complex128):
+        raise ValueError("dtype: expected complex64 or complex128, got %s"%(dtype))
+    return dtype
+
+
+def _runFingerprint(setup, opts):
+    """parameters identifying a propagation run, used to validate checkpoints"""
+    keys = ('xMax', 'Nx', 'tMax', 'Nt', 'nSkip', 'P', 'theta', 'd2', 'd3', 'd4', 'fName')
+    meta = dict((key, repr(getattr(setup, key))) for key in keys)
+    for key in ('method', 'h', 'tol', 'denseOutput', 'streaming', 'streamPath', 'sampling', 'samplingTol', 'samplingMaxInterval', 'storageFormat',
+                'storeSpectrum', 'spectrumKMax', 'spectrumStep', 'dtype'):
+        meta[key] = repr(opts[key])
+    return meta
+
+
+def _metaData(setup, opts):
+    """assemble meta-data for data-management"""
+    info = dict()
+    info["I01 OS-USER"] = "%s"%(os.path.expanduser('~'))
+    info["I02 OS-ENV"]  = "%s"%(str(sys.platform))
+    info["I03 OS-PID"]  = "%s"%(str(os.getpid()))
+    info["I04 FILE"]    = "%s"%(sys.argv[0])
+    info["I05 VERSION"] = "%s"%(__version__)
+    info["I06 DATE"]    = "%s"%(datetime.datetime.now())
+    info["I07 FNAME"]   = "%s"%(setup.fName)
+    info["I08 METHOD"]  = "%s"%(opts['method'])
+    info["I09 FFT"]     = "%s"%(getattr(setup, 'fftBackend', 'scipy'))
+    info["I11 DTYPE"]   = "%s"%(opts['dtype'])
+    info["I12 KERNELS"] = "%s, threads=%d, minChunk=%d"%(_fetchKernels(setup).name, getattr(setup, 'kernelThreads', 1),
+                                                         getattr(setup, 'kernelMinChunk', 8192))
+    return info
+
+
+def _writerInfo(writer):
+    """buffers of the background writer and time the integration waited for them"""
+    return "buffers=%d, waits=%d (%.3lf s)"%(writer.nBuffer, writer.nWait, writer.tWait)
+
+
+def _fetchDataHandler(setup, t, opts, fft):
+    """set up data handler according to the optional setup attributes"""
+    sampler = None
+    if opts['sampling'] != 'fixed':
+        sampler = AdaptiveSampler(opts['samplingTol'], metric=opts['sampling'], nMax=opts['samplingMaxInterval'])
+    spectrum = None
+    if opts['storeSpectrum']:
+        spectrum = SpectrumRecorder(fft, kMax=opts['spectrumKMax'], nStep=opts['spectrumStep'])
+    if opts['streaming']:
+        return StreamingDataHandler(setup.fName, t.size//setup.nSkip+1, path=opts['streamPath'], nSkip=setup.nSkip, nFlush=opts['nFlush'],
+                                    sampler=sampler, dtype=opts['dtype'], fmt=opts['storageFormat'], spectrum=spectrum,
+                                    nBuffer=opts['writerBuffers'] if opts['asyncWriter'] else 0)
+    return DataHandler(setup.nSkip, sampler=sampler, dtype=opts['dtype'], fmt=opts['storageFormat'], spectrum=spectrum)
+
+
+def propagateInitialCondition(setup, resume=False, dtype=np.complex128):
+    """propagate inital condition under the generalized Lugiato-Lefever equation
+
+    uses pseudospectral approach to propagate a user supplied initial condition
+    in terms of the generalized Lugiato-Lefever equation with third and fourth
+    order dispersion.
+
+    Args:
+        setup (object): interface class holding simulation paramters. Kept
+            field configurations are stored on the grid of the setup. The
+            optional attributes are
+
+            method (str): integration method, see solver.solve (default 'dop853')
+            h (float): (initial) step size (default None)
+            tol (float): local error tolerance (default None)
+            denseOutput (bool): outputs by dense output, otherwise steps are limited by the output spacing (default True)
+            fftBackend, fftWorkers, fftWisdomFile: FFT backend, see _fetchFFTBackend
+            kernels, kernelThreads, kernelMinChunk: compute kernels of the right-hand-side, see _fetchKernels
+            streaming (bool): write kept fields to disk as measured, see data_handler.StreamingDataHandler (default False)
+            nFlush (int): measurements between flushes to disk when streaming (default 100)
+            streamPath (str): folder of the streamed files, e.g. on /dev/shm, see aggregator.RunAggregator (default './data/')
+            asyncWriter (bool): write streamed fields in a background thread, see data_handler.AsyncWriter (default False)
+            writerBuffers (int): number of preallocated buffers of the background writer (default 2)
+            nCheckpoint (int): time steps between checkpoints written atomically to ./data/fName.ckpt.npz (default None)
+            profile (bool): add performance counters to the metadata, see instrumentation.SolverStats (default False)
+            sampling (str): 'fixed', 'norm', or 'spectrum', see data_handler.AdaptiveSampler (default 'fixed')
+            samplingTol (float): relative change of a field for it to be kept by adaptive sampling (default 1e-2)
+            samplingMaxInterval (int): maximal number of steps between fields kept by adaptive sampling (default 100)
+            storageFormat (str): 'complex', or 'quantized' (16 bit magnitude and phase), see data_handler.quantize (default 'complex')
+            storeSpectrum (bool): store spectral intensities of kept fields, see data_handler.SpectrumRecorder (default False)
+            spectrumKMax (float): maximal |k| of stored spectra (default None, i.e. all wavenumbers)
+            spectrumStep (int): stride of the wavenumbers of stored spectra (default 1)
+            tailTol (float): spectral tail energy threshold, enables grid monitoring, see grid_monitor.GridMonitor (default 1e-10)
+            edgeTol (float): edge energy threshold, enables grid monitoring (default 1e-6)
+            regrid (bool): refine grid once a threshold is exceeded, enables grid monitoring, see grid_monitor (default False)
+            regridMaxNx (int): maximal number of mesh points of a refined grid (default 2**16)
+        resume (bool): if True and a checkpoint of a run with identical
+            parameters exists, continue the run from the checkpoint instead
+            of starting from the initial condition (default False)
+        dtype (object): datatype of the propagated and stored field. Single
+            precision (numpy.complex64) halves memory bandwidth and storage,
+            but is not supported by method 'dop853' and limits tol to values
+            >= 1.2e-6 (see solver.solve and benchmarks/main_precision.py)
+            (default numpy.complex128)
+
+    Returns: nothing, but saves result in folder ./data/. The stored data
+        consists of
+
+        x (array): discrete x-mesh defining the computational domain
+        t (array): discrete t-mesh defining t-coordinates at which data is stored
+        Axt (array): field obtained during the simulation run
+        info (str): metadata for data-management
+    """
+
+    # -- CATCH POSSIBLE DATATYPE ERRORS OF SUPPLIED PARAMETERS
+    opts = _checkPropagationSetup(setup)
+    opts['dtype'] = _checkDtype(dtype)
+
+    # -- ASSEMBLE META-DATA
+    info = _metaData(setup, opts)
+
+    # -- INITIALIZE COMPUTATIONAL DOMAIN
+    stats = SolverStats() if opts['profile'] else None
+    fftBackend = _fetchFFTBackend(setup)
+    fft = fftBackend if stats is None else stats.wrapFFT(fftBackend)
+    x = np.linspace(-setup.xMax, setup.xMax, setup.Nx, endpoint=False)
+    t = np.linspace(0,setup.tMax,setup.Nt,endpoint=True)
+
+    # -- RIGHT HAND SIDE OF GENERALIZED LUGIATO-LEFEVER PDE
+    def _GLLE_rhs(x):
+        k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+        return GLLEOperator(k, setup.P, setup.theta, setup.d2, setup.d3, setup.d4, fft=fft, dtype=opts['dtype'],
+                            kernels=_fetchKernels(setup))
+
+    # -- SET INITIAL CONDITION
+    Ax0 = setup.initial_field(x)
+
+    # -- PREPARE CHECKPOINTS
+    dat = _fetchDataHandler(setup, t, opts, fftBackend)
+    ckptFile = os.path.join('./data/', setup.fName + '.ckpt.npz')
+    meta = _runFingerprint(setup, opts)
+
+    def _checkpoint(state):
+        saveCheckpoint(ckptFile, solver=state, data=dat.getState(), meta=meta)
+
+    # -- RESUME FROM CHECKPOINT
+    state = None
+    if resume and os.path.isfile(ckptFile):
+        ckpt = loadCheckpoint(ckptFile)
+        if ckpt['meta'] != meta:
+            raise ValueError("resume: checkpoint %s does not match setup"%(ckptFile))
+        dat.setState(ckpt['data'])
+        state = ckpt['solver']
+        info["I10 RESUMED"] = "t=%s"%(state['t'])
+
+    # -- MONITOR GRID IF REQUESTED, STORING FIELDS ON THE GRID OF THE SETUP
+    monitor = None
+    if opts['tailTol'] is not None or opts['edgeTol'] is not None or opts['regrid']:
+        reA0, imA0 = stationarySolution_homogeneous(setup.theta, setup.P)
+        A0 = reA0 + 1j*imA0
+        monitor = GridMonitor(A0, fftBackend, nStep=setup.nSkip,
+                              tailTol=1e-10 if opts['tailTol'] is None else opts['tailTol'],
+                              edgeTol=1e-6 if opts['edgeTol'] is None else opts['edgeTol'])
+    seg = dict(n0=0, regrid=opts['regrid'], stop=None)
+
+    def _measure(n, tCurr, xCurr, Ax):
+        n += seg['n0']
+        if monitor is None:
+            dat.measure(n, tCurr, x, Ax)
+            return
+        tailExceeded, edgeExceeded = monitor(n, tCurr, xCurr, Ax)
+        if xCurr is x:
+            dat.measure(n, tCurr, x, Ax)
+        elif dat.considers(n):
+            dat.measure(n, tCurr, x, resample(xCurr, Ax, x, A0))
+        if seg['regrid'] and (tailExceeded or edgeExceeded):
+            seg['stop'] = (n, tailExceeded, edgeExceeded)
+            return True
+
+    # -- PROPAGATE FIELD, CONTINUING ON A REFINED GRID IF THE MONITOR REQUESTS IT
+    try:
+        xCurr, Ax = x, Ax0
+        while True:
+            GLLE_rhs = _GLLE_rhs(xCurr)
+            tFin, AFin = solve(xCurr, t[seg['n0']:], Ax, GLLE_rhs, _measure,
+                               method=opts['method'], Lk=GLLE_rhs.Lk, fNL=GLLE_rhs.nonlinear, h=opts['h'], tol=opts['tol'], fft=fft,
+                               dense=opts['denseOutput'], dtype=opts['dtype'],
+                               checkpointFunc=_checkpoint, nCheckpoint=opts['nCheckpoint'], state=state, stats=stats)
+            state = None
+            if seg['stop'] is None:
+                break
+            n, tailExceeded, edgeExceeded = seg['stop']
+            seg['n0'], seg['stop'] = n + 1, None
+            if seg['n0'] >= t.size - 1:
+                break
+            xMax = -xCurr[0]*(2 if edgeExceeded else 1)
+            Nx = xCurr.size*(2 if tailExceeded else 1)*(2 if edgeExceeded else 1)
+            if Nx > opts['regridMaxNx']:
+                # -- KEEP GRID FROM HERE ON, ONLY MONITORING
+                seg['regrid'] = False
+                Ax = AFin
+            else:
+                xNew = np.linspace(-xMax, xMax, Nx, endpoint=False)
+                xCurr, Ax = xNew, resample(xCurr, AFin, xNew, A0)
+                monitor.regrids.append((tFin, Nx, xMax))
+    finally:
+        # -- STORE PENDING MEASUREMENTS, ALSO IF THE PROPAGATION FAILS
+        dat.close()
+
+    # -- SAVE DATA
+    if monitor is not None:
+        info.update(monitor.info())
+    if opts['asyncWriter']:
+        info["I13 WRITER"] = _writerInfo(dat.writer)
+    if stats is not None:
+        info.update(stats.info())
+    dat.save(setup.fName, path='./data/', **info)
+    if os.path.isfile(ckptFile):
+        os.remove(ckptFile)
+
+
+def propagateEnsemble(setups, dtype=np.complex128):
+    """propagate an ensemble of initial conditions in a single vectorized solve
+
+    stacks the initial conditions of M simulation setups into an array of
+    shape (M, Nx) and propagates them simultaneously under the generalized
+    Lugiato-Lefever equation, using FFTs along the last axis and per-member
+    parameters P, theta, d2, d3, and d4. The setups must agree in their
+    computational domain (xMax, Nx, tMax, Nt), nSkip, and in their optional
+    solver attributes. If an adaptive step size is used, the step size is
+    common to all members and controlled by the largest local error.
+
+    Of the optional attributes of propagateInitialCondition, the solver
+    attributes (method, h, tol, denseOutput), the output attributes
+    (streaming, nFlush, streamPath, sampling, samplingTol,
+    samplingMaxInterval, storageFormat, storeSpectrum, spectrumKMax,
+    spectrumStep, asyncWriter, writerBuffers), profile, and the FFT and
+    kernel attributes are supported. Checkpoints (nCheckpoint) and grid
+    monitoring (tailTol, edgeTol, regrid) are not supported and raise a
+    ValueError.
+
+    Args:
+        setups (list): interface classes holding simulation paramters, see
+            propagateInitialCondition
+        dtype (object): datatype of the propagated and stored fields, see
+            propagateInitialCondition (default numpy.complex128)
+
+    Returns: nothing, but saves the result for each member in folder
+        ./data/, using the file name fName of the respective setup (see
+        propagateInitialCondition)
+    """
+
+    # -- CATCH POSSIBLE DATATYPE ERRORS OF SUPPLIED PARAMETERS
+    optsList = [_checkPropagationSetup(setup) for setup in setups]
+    for optsMember in optsList:
+        optsMember['dtype'] = _checkDtype(dtype)
+    opts, ref = optsList[0], setups[0]
+
+    for optsMember in optsList:
+        for key in ('nCheckpoint', 'tailTol', 'edgeTol'):
+            if optsMember[key] is not None:
+                raise ValueError("%s: not supported by propagateEnsemble, got %s"%(key, optsMember[key]))
+        if optsMember['regrid']:
+            raise ValueError("regrid: not supported by propagateEnsemble, got %s"%(optsMember['regrid']))
+
+    for setup, optsMember in zip(setups[1:], optsList[1:]):
+        for key in ('xMax', 'Nx', 'tMax', 'Nt', 'nSkip'):
+            if getattr(setup, key) != getattr(ref, key):
+                raise ValueError("%s: expected identical values for all members, got %s and %s"%(key, getattr(ref, key), getattr(setup, key)))
+        for key in ('method', 'h', 'tol', 'denseOutput', 'streaming'):
+            if optsMember[key] != opts[key]:
+                raise ValueError("%s: expected identical values for all members, got %s and %s"%(key, opts[key], optsMember[key]))
+
+    # -- INITIALIZE COMPUTATIONAL DOMAIN
+    stats = SolverStats() if opts['profile'] else None
+    fftBackend = _fetchFFTBackend(ref)
+    fft = fftBackend if stats is None else stats.wrapFFT(fftBackend)
+    x = np.linspace(-ref.xMax, ref.xMax, ref.Nx, endpoint=False)
+    k = fft.fftfreq(x.size,d=x[1]-x[0])*2*np.pi
+    t = np.linspace(0,ref.tMax,ref.Nt,endpoint=True)
+
+    # -- RIGHT HAND SIDE WITH PER-MEMBER PARAMETERS
+    _par = lambda key: np.asarray([getattr(setup, key) for setup in setups])
+    GLLE_rhs = GLLEOperator(k, _par('P'), _par('theta'), _par('d2'), _par('d3'), _par('d4'), fft=fft, dtype=opts['dtype'],
+                            kernels=_fetchKernels(ref))
+
+    # -- STACK INITIAL CONDITIONS
+    Ax0 = np.asarray([setup.initial_field(x) for setup in setups], dtype=opts['dtype'])
+
+    # -- PROPAGATE FIELDS, DISTRIBUTING MEASUREMENTS TO MEMBERS
+    dats = [_fetchDataHandler(setup, t, optsMember, fftBackend) for setup, optsMember in zip(setups, optsList)]
+    def _measure(n, tCurr, x, Axt):
+        for dat, Ax in zip(dats, Axt):
+            dat.measure(n, tCurr, x, Ax)
+
+    try:
+        solve(x, t, Ax0, GLLE_rhs, _measure,
+              method=opts['method'], Lk=GLLE_rhs.Lk, fNL=GLLE_rhs.nonlinear, h=opts['h'], tol=opts['tol'], fft=fft,
+              dense=opts['denseOutput'], dtype=opts['dtype'], stats=stats)
+    finally:
+        # -- STORE PENDING MEASUREMENTS, ALSO IF THE PROPAGATION FAILS
+        for dat in dats:
+            dat.close()
+
+    # -- SAVE DATA
+    for setup, optsMember, dat in zip(setups, optsList, dats):
+        info = _metaData(setup, optsMember)
+        if optsMember['asyncWriter']:
+            info["I13 WRITER"] = _writerInfo(dat.writer)
+        if stats is not None:
+            info.update(stats.info())
+        dat.save(setup.fName, path='./data/', **info)
+
+
+def runFileName(setup, prefix='GLLE', **params):
+    """compose file name of a propagation run from its parameters
+
+    Args:
+        setup (object): interface class holding simulation paramters
+        prefix (str): prefix of the file name (default 'GLLE')
+        params (dict): parameter values overriding those of setup
+
+    Returns:
+        fName (str): file name, e.g. for parameter sweeps
+    """
+    par = lambda key: params.get(key, getattr(setup, key))
+    return '%s_xMax%lf_Nx%d_tMax%lf_Nt%d_P%lf_theta%lf_d2%lf_d3%lf_d4%lf_x0%lf.dat'%(
+            prefix, setup.xMax, setup.Nx, setup.tMax, setup.Nt, par('P'), par('theta'), par('d2'), par('d3'), par('d4'), par('x0'))
+
+
+def _sweepJob(setupFile, className, params, fName, fftWorkers, streaming=False):
+    """propagate initial condition for single parameter set of a sweep"""
+    setup = loadSetupClass(setupFile, className)()
+    for key, val in params.items():
+        setattr(setup, key, val)
+    setup.fName = fName
+    if streaming:
+        setup.streaming = True
+    setup.fftWorkers = fftWorkers
+    setup.kernelThreads = fftWorkers
+    propagateInitialCondition(setup)
+
+
+def sweep(setupFile, grid, className='SIM_SETUP', nWorkers=1, nThreads=1, manifest='./data/sweep_manifest.jsonl',
+          monitor=None, monitorInterval=1.):
+    """propagate initial conditions for a grid of parameters
+
+    runs propagateInitialCondition for each combination of the supplied
+    parameter values on a pool of worker processes. Completed runs are
+    recorded in a manifest, so that an interrupted sweep resumes with the
+    runs not yet completed. If monitor is supplied, the runs are streamed
+    (see data_handler.StreamingDataHandler) to the folder streamPath of the
+    interface class (default './data/'), and monitor is called in the
+    calling process with an aggregator.RunAggregator, holding zero-copy
+    views of the rows stored so far, e.g. for live plots or reductions over
+    all runs.
+
+    Args:
+        setupFile (str): path to python, TOML, or JSON file defining the
+            interface class (see config.loadSetupClass)
+        grid (dict): parameter names, out of SWEEP_PARAMETERS, as keys and
+            lists of values as values. Parameters not in grid are taken
+            from the interface class
+        className (str): name of the interface class (default 'SIM_SETUP')
+        nWorkers (int): number of worker processes (default 1)
+        nThreads (int): number of BLAS/FFT/kernel threads per worker
+            (default 1)
+        manifest (str): path to manifest file
+            (default './data/sweep_manifest.jsonl')
+        monitor (object): function monitor(aggregator) called every
+            monitorInterval seconds, after each completed run, and once all
+            runs completed (default None)
+        monitorInterval (float): seconds between calls of monitor
+            (default 1.)
+
+    Returns:
+        summary (dict): aggregated per-run timing (see sweep.sweepSummary)
+    """
+    for key in grid:
+        if key not in SWEEP_PARAMETERS:
+            raise ValueError("grid: expected parameters out of %s, got %s"%(SWEEP_PARAMETERS, key))
+
+    setupFile = os.path.abspath(setupFile)
+    base = loadSetupClass(setupFile, className)
+    prefix = getattr(base, 'sweepPrefix', 'GLLE')
+
+    jobs = []
+    for params in parameterGrid(grid):
+        fName = runFileName(base, prefix, **params)
+        jobs.append((fName, (setupFile, className, params, fName, nThreads, monitor is not None), params))
+
+    poll = None
+    if monitor is not None:
+        streamPath = getattr(base, 'streamPath', './data/')
+        aggregator = RunAggregator([os.path.join(streamPath, job[0]) for job in jobs])
+
+        def poll():
+            aggregator.refresh()
+            monitor(aggregator)
+
+    return runSweep(_sweepJob, jobs, manifest, nWorkers=nWorkers, nThreads=nThreads, poll=poll, pollInterval=monitorInterval)
+
+# EOF: interface.py
@@ -0,0 +1,298 @@
+"""kernels.py
+
+Contains a registry of compute kernels evaluating the pointwise parts of the
+right-hand-side of the generalized Lugiato-Lefever equation, i.e. the Kerr
+nonlinearity, loss, detuning and pump terms, and the multiplication by
+spectral multipliers. The numpy kernels evaluate these terms as a sequence
+of in-place array operations. The numba kernels fuse them into single passes
+over memory without temporaries (requires numba, compiled upon first use).
+The numexpr kernels evaluate them by multithreaded, blocked expression
+evaluation (requires numexpr). The numpy and numba kernels might further be
+distributed over chunks of the x-axis processed by a pool of threads, since
+both release the global interpreter lock.
+
+Fields are processed as arrays of shape (Nx,) or (M, Nx). Parameters are
+either scalars or arrays of shape (M, 1), see glle_operator.GLLEOperator,
+and spectral multipliers arrays of shape (Nx,) or (M, Nx).
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import abc
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+_KERNELS = dict()
+_INSTANCES = dict()
+
+
+def register(name):
+    """class decorator adding compute kernels to the registry"""
+    def _register(cls):
+        _KERNELS[name] = cls
+        return cls
+    return _register
+
+
+def getKernels(name='numpy', threads=1, minChunk=8192):
+    """get instance of compute kernels
+
+    Instances are cached, so that repeated requests for the same kernels and
+    number of threads share compiled kernels and thread pools.
+
+    Args:
+        name (str): name of kernels, one of the keys of availableKernels(),
+            or 'auto', selecting numba kernels if numba is installed and
+            numpy kernels otherwise (default 'numpy')
+        threads (int): number of threads evaluating the kernels. For
+            threads>1, the numpy and numba kernels are distributed over
+            chunks of the x-axis (see ThreadedKernels), the numexpr kernels
+            use the given number of threads (default 1)
+        minChunk (int): minimal number of mesh points per chunk for
+            threads>1, see ThreadedKernels (default 8192)
+
+    Returns:
+        kernels (object): instance of compute kernels
+    """
+    if isinstance(name, Kernels):
+        return name
+    if name == 'auto':
+        try:
+            return getKernels('numba', threads, minChunk)
+        except ImportError:
+            return getKernels('numpy', threads, minChunk)
+    if name not in _KERNELS:
+        raise ValueError("kernels: expected one of %s, got %s"%(availableKernels() + ('auto',), name))
+    key = (name, threads) if name == 'numexpr' or threads == 1 else (name, threads, minChunk)
+    if key not in _INSTANCES:
+        if name == 'numexpr':
+            _INSTANCES[key] = _KERNELS[name](threads=threads)
+        elif threads > 1:
+            _INSTANCES[key] = ThreadedKernels(getKernels(name), threads, minChunk)
+        else:
+            _INSTANCES[key] = _KERNELS[name]()
+    return _INSTANCES[key]
+
+
+def availableKernels():
+    """names of registered compute kernels"""
+    return tuple(sorted(_KERNELS.keys()))
+
+
+class Kernels(abc.ABC):
+    """abstract base class for compute kernels
+
+    All kernels write their result to the supplied array out and return it.
+    The real-valued work buffers wr, wi have the shape of the field and
+    might be used by kernels for intermediate results.
+    """
+    name = None
+
+    @abc.abstractmethod
+    def rhs(self, A, Ad, P, c, out, wr, wi):
+        """evaluate (i*|A|^2 - c)*A + P + Ad"""
+
+    @abc.abstractmethod
+    def nonlinear(self, A, P, out, wr, wi):
+        """evaluate i*|A|^2*A + P"""
+
+    @abc.abstractmethod
+    def multiply(self, a, b, out):
+        """evaluate a*b, wherein b has the shape of out"""
+
+
+@register('numpy')
+class NumpyKernels(Kernels):
+    """compute kernels using in-place numpy array operations"""
+    name = 'numpy'
+
+    def _intensity(self, A, wr, wi):
+        np.multiply(A.real, A.real, out=wr)
+        np.multiply(A.imag, A.imag, out=wi)
+        return np.add(wr, wi, out=wr)
+
+    def rhs(self, A, Ad, P, c, out, wr, wi):
+        np.multiply(self._intensity(A, wr, wi), 1j, out=out)
+        np.subtract(out, c, out=out)
+        np.multiply(out, A, out=out)
+        np.add(out, P, out=out)
+        return np.add(out, Ad, out=out)
+
+    def nonlinear(self, A, P, out, wr, wi):
+        np.multiply(self._intensity(A, wr, wi), 1j, out=out)
+        np.multiply(out, A, out=out)
+        return np.add(out, P, out=out)
+
+    def multiply(self, a, b, out):
+        return np.multiply(a, b, out=out)
+
+
+def _compileNumbaKernels(numba):
+    """compile fused kernels acting on arrays of shape (M, Nx)
+
+    Parameters are arrays of shape (1,) or (M,), spectral multipliers arrays
+    of shape (1, Nx) or (M, Nx), i.e. they are broadcast along the members.
+    """
+    jit = numba.njit(nogil=True, cache=True)
+
+    @jit
+    def _rhs(A, Ad, P, cr, ci, out):
+        for m in range(A.shape[0]):
+            p, zr, zi0 = P[m%P.size], -cr[m%cr.size], -ci[m%ci.size]
+            for j in range(A.shape[1]):
+                ar, ai = A[m, j].real, A[m, j].imag
+                zi = ar*ar + ai*ai + zi0
+                out[m, j] = complex(zr*ar - zi*ai + p + Ad[m, j].real, zr*ai + zi*ar + Ad[m, j].imag)
+
+    @jit
+    def _nonlinear(A, P, out):
+        for m in range(A.shape[0]):
+            p = P[m%P.size]
+            for j in range(A.shape[1]):
+                ar, ai = A[m, j].real, A[m, j].imag
+                I = ar*ar + ai*ai
+                out[m, j] = complex(p - I*ai, I*ar)
+
+    @jit
+    def _multiply(a, b, out):
+        for m in range(out.shape[0]):
+            ma = m%a.shape[0]
+            for j in range(out.shape[1]):
+                out[m, j] = a[ma, j]*b[m, j]
+
+    return _rhs, _nonlinear, _multiply
+
+
+@register('numba')
+class NumbaKernels(Kernels):
+    """compute kernels fusing the pointwise terms into single passes
+
+    Kernels are compiled for each combination of datatypes upon first use
+    and cached on disk. Parameters are converted to the precision of the
+    field, so that single precision fields are processed in single
+    precision. The kernels release the global interpreter lock.
+    """
+    name = 'numba'
+
+    def __init__(self):
+        import numba
+        self._rhs, self._nonlinear, self._multiply = _compileNumbaKernels(numba)
+
+    @staticmethod
+    def _rows(A):
+        """field or spectral multiplier as array of shape (M, Nx)"""
+        return A.reshape(-1, A.shape[-1])
+
+    @staticmethod
+    def _par(p, A):
+        """parameter as array of shape (1,) or (M,) in the precision of A"""
+        return np.asarray(p, dtype=A.real.dtype).reshape(-1)
+
+    def rhs(self, A, Ad, P, c, out, wr, wi):
+        c = np.asarray(c)
+        self._rhs(self._rows(A), self._rows(Ad), self._par(P, A), self._par(c.real, A), self._par(c.imag, A), self._rows(out))
+        return out
+
+    def nonlinear(self, A, P, out, wr, wi):
+        self._nonlinear(self._rows(A), self._par(P, A), self._rows(out))
+        return out
+
+    def multiply(self, a, b, out):
+        self._multiply(self._rows(np.asarray(a)), self._rows(b), self._rows(out))
+        return out
+
+
+@register('numexpr')
+class NumexprKernels(Kernels):
+    """compute kernels evaluated by numexpr
+
+    Numexpr evaluates each expression in a single blocked pass over memory,
+    distributed over the given number of threads. Since numexpr supports
+    complex numbers in double precision only, single precision fields are
+    processed by the numpy kernels.
+
+    Args:
+        threads (int): number of threads used by numexpr (default 1)
+    """
+    name = 'numexpr'
+
+    def __init__(self, threads=1):
+        import numexpr
+        self._ne = numexpr
+        self.threads = threads
+        self._numpy = NumpyKernels()
+
+    def _evaluate(self, expr, out, **kwargs):
+        # -- THE NUMBER OF THREADS IS A GLOBAL SETTING OF NUMEXPR
+        self._ne.set_num_threads(self.threads)
+        return self._ne.evaluate(expr, local_dict=kwargs, out=out)
+
+    def rhs(self, A, Ad, P, c, out, wr, wi):
+        if A.dtype != np.complex128:
+            return self._numpy.rhs(A, Ad, P, c, out, wr, wi)
+        return self._evaluate('(1j*(real(A)**2 + imag(A)**2) - c)*A + P + Ad', out, A=A, Ad=Ad, P=P, c=c)
+
+    def nonlinear(self, A, P, out, wr, wi):
+        if A.dtype != np.complex128:
+            return self._numpy.nonlinear(A, P, out, wr, wi)
+        return self._evaluate('1j*(real(A)**2 + imag(A)**2)*A + P', out, A=A, P=P)
+
+    def multiply(self, a, b, out):
+        if out.dtype != np.complex128:
+            return self._numpy.multiply(a, b, out)
+        return self._evaluate('a*b', out, a=a, b=b)
+
+
+class ThreadedKernels(Kernels):
+    """compute kernels distributing chunks of the x-axis to a pool of threads
+
+    Each chunk is processed by the supplied kernels, which need to release
+    the global interpreter lock, as do the numpy and numba kernels. Fields
+    with less than 2*minChunk mesh points are processed without threads.
+
+    Dispatching a chunk to the pool costs about 20us, while the numpy
+    kernels take about 9ns per mesh point, i.e. 70us for the full
+    right-hand-side at Nx=2^13. Splitting a field into two chunks thus pays
+    off from about 10^4 mesh points on, and the default minChunk=8192
+    threads grids with Nx>=2^14, whereas the grids Nx<=2^13 of the
+    examples are processed without threads. For the faster numba kernels,
+    the crossover shifts to larger grids.
+
+    Args:
+        kernels (object): instance of compute kernels processing the chunks
+        threads (int): number of threads
+        minChunk (int): minimal number of mesh points per chunk (default
+            8192)
+    """
+    def __init__(self, kernels, threads, minChunk=8192):
+        self.kernels = kernels
+        self.name = kernels.name
+        self.threads = threads
+        self.minChunk = minChunk
+        self._pool = ThreadPoolExecutor(threads)
+
+    def _run(self, func, out, *args):
+        Nx = out.shape[-1]
+        nChunk = max(1, min(self.threads, Nx//self.minChunk))
+        if nChunk == 1:
+            return func(*args)
+        # -- ARRAYS ALONG THE x-AXIS ARE SLICED, PARAMETERS PASSED AS THEY ARE
+        _chunk = lambda a, sl: a[..., sl] if np.ndim(a) and np.shape(a)[-1] == Nx else a
+        bounds = np.linspace(0, Nx, nChunk+1).astype(int)
+        futures = [self._pool.submit(func, *[_chunk(a, slice(n0, n1)) for a in args])
+                   for n0, n1 in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+        return out
+
+    def rhs(self, A, Ad, P, c, out, wr, wi):
+        return self._run(self.kernels.rhs, out, A, Ad, P, c, out, wr, wi)
+
+    def nonlinear(self, A, P, out, wr, wi):
+        return self._run(self.kernels.nonlinear, out, A, P, out, wr, wi)
+
+    def multiply(self, a, b, out):
+        return self._run(self.kernels.multiply, out, a, b, out)
+
+# EOF: kernels.py
@@ -0,0 +1,103 @@
+"""postprocessing.py
+
+Contains functions computing observables of stored propagation runs in a
+single batched pass over the data, i.e. intensity maps, spectral intensity
+maps, energy, and position traces of localized structures. Data is read in
+chunks of field configurations via data_handler.SnapshotReader, so that the
+memory consumption is bounded by the chunk size and the requested windows.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import numpy as np
+from .fft_backend import getBackend
+from .data_handler import SnapshotReader
+
+
+def peakPosition(x, Ixt):
+    """position of the intensity maximum on a periodic x-domain
+
+    The position is refined to sub-grid accuracy by fitting a parabola
+    through the maximum and its two neighbors.
+
+    Args:
+        x (numpy-array, ndim=1): equidistant x coordinate axis
+        Ixt (numpy-array): intensities, x-axis last
+
+    Returns:
+        xPeak (numpy-array): positions of the intensity maxima
+    """
+    Ixt = np.asarray(Ixt)
+    i0 = np.argmax(Ixt, axis=-1)[..., np.newaxis]
+    Im = np.take_along_axis(Ixt, (i0-1)%x.size, axis=-1)[..., 0]
+    I0 = np.take_along_axis(Ixt, i0, axis=-1)[..., 0]
+    Ip = np.take_along_axis(Ixt, (i0+1)%x.size, axis=-1)[..., 0]
+    curv = Im - 2*I0 + Ip
+    delta = np.where(curv < 0, 0.5*(Im - Ip)/np.where(curv < 0, curv, -1.), 0.)
+    return x[i0[..., 0]] + delta*(x[1]-x[0])
+
+
+def process(iPath, tLim=None, xLim=None, kLim=None, tStep=1, fft=None, nChunk=256):
+    """compute observables of a stored propagation run in one batched pass
+
+    Spectral intensities are taken from the stored spectra if available
+    (see data_handler.SpectrumRecorder), otherwise they are computed by
+    batched transforms of the chunks of field configurations.
+
+    Args:
+        iPath (str or object): path to data stored by a data handler (see
+            data_handler.SnapshotReader), or instance of SnapshotReader
+        tLim (tuple): time interval (tMin, tMax) (default None, i.e. all
+            times)
+        xLim (tuple): x interval of the intensity map (default None, i.e.
+            full x-domain)
+        kLim (tuple): wavenumber interval of the spectral intensity map
+            (default None, i.e. all wavenumbers)
+        tStep (int): stride along the time axis (default 1)
+        fft (object): FFT backend instance or name of registered backend
+            used if no spectra are stored (default None, i.e. the default
+            backend of fft_backend)
+        nChunk (int): number of field configurations processed per batch
+            (default 256)
+
+    Returns:
+        res (dict): x coordinates x and wavenumbers k of the windows, time
+            coordinates t, intensity map Ixt, spectral intensity map Ikt
+            (wavenumbers in ascending order), energy, i.e. integral of the
+            intensity over the full x-domain, and position of the intensity
+            maximum
+    """
+    reader = iPath if isinstance(iPath, SnapshotReader) else SnapshotReader(iPath)
+    x = reader.x
+    dx = x[1]-x[0]
+
+    if reader.k is None:
+        fft = getBackend() if fft is None else getBackend(fft)
+        k = fft.fftshift(fft.fftfreq(x.size, d=dx)*2*np.pi)
+    else:
+        k = reader.k
+    _, ix = reader.window(None, xLim, 1)
+    _, ik = reader.window(None, kLim, 1, x=k)
+
+    ts, Ixts, Ikts, energy, position = [], [], [], [], []
+    for t, Axt, Ikt in reader.chunks(nChunk, tLim, tStep):
+        Ixt = Axt.real**2 + Axt.imag**2
+        if Ikt is None:
+            Akt = fft.fftshift(fft.ifft(Axt), axes=-1)
+            Ikt = Akt.real**2 + Akt.imag**2
+        ts.append(t)
+        Ixts.append(Ixt[:, ix])
+        Ikts.append(Ikt[:, ik])
+        energy.append(np.sum(Ixt, axis=-1)*dx)
+        position.append(peakPosition(x, Ixt))
+
+    _cat = lambda arrs, shape: np.concatenate(arrs) if arrs else np.empty(shape)
+    return dict(x = x[ix],
+                k = k[ik],
+                t = _cat(ts, (0,)),
+                Ixt = _cat(Ixts, (0, x[ix].size)),
+                Ikt = _cat(Ikts, (0, k[ik].size)),
+                energy = _cat(energy, (0,)),
+                position = _cat(position, (0,)))
+
+# EOF: postprocessing.py
@@ -0,0 +1,116 @@
+"""resampling.py
+
+Contains functions transferring fields between periodic x-grids of
+different resolution and extent. The resolution is changed by Fourier
+zero-padding or truncation, the extent by embedding the field into the
+homogeneous background or by cropping it.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import numpy as np
+
+
+def fourierResample(A, N):
+    """change the number of mesh points of a periodic field
+
+    Pads (N > A.size) or truncates (N < A.size) the Fourier coefficients of
+    the field, splitting or merging the Nyquist mode symmetrically, so that
+    the field is interpolated spectrally on the same domain.
+
+    Args:
+        A (numpy-array, ndim=1): field on periodic mesh
+        N (int): number of mesh points of the resampled field
+
+    Returns:
+        AN (numpy-array, ndim=1): field on periodic mesh with N points
+    """
+    M = A.size
+    if N == M:
+        return np.array(A, dtype=np.complex128)
+    Ak = np.fft.ifft(A)
+    AkN = np.zeros(N, dtype=np.complex128)
+    n = min(M, N)
+    # -- MODES 0...n/2-1 AND -1...-(n-1)/2 ARE SHARED BY BOTH MESHES
+    AkN[:(n+1)//2] = Ak[:(n+1)//2]
+    AkN[N-(n-1)//2:] = Ak[M-(n-1)//2:]
+    if n%2 == 0:
+        if M < N:
+            # -- SPLIT NYQUIST MODE OF THE COARSE MESH
+            AkN[n//2] = AkN[N-n//2] = 0.5*Ak[n//2]
+        else:
+            # -- MERGE MODES +-n/2 OF THE FINE MESH INTO NYQUIST MODE
+            AkN[n//2] = Ak[n//2] + Ak[M-n//2]
+    return np.fft.fft(AkN)
+
+
+def _shift(A, s, dx):
+    """evaluate periodic field at mesh points shifted by s (|s| < dx)"""
+    if s == 0.:
+        return A
+    kappa = np.fft.fftfreq(A.size, d=dx)*2*np.pi
+    return np.fft.fft(np.fft.ifft(A)*np.exp(-1j*kappa*s))
+
+
+def _trigInterp(x, A, xEval, nChunk=256):
+    """evaluate trigonometric interpolant of periodic field at arbitrary points"""
+    N, L = x.size, x.size*(x[1]-x[0])
+    Ak = np.fft.ifft(A)
+    kappa = np.fft.fftfreq(N, d=x[1]-x[0])*2*np.pi
+    if N%2 == 0:
+        # -- SYMMETRIC NYQUIST MODE YIELDS A REAL INTERPOLANT FOR REAL FIELDS
+        Ak = np.append(Ak, 0.5*Ak[N//2])
+        Ak[N//2] *= 0.5
+        kappa = np.append(kappa, -kappa[N//2])
+    res = np.empty(xEval.size, dtype=np.complex128)
+    for n in range(0, xEval.size, nChunk):
+        xc = np.mod(xEval[n:n+nChunk] - x[0], L)
+        res[n:n+nChunk] = np.exp(-1j*np.outer(xc, kappa)) @ Ak
+    return res
+
+
+def resample(x, A, xNew, background=None):
+    """transfer periodic field to another periodic mesh
+
+    The field is first resampled spectrally to the mesh spacing of the new
+    mesh (see fourierResample), then shifted spectrally to align with the
+    new mesh, and finally cropped to the new domain or embedded into the
+    background outside of the original domain. If the length of the
+    original domain is not an integer multiple of the new mesh spacing, the
+    trigonometric interpolant is evaluated at the new mesh points directly.
+
+    Args:
+        x (numpy-array, ndim=1): equidistant periodic mesh [x0, x0+L)
+        A (numpy-array, ndim=1): field on mesh x
+        xNew (numpy-array, ndim=1): new equidistant periodic mesh
+        background (complex): field value outside of the original domain,
+            e.g. the homogeneous stationary solution (default None, i.e. the
+            field value at the boundary of the original domain)
+
+    Returns:
+        ANew (numpy-array, ndim=1): field on mesh xNew
+    """
+    x, xNew = np.asarray(x), np.asarray(xNew)
+    A = np.asarray(A, dtype=np.complex128)
+    bg = A[0] if background is None else background
+    L, dxNew = x.size*(x[1]-x[0]), xNew[1]-xNew[0]
+    inside = (xNew >= x[0]) & (xNew < x[0] + L)
+    ANew = np.full(xNew.size, bg, dtype=np.complex128)
+
+    N = int(round(L/dxNew))
+    if abs(N*dxNew - L) > 1e-9*L:
+        ANew[inside] = _trigInterp(x, A, xNew[inside])
+        return ANew
+
+    # -- RESOLUTION, THEN ALIGNMENT OF THE MESH POINTS
+    off = (xNew[0] - x[0])/dxNew
+    q = int(np.floor(off + 1e-9))
+    AN = _shift(fourierResample(A, N), (off - q)*dxNew if abs(off - q) > 1e-9 else 0., dxNew)
+
+    # -- CROP TO, OR EMBED INTO, THE NEW DOMAIN
+    idx = np.arange(xNew.size) + q
+    valid = (idx >= 0) & (idx < N)
+    ANew[valid] = AN[idx[valid]]
+    return ANew
+
+# EOF: resampling.py
@@ -0,0 +1,209 @@
+"""solution_cache.py
+
+Contains a class data structure implementing a content-addressed cache of
+stationary solutions of the standard Lugiato-Lefever equation on disk. Cache
+entries are addressed by a hash of the physical parameters, the
+computational grid, the tolerance of the root-finding procedure, and the
+trial solution. Solutions for identical parameters on a different grid,
+resampled spectrally onto the requested grid, serve as warm start for the
+root-finding procedure. The cache is bounded in the number of entries and in
+size, evicting least recently used entries.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import json
+import hashlib
+import numpy as np
+from .resampling import resample
+
+
+# -- CANONICAL GRID SAMPLING TRIAL FUNCTIONS INDEPENDENT OF THE COMPUTATIONAL GRID
+TRIAL_GRID = np.linspace(-50., 50., 1001)
+
+
+def trialHash(trialFunc):
+    """hash of a trial function sampled on the canonical grid TRIAL_GRID
+
+    Args:
+        trialFunc (object): function trialFunc(x) returning the trial
+            solution on the mesh x
+
+    Returns:
+        h (str): hexadecimal digest
+    """
+    A = np.ascontiguousarray(trialFunc(TRIAL_GRID), dtype=np.complex128)
+    return hashlib.sha256(np.round(A.view(np.float64), 12).tobytes()).hexdigest()
+
+
+class SolutionCache():
+    """content-addressed cache of stationary solutions
+
+    Each entry is stored in a separate npz file named by its key, holding
+    the x-mesh x, the solution A, and the parameters meta (JSON). The
+    modification time of an entry records its last access. Since no shared
+    index is kept, several processes, e.g. the workers of a parameter
+    sweep, might use the same cache directory.
+    """
+    # -- PARAMETERS IDENTIFYING A SOLUTION INDEPENDENT OF THE GRID
+    PHYSICAL = ('P', 'theta', 'd3', 'x0', 'trial')
+
+    def __init__(self, path='./data_stationary_solution/cache/', maxEntries=64, maxMB=None):
+        """generates instance of solution cache
+
+        Args:
+            path (str): path to folder holding the cache entries (default
+                './data_stationary_solution/cache/')
+            maxEntries (int): maximal number of entries (default 64)
+            maxMB (float): maximal total size of the entries in MB. If None,
+                the size is not bounded (default None)
+        """
+        self.path = path
+        self.maxEntries = maxEntries
+        self.maxMB = maxMB
+
+    @staticmethod
+    def key(meta):
+        """key of an entry, i.e. hash of its parameters
+
+        Args:
+            meta (dict): parameters P, theta, d3, x0, Nx, xMax, tol, and
+                trial (hash of the trial function, see trialHash)
+
+        Returns:
+            key (str): hexadecimal digest
+        """
+        return hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+
+    def _fileName(self, key):
+        return os.path.join(self.path, key + '.npz')
+
+    def _entries(self):
+        """file names of all entries, least recently used first"""
+        try:
+            fNames = [os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith('.npz')]
+        except OSError:
+            return []
+        stamps = []
+        for fName in fNames:
+            try:
+                stamps.append((os.path.getmtime(fName), fName))
+            except OSError:
+                pass
+        return [fName for _, fName in sorted(stamps)]
+
+    def get(self, meta):
+        """fetch cached solution
+
+        Args:
+            meta (dict): parameters of the solution, see key
+
+        Returns: (x, A), or None if not cached
+            x (numpy-array, ndim=1): x-mesh
+            A (numpy-array, ndim=1): stationary solution
+        """
+        fName = self._fileName(self.key(meta))
+        try:
+            with np.load(fName) as data:
+                x, A = data['x'], data['A']
+            os.utime(fName)
+        except (OSError, KeyError, ValueError):
+            return None
+        return x, A
+
+    def put(self, meta, x, A):
+        """store solution atomically and evict least recently used entries
+
+        Args:
+            meta (dict): parameters of the solution, see key
+            x (numpy-array, ndim=1): x-mesh
+            A (numpy-array, ndim=1): stationary solution
+        """
+        try:
+            os.makedirs(self.path)
+        except OSError:
+            pass
+        fName = self._fileName(self.key(meta))
+        tmpFile = fName + '.tmp%d'%(os.getpid())
+        with open(tmpFile, 'wb') as f:
+            np.savez_compressed(f, x=np.asarray(x), A=np.asarray(A), meta=json.dumps(meta, sort_keys=True))
+        os.replace(tmpFile, fName)
+        self.evict()
+
+    def evict(self):
+        """remove least recently used entries exceeding the bounds"""
+        entries = self._entries()
+        sizes = dict((fName, os.path.getsize(fName)) for fName in entries if os.path.isfile(fName))
+        total = sum(sizes.values())
+        while entries and (len(entries) > self.maxEntries or
+                           (self.maxMB is not None and total > self.maxMB*1e6 and len(entries) > 1)):
+            fName = entries.pop(0)
+            total -= sizes.get(fName, 0)
+            try:
+                os.remove(fName)
+            except OSError:
+                pass
+
+    def warmStart(self, meta, x, background=None):
+        """field resampled from cached solution for identical physical parameters
+
+        Among the entries with identical physical parameters (see PHYSICAL)
+        the one with the finest mesh, and among those the smallest
+        tolerance, is resampled spectrally onto the supplied mesh (see
+        resampling.resample).
+
+        Args:
+            meta (dict): parameters of the solution, see key
+            x (numpy-array, ndim=1): x-mesh
+            background (complex): field value outside of the domain of the
+                cached solution (default None, i.e. its boundary value)
+
+        Returns:
+            A (numpy-array, ndim=1): warm start for the root-finding
+                procedure, or None if no suitable entry exists
+        """
+        best, bestRank = None, None
+        for fName in self._entries():
+            try:
+                with np.load(fName) as data:
+                    other = json.loads(str(data['meta']))
+                    if any(other.get(par) != meta.get(par) for par in self.PHYSICAL):
+                        continue
+                    dx = (data['x'][1] - data['x'][0])
+                    rank = (dx, other['tol'])
+                    if bestRank is None or rank < bestRank:
+                        best, bestRank = (data['x'], data['A']), rank
+            except (OSError, KeyError, ValueError):
+                continue
+        if best is None:
+            return None
+        return resample(best[0], best[1], x, background)
+
+    def lookup(self, meta, x, A_trial, solve, background=None):
+        """fetch cached solution, or compute and store it
+
+        Args:
+            meta (dict): parameters of the solution, see key
+            x (numpy-array, ndim=1): x-mesh
+            A_trial (numpy-array, ndim=1): trial solution
+            solve (object): function solve(A_ini) returning the stationary
+                solution for the initial guess A_ini
+            background (complex): homogeneous background of the solution,
+                see warmStart (default None)
+
+        Returns: (A, source)
+            A (numpy-array, ndim=1): stationary solution
+            source (str): 'hit' if the solution was cached, 'warm' if it
+                was computed from a warm start, 'cold' if it was computed
+                from the trial solution
+        """
+        res = self.get(meta)
+        if res is not None and res[0].size == x.size:
+            return res[1], 'hit'
+        A_warm = self.warmStart(meta, x, background)
+        A = solve(A_trial if A_warm is None else A_warm)
+        self.put(meta, x, A)
+        return A, 'cold' if A_warm is None else 'warm'
+
+# EOF: solution_cache.py
@@ -0,0 +1,496 @@
+"""solver.py
+
+Contains functions implementing numerical integration schemes for the
+generalized Lugiato-Lefever equation. Next to the explicit higher-order
+Runge-Kutta method "DOP853", provided by the complex_ode class of scipys
+integrate module, integrating-factor type schemes are implemented that treat
+the linear part of the propagation equation exactly in the Fourier domain.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import time
+import numpy as np
+from .fft_backend import getBackend
+from .instrumentation import maxRSS
+
+
+METHODS = ('dop853', 'ssfm', 'ip-rk4', 'erk4ip')
+
+
+def solve(x, t, A0, fvec, callbackFunc, method='dop853', Lk=None, fNL=None, h=None, tol=None, fft=None,
+          checkpointFunc=None, nCheckpoint=None, state=None, stats=None, dense=True, dtype=np.complex128):
+    """ solve
+
+    implements numerical integration scheme for complex field. Available
+    methods are the explicit higher-order Runge-Kutta method "DOP853"
+    (default), the symmetric split-step Fourier method "ssfm", the
+    Runge-Kutta in the interaction picture method "ip-rk4", and the embedded
+    Runge-Kutta in the interaction picture method "erk4ip".
+
+    The latter three methods require the right-hand-side to be split in the
+    form fvec(A) = fft(Lk*ifft(A)) + fNL(A), where the linear part is
+    integrated exactly using precomputed exponentials exp(Lk*h).
+
+    By default, the integrator takes steps irrespective of the output times
+    t[1:] and the field at the output times is obtained by dense output,
+    i.e. by the continuous extension of DOP853 and by cubic Hermite
+    interpolation in the interaction picture for the remaining methods. The
+    number of output times thus does not limit the step size.
+
+    Args:
+        x (numpy-array): discrete x-domain
+        t (numpy-array): discrete t-domain
+        A0 (numpy-array): initial condition, either a single field of shape
+            (Nx,) or an ensemble of fields of shape (M, Nx)
+        fvec (object): right-hand-side of first order propagation equation
+        callbaclFunc (object): callback function facilitating the measurement
+            at distinct values of t. It takes 4 paramters in the form
+            callbackFunc(n, tCurr, x, Ax), where:
+
+            n (int): current propagation step
+            t_curr (float): current time coordinate
+            x (numpy-array): discrete x-domain
+            Ax (numpy-array): field configuration at t_curr
+
+            If it returns True, the integration stops and solve returns
+            t_curr and Ax, e.g. in order to continue on another grid.
+
+        method (str): integration method, one of 'dop853', 'ssfm', 'ip-rk4',
+            'erk4ip' (default 'dop853')
+        Lk (numpy-array): linear operator in the Fourier domain (required for
+            methods other than 'dop853')
+        fNL (object): nonlinear part of the right-hand-side in the x-domain
+            (required for methods other than 'dop853')
+        h (float): (initial) step size. For methods other than 'dop853' it
+            is limited to the output spacing t[1]-t[0] if dense is False
+            (default t[1]-t[0], for 'dop853' estimated by the integrator)
+        tol (float): local error tolerance. If supplied, the step size is
+            adapted using the local error method for 'ssfm' and 'ip-rk4',
+            and the embedded error estimate for 'erk4ip'. If the step size
+            drops below ten times the spacing of floats at the current
+            time, e.g. since the field diverges, a RuntimeError is raised.
+            If None, a fixed step size is used (default None)
+        fft (object): FFT backend instance or name of registered backend used
+            by methods other than 'dop853' (default None, i.e. the default
+            backend of fft_backend)
+        checkpointFunc (object): function checkpointFunc(state) called
+            after every nCheckpoint-th measurement with a dictionary state
+            holding the complete integrator state (default None)
+        nCheckpoint (int): number of measurements between checkpoints
+            (default None)
+        state (dict): integrator state as passed to checkpointFunc. If
+            supplied, the integration resumes from this state instead of
+            starting from A0. The state holds the step size proposed by the
+            step size control, so that the resumed integration is
+            bit-for-bit identical to an uninterrupted one for all methods
+            (see benchmarks/main_resume.py) (default None)
+        stats (object): instance of instrumentation.SolverStats collecting
+            the number of right-hand-side evaluations, accepted and rejected
+            steps, FFT calls, wall time per output interval, and memory
+            high-water mark. FFT calls of fvec are only counted if its
+            backend is wrapped by stats.wrapFFT. If None, no counters are
+            collected (default None)
+        dense (bool): if True, outputs are obtained by dense output. If
+            False, the integrator steps are limited to the output spacing:
+            the methods other than 'dop853' land on each output time, and
+            'dop853' takes a single step per output, invoking callbackFunc
+            at the times reached (default True)
+        dtype (object): complex datatype of the propagated field. The
+            methods other than 'dop853' also support single precision
+            (numpy.complex64), in which case the exponentials exp(Lk*h) are
+            computed in double precision before rounding, and the norms
+            entering the step size control are accumulated in double
+            precision (default numpy.complex128)
+
+    Returns: (t_fin,A_fin)
+        t_fin (float): final time coordinate, or time coordinate at which
+            callbackFunc stopped the integration
+        A_fin (numpy-array): final field configuration
+    """
+
+    if method not in METHODS:
+        raise ValueError("method: expected one of %s, got %s"%(METHODS, method))
+
+    dtype = np.dtype(dtype)
+    if dtype not in (np.complex64, np.complex128):
+        raise ValueError("dtype: expected complex64 or complex128, got %s"%(dtype))
+    if dtype == np.complex64 and method == 'dop853':
+        raise ValueError("dtype complex64: not supported by method dop853")
+    if tol is not None and tol < 10*np.finfo(dtype).eps:
+        raise ValueError("tol: expected value >= %g for dtype %s, got %s"%(10*np.finfo(dtype).eps, dtype, tol))
+
+    if checkpointFunc is None or nCheckpoint is None:
+        checkpointFunc, nCheckpoint = lambda state: None, t.size
+
+    if method != 'dop853':
+        if Lk is None or fNL is None:
+            raise ValueError("method %s: requires linear operator Lk and nonlinear part fNL"%(method))
+        fft = getBackend() if fft is None else getBackend(fft)
+
+    # -- INSTRUMENTATION OF RIGHT-HAND-SIDE AND FFT BACKEND
+    if stats is not None:
+        tStart = time.perf_counter()
+        if method == 'dop853':
+            fvec = stats.countCalls(fvec)
+        else:
+            fNL = stats.countCalls(fNL)
+            fft = stats.wrapFFT(fft)
+
+    if method == 'dop853' and dense:
+        res = _solve_dop853_dense(x, t, A0, fvec, callbackFunc, h, checkpointFunc, nCheckpoint, state, stats)
+    elif method == 'dop853':
+        res = _solve_dop853(x, t, A0, fvec, callbackFunc, checkpointFunc, nCheckpoint, state, stats)
+    else:
+        res = _solve_IP(x, t, A0, Lk, fNL, callbackFunc, method, h, tol, fft, checkpointFunc, nCheckpoint, state, stats, dense, dtype)
+
+    if stats is not None:
+        stats.tWall += time.perf_counter() - tStart
+        stats.maxRSS = maxRSS()
+    return res
+
+
+def _solve_dop853(x, t, A0, fvec, callbackFunc, checkpointFunc, nCheckpoint, state, stats):
+    """integrate using scipys complex_ode with integrator DOP853"""
+    from scipy.integrate import complex_ode
+
+    dt = t[1]-t[0]
+    it = 0
+
+    # -- ENSEMBLES OF FIELDS ARE INTEGRATED AS ONE FLAT ARRAY
+    shape = np.shape(A0)
+
+    solver = complex_ode(lambda t, A: fvec(A.reshape(shape)).ravel())
+    solver.set_integrator('dop853')
+    if state is None:
+        solver.set_initial_value(np.ravel(A0), t.min())
+    else:
+        solver.set_initial_value(np.ravel(state['A']), state['t'])
+        if state.get('h') is not None:
+            # -- STEP SIZE PROPOSED BY THE CONTROLLER, USED AS FIRST STEP OF THE NEXT CALL
+            solver._integrator.work[6] = state['h']
+        it = state['it'] + 1
+
+    tLast = time.perf_counter()
+    while solver.successful() and solver.t < t.max():
+        solver.integrate(solver.t+dt,step=1)
+        if stats is not None:
+            # -- STEP COUNTERS OF THE LAST CALL TO DOP853: NACCPT, NREJCT
+            iwork = solver._integrator.iwork
+            stats.nAccept += int(iwork[18])
+            stats.nReject += int(iwork[19])
+            stats.tInterval.append(time.perf_counter() - tLast)
+        if callbackFunc(it, solver.t, x, solver.y.reshape(shape)):
+            break
+        if (it+1)%nCheckpoint==0:
+            checkpointFunc(dict(it=it, t=solver.t, A=solver.y.reshape(shape), h=solver._integrator.work[6]))
+        it += 1
+        tLast = time.perf_counter()
+
+    return solver.t, solver.y.reshape(shape)
+
+
+def _solve_dop853_dense(x, t, A0, fvec, callbackFunc, h, checkpointFunc, nCheckpoint, state, stats):
+    """integrate using scipys DOP853 class, generating outputs by dense output
+
+    Outputs are generated at the values t[1:] using the continuous extension
+    of the method, so that the step size is controlled by the local error
+    only. The tolerances are those of complex_ode with integrator DOP853. If
+    no initial step size h is supplied, it is estimated by the integrator.
+    """
+    from scipy.integrate import DOP853
+
+    # -- ENSEMBLES OF FIELDS ARE INTEGRATED AS ONE FLAT ARRAY
+    shape = np.shape(A0)
+    _f = lambda t, A: fvec(A.reshape(shape)).ravel()
+
+    n = 1
+    if state is None:
+        solver = DOP853(_f, t[0], np.array(A0, dtype=np.complex128).ravel(), t[-1], first_step=h, rtol=1e-6, atol=1e-12)
+    else:
+        # -- CONTINUE WITH THE STEP SIZE PROPOSED BY THE CONTROLLER, LIMITED TO THE REMAINING INTERVAL AS BY DOP853
+        hNext = state.get('h', h)
+        if hNext is not None:
+            hNext = min(abs(hNext), t[-1]-state['t']) or None
+        solver = DOP853(_f, state['t'], np.array(state['A'], dtype=np.complex128).ravel(), t[-1],
+                        first_step=hNext, rtol=1e-6, atol=1e-12)
+        n = state['it'] + 2
+
+    tLast = time.perf_counter()
+    while n < t.size and solver.status == 'running':
+        nfev = solver.nfev
+        if solver.step_size is None:
+            # -- OVERSHOOTING TRIAL STEPS AFTER THE INITIAL STEP SIZE ESTIMATE ARE REJECTED
+            with np.errstate(over='ignore', invalid='ignore'):
+                solver.step()
+        else:
+            solver.step()
+        if stats is not None:
+            # -- EACH ATTEMPTED STEP COSTS n_stages EVALUATIONS
+            stats.nAccept += 1
+            stats.nReject += (solver.nfev - nfev)//solver.n_stages - 1
+
+        sol, ckpt = None, False
+        while n < t.size and t[n] <= solver.t:
+            if t[n] == solver.t:
+                A = solver.y
+            else:
+                sol = solver.dense_output() if sol is None else sol
+                A = sol(t[n])
+            if stats is not None:
+                stats.tInterval.append(time.perf_counter() - tLast)
+            if callbackFunc(n-1, t[n], x, A.reshape(shape)):
+                return t[n], A.reshape(shape)
+            ckpt = ckpt or n%nCheckpoint==0
+            n += 1
+            tLast = time.perf_counter()
+
+        if ckpt:
+            checkpointFunc(dict(it=n-2, t=solver.t, A=solver.y.reshape(shape), h=solver.h_abs*solver.direction))
+
+    return solver.t, solver.y.reshape(shape)
+
+
+def _solve_IP(x, t, A0, Lk, fNL, callbackFunc, method, h, tol, fft, checkpointFunc, nCheckpoint, state, stats, dense, dtype):
+    """integrate using a scheme treating the linear part exactly
+
+    Outputs are generated at the values t[1:]. If dense is False, the
+    integrator lands on each output time, taking steps of size at most h in
+    between. Otherwise, outputs are interpolated within the steps. If a
+    tolerance is supplied, the step size is adjusted to keep the relative
+    local error below tol.
+    """
+
+    dt = t[1]-t[0]
+    h = dt if h is None else (h if dense else min(h, dt))
+
+    # -- CACHE OF LINEAR PROPAGATORS exp(Lk*h) AND INCREMENTS expm1(Lk*h), KEYED BY STEP SIZE
+    _cache = {}
+    def _E(h, kind='exp'):
+        if (kind, h) not in _cache:
+            if len(_cache) > 32:
+                _cache.clear()
+            _cache[(kind, h)] = (np.exp(Lk*h) if kind == 'exp' else np.expm1(Lk*h)).astype(dtype, copy=False)
+        return _cache[(kind, h)]
+
+    def _lin(A, E):
+        return fft.fft(E*fft.ifft(A), overwrite_x=True)
+
+    # -- THE STEPS RETURN THE INCREMENT OF THE FIELD, WITH THE LINEAR
+    # -- PROPAGATION OVER THE FULL STEP ENTERING VIA expm1(Lk*h), SO THAT
+    # -- ROUNDING ERRORS ARE SMALL RELATIVE TO THE FIELD ITSELF
+
+    # -- SINGLE STEP OF SYMMETRIC SPLIT-STEP FOURIER METHOD
+    def _ssfm(A, h):
+        E = _E(0.5*h)
+        a = fft.ifft(A)
+        B = fft.fft(E*a)
+        k1 = fNL(B)
+        k2 = fNL(B + 0.5*h*k1)
+        k3 = fNL(B + 0.5*h*k2)
+        k4 = fNL(B + h*k3)
+        S = h*(k1 + 2*k2 + 2*k3 + k4)/6
+        return fft.fft(_E(h, 'expm1')*a + E*fft.ifft(S), overwrite_x=True)
+
+    # -- SINGLE STEP OF RUNGE-KUTTA IN THE INTERACTION PICTURE METHOD
+    def _rk4ip(A, h):
+        E = _E(0.5*h)
+        a = fft.ifft(A)
+        AI = fft.fft(E*a)
+        k1 = _lin(h*fNL(A), E)
+        k2 = h*fNL(AI + 0.5*k1)
+        k3 = h*fNL(AI + 0.5*k2)
+        k4 = h*fNL(_lin(AI + k3, E))
+        return fft.fft(_E(h, 'expm1')*a + E*fft.ifft(k1/6 + k2/3 + k3/3), overwrite_x=True) + k4/6
+
+    # -- SINGLE STEP OF EMBEDDED RUNGE-KUTTA IN THE INTERACTION PICTURE METHOD
+    def _erk4ip(A, N0, h):
+        E = _E(0.5*h)
+        a = fft.ifft(A)
+        AI = fft.fft(E*a)
+        k1 = _lin(N0, E)
+        k2 = fNL(AI + 0.5*h*k1)
+        k3 = fNL(AI + 0.5*h*k2)
+        k4 = fNL(_lin(AI + h*k3, E))
+        dBeta = fft.fft(_E(h, 'expm1')*a + E*fft.ifft(h*(k1 + 2*k2 + 2*k3)/6), overwrite_x=True)
+        dA4 = dBeta + h*k4/6
+        k5 = fNL(A + dA4)
+        dA3 = dBeta + h*(2*k4 + 3*k5)/30
+        return dA4, dA3, k5
+
+    # -- RELATIVE SIZE OF dA, FOR ENSEMBLES THE LARGEST OF ALL MEMBERS.
+    # -- SQUARED MODULI ARE SUMMED IN DOUBLE PRECISION
+    def _norm(A):
+        return np.sqrt(np.sum(A.real*A.real + A.imag*A.imag, axis=-1, dtype=np.float64))
+
+    def _relErr(A, dA):
+        return np.max(_norm(dA)/_norm(A))
+
+    # -- REJECTED STEP: HALT IF THE STEP SIZE DROPS BELOW 10 TIMES THE SPACING OF FLOATS AT tc
+    def _reject(tc, h):
+        if stats is not None:
+            stats.nReject += 1
+        if h < 10*np.abs(np.nextafter(tc, np.inf) - tc):
+            raise RuntimeError("solve: step size control failed at t=%s, h=%s below minimal step size, "
+                               "e.g. since the field diverged"%(tc, h))
+
+    # -- STEP SIZE CONTROL USING THE LOCAL ERROR METHOD
+    def _lemStep(step, p, A, h, tc):
+        while True:
+            dAc = step(A, h)
+            dA1 = step(A, 0.5*h)
+            dAf = dA1 + step(A + dA1, 0.5*h)
+            delta = _relErr(A + dAf, dAf - dAc)
+            # -- NEGATED COMPARISON ALSO REJECTS STEPS WITH NON-FINITE ERROR
+            if not delta <= 2*tol:
+                h *= 0.5
+                _reject(tc, h)
+                continue
+            if delta > tol:
+                hNew = h/2**(1./(p+1))
+            elif delta < 0.5*tol:
+                hNew = h*2**(1./(p+1))
+            else:
+                hNew = h
+            return (2**p*dAf - dAc)/(2**p-1), h, hNew
+
+    # -- STEP SIZE CONTROL USING THE EMBEDDED ERROR ESTIMATE
+    def _erkStep(A, N0, h, tc):
+        while True:
+            dA4, dA3, N1 = _erk4ip(A, N0, h)
+            delta = _relErr(A + dA4, dA4 - dA3)
+            fac = 2. if delta == 0 else min(2., max(0.2, 0.9*(tol/delta)**0.25))
+            if not delta <= tol:
+                h *= fac
+                _reject(tc, h)
+                continue
+            return dA4, N1, h, h*fac
+
+    # -- INCREMENT OF SINGLE STEP OF THE SELECTED METHOD, hNew IS None FOR FIXED STEP SIZE
+    def _step(A, N0, h, tc):
+        if tol is None:
+            if method == 'ssfm':
+                dA = _ssfm(A, h)
+            elif method == 'ip-rk4':
+                dA = _rk4ip(A, h)
+            else:
+                dA, _, N0 = _erk4ip(A, N0, h)
+            return dA, N0, h, None
+        if method == 'ssfm':
+            dA, h, hNew = _lemStep(_ssfm, 2, A, h, tc)
+        elif method == 'ip-rk4':
+            dA, h, hNew = _lemStep(_rk4ip, 4, A, h, tc)
+        else:
+            dA, N0, h, hNew = _erkStep(A, N0, h, tc)
+        return dA, N0, h, hNew
+
+    # -- ADD INCREMENT, IN SINGLE PRECISION USING COMPENSATED (KAHAN) SUMMATION
+    def _add(A, C, dA):
+        if C is None:
+            return A + dA, None
+        y = dA - C
+        S = A + y
+        return S, (S - A) - y
+
+    # -- CUBIC HERMITE INTERPOLATION IN THE INTERACTION PICTURE
+    def _hermite(A0, N0, A1, N1, h):
+        # -- u(s) = exp(-Lk*s)*ifft(A(s)) IS SMOOTH, WITH du/ds = exp(-Lk*s)*ifft(fNL(A(s)))
+        N0 = fNL(A0) if N0 is None else N0
+        N1 = fNL(A1) if N1 is None else N1
+        a0, n0, a1, n1 = fft.ifft(A0), fft.ifft(N0), fft.ifft(A1), fft.ifft(N1)
+        def _interp(theta):
+            h00, h10 = (1 + 2*theta)*(1 - theta)**2, theta*(1 - theta)**2
+            h01, h11 = theta*theta*(3 - 2*theta), theta*theta*(theta - 1)
+            E0 = np.exp(Lk*theta*h).astype(dtype, copy=False)
+            E1 = np.exp(-Lk*(1 - theta)*h).astype(dtype, copy=False)
+            return fft.fft(E0*(h00*a0 + h10*h*n0) + E1*(h01*a1 + h11*h*n1), overwrite_x=True)
+        return _interp
+
+    # -- INTEGRATOR STATE PASSED TO checkpointFunc
+    def _state(it, tc, A, C, h, N0):
+        state = dict(it=it, t=tc, A=A, h=h)
+        if N0 is not None:
+            state['N0'] = N0
+        if C is not None:
+            state['C'] = C
+        return state
+
+    A = np.array(A0, dtype=dtype)
+    C = np.zeros_like(A) if dtype == np.complex64 else None
+    N0 = fNL(A) if method == 'erk4ip' else None
+    tc = t[0]
+    nStart = 1
+
+    # -- RESUME FROM SUPPLIED INTEGRATOR STATE
+    if state is not None:
+        A, tc, h = np.array(state['A'], dtype=dtype), state['t'], state['h']
+        if method == 'erk4ip':
+            N0 = np.array(state['N0'], dtype=dtype) if 'N0' in state else fNL(A)
+        if C is not None and 'C' in state:
+            C = np.array(state['C'], dtype=dtype)
+        nStart = state['it'] + 2
+
+    tLast = time.perf_counter()
+    if dense:
+        n = nStart
+        while n < t.size:
+            hc = h
+            if t[-1] - tc - hc < 1e-12*dt:
+                hc = t[-1] - tc
+            clipped = hc < h
+
+            dA, N1, hc, hNew = _step(A, N0, hc, tc)
+            A1, C1 = _add(A, C, dA)
+            hNew = h if hNew is None else (max(h, hNew) if clipped else hNew)
+            t1 = t[-1] if hc == t[-1] - tc else tc + hc
+            if stats is not None:
+                stats.nAccept += 1
+
+            interp, ckpt = None, False
+            while n < t.size and t[n] <= t1:
+                if t[n] == t1:
+                    An = A1
+                else:
+                    interp = _hermite(A, N0, A1, N1, hc) if interp is None else interp
+                    An = interp((t[n] - tc)/hc)
+                if stats is not None:
+                    stats.tInterval.append(time.perf_counter() - tLast)
+                if callbackFunc(n-1, t[n], x, An):
+                    return t[n], An
+                ckpt = ckpt or n%nCheckpoint==0
+                n += 1
+                tLast = time.perf_counter()
+
+            A, C, N0, tc, h = A1, C1, N1, t1, hNew
+            if ckpt:
+                checkpointFunc(_state(n-2, tc, A, C, h, N0))
+
+        return tc, A
+
+    for n in range(nStart, t.size):
+        while tc < t[n]:
+            hc = h
+            if t[n] - tc - hc < 1e-12*dt:
+                hc = t[n] - tc
+            clipped = hc < h
+
+            dA, N0, hc, hNew = _step(A, N0, hc, tc)
+            A, C = _add(A, C, dA)
+            hNew = h if hNew is None else min(max(h, hNew) if clipped else hNew, dt)
+
+            tc = t[n] if hc == t[n] - tc else tc + hc
+            h = hNew
+            if stats is not None:
+                stats.nAccept += 1
+
+        if stats is not None:
+            stats.tInterval.append(time.perf_counter() - tLast)
+        if callbackFunc(n-1, tc, x, A):
+            break
+        if n%nCheckpoint==0:
+            checkpointFunc(_state(n-1, tc, A, C, h, N0))
+        tLast = time.perf_counter()
+
+    return tc, A
+
+# EOF: solver.py
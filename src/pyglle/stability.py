@@ -0,0 +1,164 @@
+"""stability.py
+
+Contains functions implementing the linear stability analysis of stationary
+solutions of the Lugiato-Lefever equation. The linearization of the
+right-hand-side about a stationary solution is applied matrix-free, using
+FFT-based Jacobian-vector products, and its eigenvalues closest to a shift
+are computed by the implicitly restarted Arnoldi method (ARPACK) in
+shift-invert mode, wherein the shifted linear systems are solved by
+preconditioned GMRES.
+
+Since the Kerr term depends on the complex conjugate of the field, the
+linearization is real-linear only. It is therefore represented as a real
+operator acting on vectors of length 2*Nx, holding the interleaved real and
+imaginary parts of the perturbation (see numpy.ndarray.view).
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import numpy as np
+
+
+def linearizedOperator(rhs, A0):
+    """linearization of the right-hand-side about a field configuration
+
+    Args:
+        rhs (object): right-hand-side of the LLE providing the
+            Jacobian-vector product jvp(A, V), e.g. GLLEOperator
+        A0 (numpy-array, ndim=1): field configuration, e.g. stationary
+            solution
+
+    Returns:
+        J (object): real LinearOperator of shape (2*Nx, 2*Nx)
+    """
+    from scipy.sparse.linalg import LinearOperator
+    A0 = np.ascontiguousarray(A0, dtype=np.complex128)
+    _c = lambda v: np.ascontiguousarray(np.ravel(v), dtype=np.float64).view(np.complex128)
+    n = 2*A0.size
+    return LinearOperator((n, n), matvec=lambda v: rhs.jvp(A0, _c(v)).view(np.float64), dtype=np.float64)
+
+
+def shiftInvertOperator(rhs, A0, sigma, tol=1e-9, maxiter=20, restart=50):
+    """inverse of the shifted linearization (J - sigma)^-1
+
+    The shifted systems are solved by GMRES, right-preconditioned by the
+    inverse of the shifted linear part fft((Lk - sigma)^-1*ifft(V)), which
+    is diagonal in the Fourier domain.
+
+    Args:
+        rhs (object): right-hand-side of the LLE, e.g. GLLEOperator,
+            providing jvp, fft, and the linear multiplier Lk
+        A0 (numpy-array, ndim=1): field configuration
+        sigma (float): real shift, not an eigenvalue of J
+        tol (float): relative tolerance of GMRES (default 1e-9)
+        maxiter (int): maximal number of GMRES restarts (default 20)
+        restart (int): number of GMRES iterations between restarts
+            (default 50)
+
+    Returns:
+        OPinv (object): real LinearOperator of shape (2*Nx, 2*Nx)
+        cnt (dict): number of applications of OPinv (nSolve), of GMRES
+            solves not converged to tol (nFail), and of Jacobian-vector
+            products (njev), updated upon use
+    """
+    from scipy.sparse.linalg import LinearOperator, gmres
+    J = linearizedOperator(rhs, A0)
+    n = J.shape[0]
+    cnt = dict(nSolve=0, nFail=0, njev=0)
+    fft = rhs.fft
+    MkInv = 1./(rhs.Lk - sigma)
+    _c = lambda v: np.ascontiguousarray(np.ravel(v), dtype=np.float64).view(np.complex128)
+
+    def _matvec(v):
+        cnt['njev'] += 1
+        return J.matvec(v) - sigma*v
+
+    def _precond(v):
+        return fft.fft(MkInv*fft.ifft(_c(v))).view(np.float64)
+
+    Js = LinearOperator((n, n), matvec=_matvec, dtype=np.float64)
+    M = LinearOperator((n, n), matvec=_precond, dtype=np.float64)
+
+    def _solve(v):
+        cnt['nSolve'] += 1
+        w, info = gmres(Js, np.ravel(v), M=M, rtol=tol, atol=0., restart=restart, maxiter=maxiter)
+        cnt['nFail'] += info > 0
+        return w
+
+    return LinearOperator((n, n), matvec=_solve, dtype=np.float64), cnt
+
+
+def leadingEigenvalues(rhs, A0, nEig=6, sigma=0.5, tol=1e-8, innerTol=1e-9, maxiter=None):
+    """eigenvalues of the linearization closest to a real shift
+
+    Computes the eigenvalues lam of the linearization J about A0 closest to
+    sigma by ARPACK applied to (J - sigma)^-1, i.e. from the eigenvalues
+    mu = 1/(lam - sigma) of largest magnitude. All eigenvalues within the
+    distance max|lam - sigma| from sigma are found. For localized structures
+    of the LLE on top of a stable homogeneous background, the essential
+    spectrum has real part -1 and imaginary parts beyond the edge
+    sqrt((theta - 2*I0)^2 - I0^2), wherein I0 is the background intensity,
+    independent of the domain size. The discrete modes of the structure,
+    including unstable ones, are thus found for nEig exceeding their number,
+    i.e. once the essential spectrum is reached.
+
+    Args:
+        rhs (object): right-hand-side of the LLE, e.g. GLLEOperator
+        A0 (numpy-array, ndim=1): field configuration
+        nEig (int): number of eigenvalues (default 6)
+        sigma (float): real shift, distinct from the eigenvalue 0 of the
+            translation mode of localized structures (default 0.5)
+        tol (float): relative accuracy of the eigenvalues (default 1e-8)
+        innerTol (float): relative tolerance of the shifted linear systems
+            (default 1e-9)
+        maxiter (int): maximal number of Arnoldi restarts (default None,
+            i.e. the ARPACK default)
+
+    Returns: (lam, V, info)
+        lam (numpy-array): eigenvalues, ordered by decreasing real part
+        V (numpy-array): eigenvectors in the real representation, one row
+            of length 2*Nx for each eigenvalue
+        info (dict): residual norms |J*v - lam*v| of the normalized
+            eigenvectors (residual), radius max|lam - sigma| within which
+            all eigenvalues were found (radius), number of shifted linear
+            systems solved (nSolve) and not converged (nFail), and of
+            Jacobian-vector products (njev)
+    """
+    from scipy.sparse.linalg import eigs
+    OPinv, cnt = shiftInvertOperator(rhs, A0, sigma, tol=innerTol)
+    mu, V = eigs(OPinv, k=nEig, which='LM', tol=tol, maxiter=maxiter)
+    lam = sigma + 1./mu
+    order = np.argsort(-lam.real, kind='stable')
+    lam, V = lam[order], V[:, order].T
+
+    J = linearizedOperator(rhs, A0)
+    _Jv = lambda v: J.matvec(v.real) + 1j*J.matvec(v.imag)
+    residual = np.asarray([np.linalg.norm(_Jv(v) - l*v)/np.linalg.norm(v) for l, v in zip(lam, V)])
+    return lam, V, dict(residual=residual, radius=float(np.max(np.abs(lam - sigma))),
+                        nSolve=cnt['nSolve'], nFail=cnt['nFail'], njev=cnt['njev'] + 2*nEig)
+
+
+def stabilityVerdict(lam, neutralTol=1e-4):
+    """classify stationary solution from the leading eigenvalues
+
+    Eigenvalues with absolute value below neutralTol are neutral modes, e.g.
+    the translation mode of localized structures, and do not affect the
+    verdict.
+
+    Args:
+        lam (numpy-array): leading eigenvalues of the linearization
+        neutralTol (float): tolerance for neutral modes, exceeding their
+            discretization error (default 1e-4)
+
+    Returns: (stable, growthRate)
+        stable (bool): True if no non-neutral eigenvalue has positive real
+            part
+        growthRate (float): largest real part of the non-neutral
+            eigenvalues, or -inf if there are none
+    """
+    lam = np.asarray(lam)
+    lam = lam[np.abs(lam) >= neutralTol]
+    growthRate = float(np.max(lam.real)) if lam.size else -np.inf
+    return growthRate <= 0., growthRate
+
+# EOF: stability.py
@@ -0,0 +1,174 @@
+"""stationary_solution.py
+
+Contains function definitions allowing to obtain a homogeneous stationary
+solution, possibly including one or several localized dissipatice structures,
+for the standard Lugiato-Lefever equation.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import sys
+import numpy as np
+
+
+def stationarySolution_homogeneous(theta,P):
+    """determine homogeneous stationary solution
+
+    Args:
+       theta (float): detuning
+       P (float): amplitude of homogeneous driving field
+
+    Returns:
+       reA0 (float): real part of homogeneous stationary solution
+       imA0 (float): imaginary part of homogeneous stationary solution
+    """
+    from scipy.optimize import root
+    I0_ini = np.abs(1j*P/(theta + 1j))
+    I0_opt = float(root( lambda I0: I0*(1+(theta-I0)**2) - P**2, I0_ini , tol=1e-8).x)
+    reA0 = P/(1.+(I0_opt-theta)**2)
+    imA0 = (I0_opt-theta)*P/(1.+(I0_opt-theta)**2)
+    return reA0, imA0
+
+def newtonKrylov(F, x_ini, jvp, tol, M=None, maxiter=200, inner_maxiter=50, ftol=0.):
+    """inexact Newton method with GMRES inner solver
+
+    solves F(x)=0 for real vectors x using analytic Jacobian-vector products.
+    The linear systems of the Newton steps are solved by GMRES, optionally
+    right-preconditioned by M, to a relative tolerance that decreases with
+    the residual. Steps that do not decrease the residual are damped by
+    backtracking; if no damped step decreases the residual, the iteration
+    fails, returning the last iterate. Terminates if the maximum norm of
+    the Newton step drops below tol times the maximum norm of x, or if the
+    norm of the residual does not exceed ftol before a Newton step.
+
+    Args:
+       F (object): function F(x) of real vector x
+       x_ini (numpy-array): initial guess
+       jvp (object): Jacobian-vector product jvp(x, v)
+       tol (float): relative tolerance of the Newton step
+       M (object): preconditioner M(v), approximating the inverse of the
+           Jacobian (default None)
+       maxiter (int): maximal number of Newton iterations (default 200)
+       inner_maxiter (int): maximal number of GMRES iterations per Newton
+           step (default 50)
+       ftol (float): absolute tolerance of the residual norm, e.g. the level
+           of rounding errors, below which Newton steps would only amplify
+           noise (default 0, i.e. no check)
+
+    Returns:
+       res (object): result of root-finding procedure with attributes x,
+           success, message, nit (Newton iterations), nfev (function
+           evaluations), and njev (Jacobian-vector products)
+    """
+    from scipy.optimize import OptimizeResult
+    from scipy.sparse.linalg import LinearOperator, gmres
+    x = np.array(x_ini, dtype=np.float64)
+    n = x.size
+    cnt = dict(nfev=1, njev=0)
+
+    def _matvec(v):
+        cnt['njev'] += 1
+        return jvp(x, np.ascontiguousarray(v))
+
+    J = LinearOperator((n, n), matvec=_matvec, dtype=np.float64)
+    Mop = None if M is None else LinearOperator((n, n), matvec=lambda v: M(np.ascontiguousarray(v)), dtype=np.float64)
+
+    Fx = F(x)
+    FNorm = np.linalg.norm(Fx)
+    success, message = False, 'The maximum number of iterations allowed has been reached.'
+
+    it = 0
+    while it < maxiter:
+        if FNorm <= ftol:
+            success, message = True, 'The residual is below the specified tolerance.'
+            break
+        it += 1
+        dx, info = gmres(J, -Fx, M=Mop, rtol=min(0.1, np.sqrt(FNorm)), atol=0., restart=inner_maxiter, maxiter=1)
+
+        # -- BACKTRACKING IF RESIDUAL DOES NOT DECREASE
+        lam, accepted = 1., False
+        for _ in range(10):
+            xNew = x + lam*dx
+            FNew = F(xNew)
+            cnt['nfev'] += 1
+            if np.linalg.norm(FNew) < FNorm:
+                accepted = True
+                break
+            lam *= 0.5
+
+        if not accepted:
+            # -- KEEP LAST ITERATE, THE NEWTON DIRECTION DOES NOT DECREASE THE RESIDUAL
+            message = 'The iteration is not making progress: backtracking failed to decrease the residual.'
+            break
+
+        stepNorm = lam*np.max(np.abs(dx))
+        x, Fx, FNorm = xNew, FNew, np.linalg.norm(FNew)
+
+        if stepNorm <= tol*np.max(np.abs(x)):
+            success, message = True, 'A solution was found at the specified tolerance.'
+            break
+
+    return OptimizeResult(x=x, fun=Fx, success=success, message=message, nit=it, nfev=cnt['nfev'], njev=cnt['njev'])
+
+
+def stationarySolution(x, A_ini, LLE_rhs, tol, options=None, full_output=False, jvp=None, precond=None):
+    """determine stationary solution for standard Lugiato-Lefever equation
+
+    uses newton-krylov method (hardcoded) to perform root-finding
+    procedure for standard Lugiato-Lefever equation (LLE). By default,
+    scipys root function with finite-difference Jacobian-vector products is
+    used. If an analytic Jacobian-vector product is supplied, the inexact
+    Newton method newtonKrylov is used instead, optionally using a
+    preconditioner.
+
+    Args:
+       x (numpy-array): discretized x-domain
+       A_ini (numpy-array): trial solution used for root-finding procedure
+       LLE_rhs (object): right-hand side of LLE
+       tol (float): tolerance value used to terminate root-finding procedure
+       options (dict): options passed to scipys root function, e.g. maxiter,
+           or jac_options=dict(inner_outer_v=outer_v) with a list outer_v
+           that is reused across calls in order to recycle the Krylov
+           subspace of previous calls. If jvp is supplied, options passed
+           to newtonKrylov, i.e. maxiter and inner_maxiter (default None)
+       full_output (bool): if True, also return the result object of the
+           root-finding procedure (default False)
+       jvp (object): analytic Jacobian-vector product jvp(A, V) of the LLE,
+           e.g. GLLEOperator.jvp (default None)
+       precond (object): preconditioner precond(V) approximating the inverse
+           Jacobian, e.g. GLLEOperator.preconditioner (default None)
+
+    Returns:
+       A_opt (numpy-array): field resulting from root-finding procedure
+       res (object): result of root-finding procedure, only returned if
+           full_output is True
+    """
+    from scipy.optimize import root
+    _c = lambda A_r: A_r.view(np.complex128)
+    _r = lambda A: A.view(np.float64)
+    A_ini_r = _r(np.array(A_ini, dtype=np.complex128))
+
+    if jvp is None:
+        res = root(
+                lambda A_r: _r(LLE_rhs(_c(A_r))),
+                A_ini_r,
+                method='krylov',
+                tol=tol,
+                options=options
+                )
+    else:
+        res = newtonKrylov(
+                lambda A_r: _r(LLE_rhs(_c(A_r))),
+                A_ini_r,
+                lambda A_r, V_r: _r(jvp(_c(A_r), _c(V_r))),
+                tol,
+                M = None if precond is None else lambda V_r: _r(precond(_c(V_r))),
+                **(options or {})
+                )
+    A_opt = res.x.view(np.complex128)
+
+    if full_output:
+        return A_opt, res
+    return A_opt
+
+# EOF: stationary_solution.py 
@@ -0,0 +1,173 @@
+"""sweep.py
+
+Contains functions implementing parameter sweeps, i.e. the execution of many
+independent simulation runs on a pool of worker processes. Completed runs are
+recorded in a manifest, so that interrupted sweeps can be resumed without
+recomputing finished runs.
+
+AUTHOR: O. Melchert
+DATE: 2020-01-17
+"""
+import os
+import json
+import time
+import itertools
+
+
+THREAD_ENV_VARS = ('OMP_NUM_THREADS',
+                   'OPENBLAS_NUM_THREADS',
+                   'MKL_NUM_THREADS',
+                   'NUMEXPR_NUM_THREADS',
+                   'VECLIB_MAXIMUM_THREADS')
+
+
+def parameterGrid(grid):
+    """cartesian product of parameter values
+
+    Args:
+        grid (dict): parameter names as keys and lists of values as values
+
+    Returns:
+        params (list): one dictionary for each combination of parameters
+    """
+    keys = sorted(grid.keys())
+    return [dict(zip(keys, vals)) for vals in itertools.product(*[grid[key] for key in keys])]
+
+
+def readManifest(fName):
+    """read records of a sweep manifest
+
+    Args:
+        fName (str): path to manifest file, holding one JSON record per line
+
+    Returns:
+        records (dict): latest record for each job name
+    """
+    records = dict()
+    if not os.path.isfile(fName):
+        return records
+    with open(fName, 'r') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # -- TRUNCATED LAST LINE OF AN INTERRUPTED SWEEP
+                continue
+            records[rec['job']] = rec
+    return records
+
+
+def _appendManifest(fName, rec):
+    """append record to manifest and force it to disk"""
+    with open(fName, 'a') as f:
+        f.write(json.dumps(rec, sort_keys=True) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _timedJob(jobFunc, args):
+    """execute job in worker process and measure its wall and cpu time"""
+    t0, c0 = time.perf_counter(), time.process_time()
+    jobFunc(*args)
+    return time.perf_counter()-t0, time.process_time()-c0, os.getpid()
+
+
+def runSweep(jobFunc, jobs, manifest, nWorkers=1, nThreads=1, poll=None, pollInterval=1.):
+    """run independent jobs on a pool of worker processes
+
+    Jobs already recorded as done in the manifest are skipped. Worker
+    processes are started using the spawn method, with the thread counts of
+    BLAS, OpenMP and numexpr pinned to nThreads via the environment. While
+    the jobs run, the calling process is idle, except for calling poll.
+
+    Args:
+        jobFunc (object): module level function executing a single job
+        jobs (list): tuples (name, args, params), where name (str) uniquely
+            identifies the job, args (tuple) are the arguments passed to
+            jobFunc, and params (dict) are recorded in the manifest
+        manifest (str): path to manifest file
+        nWorkers (int): number of worker processes (default 1)
+        nThreads (int): number of threads per worker process (default 1)
+        poll (object): function without arguments, called in the calling
+            process every pollInterval seconds, after each completed job,
+            and once all jobs completed, e.g. to aggregate intermediate
+            results (default None)
+        pollInterval (float): seconds between calls of poll (default 1.)
+
+    Returns:
+        summary (dict): aggregated timing of the jobs run and recorded in
+            the manifest (see sweepSummary)
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    path = os.path.dirname(manifest)
+    if path:
+        try:
+            os.makedirs(path)
+        except OSError:
+            pass
+
+    done = set(name for name, rec in readManifest(manifest).items() if rec['status']=='done')
+    todo = [job for job in jobs if job[0] not in done]
+
+    # -- PIN THREAD COUNTS OF WORKERS VIA THE INHERITED ENVIRONMENT
+    envBackup = dict((key, os.environ.get(key)) for key in THREAD_ENV_VARS)
+    for key in THREAD_ENV_VARS:
+        os.environ[key] = "%d"%(nThreads)
+
+    try:
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=nWorkers, mp_context=ctx) as pool:
+            futures = dict((pool.submit(_timedJob, jobFunc, args), (name, params)) for name, args, params in todo)
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=None if poll is None else pollInterval, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name, params = futures[fut]
+                    rec = dict(job=name, params=params, date=time.strftime('%Y-%m-%d %H:%M:%S'))
+                    try:
+                        wallTime, cpuTime, pid = fut.result()
+                        rec.update(status='done', wallTime=wallTime, cpuTime=cpuTime, pid=pid)
+                    except Exception as exc:
+                        rec.update(status='failed', error="%s: %s"%(type(exc).__name__, exc))
+                    _appendManifest(manifest, rec)
+                if poll is not None and pending:
+                    poll()
+        if poll is not None:
+            poll()
+    finally:
+        for key, val in envBackup.items():
+            if val is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = val
+
+    return sweepSummary(manifest, names=[job[0] for job in jobs])
+
+
+def sweepSummary(manifest, names=None):
+    """aggregate per-run timing recorded in a manifest
+
+    Args:
+        manifest (str): path to manifest file
+        names (list): restrict summary to these job names (default None)
+
+    Returns:
+        summary (dict): numbers of done, failed, and pending jobs, total,
+            mean, and maximal wall time of done jobs, and the records
+    """
+    records = readManifest(manifest)
+    if names is not None:
+        records = dict((name, records[name]) for name in names if name in records)
+    wallTimes = [rec['wallTime'] for rec in records.values() if rec['status']=='done']
+    nDone = len(wallTimes)
+    nFailed = sum(1 for rec in records.values() if rec['status']=='failed')
+    return dict(nDone = nDone,
+                nFailed = nFailed,
+                nPending = 0 if names is None else len(names)-nDone-nFailed,
+                wallTimeTotal = sum(wallTimes),
+                wallTimeMean = sum(wallTimes)/nDone if nDone else 0.,
+                wallTimeMax = max(wallTimes) if nDone else 0.,
+                records = records)
+
+# EOF: sweep.py